@@ -0,0 +1,87 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import db
+import metrics
+from timeutil import ist_now
+
+MODEL = "gemini-2.0-flash"
+# ஒரே செய்திகளுக்கு இந்த நேரத்துக்குள் மீண்டும் Gemini அழைக்கப்படாது
+CACHE_TTL = timedelta(hours=12)
+MAX_WORKERS = 4
+
+
+def cache_key(model, *parts):
+    payload = json.dumps([model, *parts], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# --- Gemini அழைப்புகள்: bounded thread pool + content-addressed cache ---
+class AIAdvisor:
+    def __init__(self, client, conn=None, model=MODEL, ttl=CACHE_TTL, max_workers=MAX_WORKERS):
+        self.client = client
+        self.model = model
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.conn = conn or db.connect()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                Key TEXT PRIMARY KEY,
+                Model TEXT,
+                Response TEXT,
+                Created_At TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def _cached(self, keys):
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self.conn.execute(
+            f"SELECT Key, Response, Created_At FROM ai_cache WHERE Key IN ({placeholders})", keys
+        ).fetchall()
+        now = ist_now()
+        return {k: text for k, text, created in rows if now - datetime.fromisoformat(created) < self.ttl}
+
+    def _generate(self, prompt):
+        with metrics.stage('gemini.generate'):
+            response = self.client.models.generate_content(model=self.model, contents=prompt)
+        metrics.incr('gemini.generate', 'bytes', len(prompt.encode('utf-8')) + len(response.text.encode('utf-8')))
+        return response.text.strip()
+
+    def generate_many(self, jobs):
+        # jobs: {name: (key_parts, prompt)} -> {name: பதில் அல்லது None}
+        keys = {name: cache_key(self.model, *parts) for name, (parts, _) in jobs.items()}
+        cached = self._cached(list(set(keys.values())))
+
+        # ஒரே key கொண்ட prompts ஒருமுறை மட்டும் அனுப்பப்படும்
+        pending = {}
+        for name, (_, prompt) in jobs.items():
+            if keys[name] not in cached:
+                pending.setdefault(keys[name], prompt)
+        metrics.incr('ai.cache', 'hits', len(set(keys.values()) & set(cached)))
+        metrics.incr('ai.cache', 'misses', len(pending))
+
+        fresh = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                futures = {key: pool.submit(self._generate, prompt) for key, prompt in pending.items()}
+                for key, future in futures.items():
+                    try:
+                        fresh[key] = future.result()
+                    except Exception as e:
+                        print(f"Gemini Error: {e}")
+            now = ist_now()
+            with self.conn:
+                # காலாவதியான பதில்கள் மீண்டும் படிக்கப்படாது - committed DB-ல் சேர வேண்டாம்
+                self.conn.execute("DELETE FROM ai_cache WHERE Created_At < ?", ((now - self.ttl).isoformat(),))
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO ai_cache (Key, Model, Response, Created_At) VALUES (?, ?, ?, ?)",
+                    [(key, self.model, text, now.isoformat()) for key, text in fresh.items()]
+                )
+
+        answers = {**cached, **fresh}
+        return {name: answers.get(key) for name, key in keys.items()}
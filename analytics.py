@@ -0,0 +1,161 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import db
+from archive import Archive
+
+# holder -> (history நிலை key, கணக்கீடு); daemon-ல் அதே நாளின் புதிய snapshot வந்தால் key மாறும்.
+# WhatsApp / PDF delivery threads ஒரே நேரத்தில் கேட்கலாம் - lock-ன் கீழ் மட்டும்
+_memo = {}
+_memo_lock = threading.Lock()
+# XIRR தேடும் எல்லை: -99% முதல் +1000% வரை ஆண்டு வருமானம்
+XIRR_BOUNDS = (-0.99, 10.0)
+
+
+# --- வரலாற்று பகுப்பாய்வு: equity curve, drawdown, contribution, XIRR ---
+def load_history(holder, conn=None):
+    # idx_history_holder index-ஐப் பயன்படுத்தும் ஒரே query
+    conn = conn or db.connect()
+    df = pd.read_sql_query('''
+        SELECT Date, Ticker, Qty, Avg_Price, Live_Price, PL
+        FROM history WHERE Holder = ? AND Live_Price IS NOT NULL ORDER BY Date
+    ''', conn, params=(holder,))
+    # hot window-க்கு முந்தைய நாட்கள் Parquet archive-ல் - இந்த holder-ன் partitions மட்டும், memory-mapped
+    cold = Archive(conn=conn).read('history', columns=list(df.columns), filters=[('holder', '=', holder)])
+    if cold is not None and not cold.empty:
+        cold = cold[cold['Live_Price'].notna()]
+        df = pd.concat([cold, df], ignore_index=True).drop_duplicates(['Date', 'Ticker'], keep='last')
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Value'] = df['Qty'] * df['Live_Price']
+    df['Cost'] = df['Qty'] * df['Avg_Price']
+    # Date × Ticker panel (Value / Cost / PL). விலை கிடைக்காத இடைவெளி நாட்களில் மட்டும் முந்தைய மதிப்பு -
+    # position-ன் கடைசி பதிவுக்குப் பின் (விற்றது / alias மாறியது) நிரப்பினால் இருமுறை கணக்கில் சேரும்
+    panel = df.pivot_table(index='Date', columns='Ticker', values=['Value', 'Cost', 'PL'], aggfunc='sum')
+    return panel.ffill().where(panel.bfill().notna())
+
+
+def lot_flows(lots, dates, tickers):
+    # lots-ன் பணப் பரிமாற்றம் (வாங்கல் +, விற்பனை -) அது நடந்த பின் வரும் முதல் பதிவு நாளில், Date × Ticker.
+    # முதல் பதிவு நாள் வரை வாங்கியவை தொடக்க மதிப்பிலேயே உள்ளன
+    buy = pd.to_datetime(lots['Buy_Date'], errors='coerce')
+    at = dates.searchsorted(buy.fillna(dates[0]), side='left')
+    keep = (buy.notna() & (at > 0) & (at < len(dates))).to_numpy()
+    flows = pd.DataFrame({
+        'Date': dates[at[keep]],
+        'Ticker': lots['Ticker'].to_numpy()[keep],
+        'Amount': (lots['Qty'] * lots['Avg_Price']).to_numpy()[keep],
+    }).pivot_table(index='Date', columns='Ticker', values='Amount', aggfunc='sum')
+    return flows.reindex(index=dates, columns=tickers).fillna(0.0)
+
+
+def equity_curve(panel, lots=None):
+    # lots: Ticker history-ல் உள்ள பெயரில் (alias); None எனில் பணப் பரிமாற்றம் இல்லை எனக் கொள்ளும்
+    value = panel['Value']
+    curve = pd.DataFrame({
+        'Value': value.sum(axis=1),
+        'Cost': panel['Cost'].sum(axis=1),
+    })
+    curve['PL'] = curve['Value'] - curve['Cost']
+    # cash-flow neutral index: இரண்டு நாளும் பதிவுள்ள positions மட்டும், lots-ன் வாங்கல் / விற்பனைத் தொகை நீக்கி.
+    # புதிதாகத் தோன்றும் / மறையும் positions (புதிய வாங்கல், முழு விற்பனை, alias மாற்றம்) லாபமாகவோ நட்டமாகவோ தெரியாது
+    prev = value.shift()
+    held = value.notna() & prev.notna()
+    flow = 0.0 if lots is None else lot_flows(lots, value.index, value.columns)
+    gain = (value - prev - flow).where(held).sum(axis=1)
+    base = prev.where(held).sum(axis=1)
+    daily = (gain / base).where(base > 0, 0.0)
+    curve['Index'] = (1 + daily).cumprod()
+    return curve
+
+
+def drawdown(curve):
+    index = curve['Index']
+    return index / index.cummax() - 1
+
+
+def contribution(panel):
+    # முதல் பதிவிலிருந்து ஒவ்வொரு டிக்கரின் P&L மாற்றம் மற்றும் மொத்தத்தில் அதன் பங்கு
+    # ஒவ்வொரு டிக்கரின் முதல் மற்றும் கடைசி பதிவுக்கு இடையே
+    pl = panel['PL']
+    change = (pl.ffill().iloc[-1] - pl.bfill().iloc[0]).fillna(0)
+    total = change.sum()
+    share = change / total * 100 if total else change * 0
+    return pd.DataFrame({'PL_Change': change, 'Share_Pct': share}).sort_values('PL_Change', ascending=False)
+
+
+def xirr(amounts, dates, guess=0.1):
+    # NPV = Σ a / (1+r)^t = 0; XIRR_BOUNDS-க்குள் Newton (படி அளவு கட்டுப்படுத்தி), இல்லையெனில் bisection.
+    # எல்லைக்குள் தீர்வு இல்லையெனில் None
+    amounts = np.asarray(amounts, dtype=float)
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy()
+    years = (dates - dates.min()).astype('timedelta64[D]').astype(float) / 365.0
+    if not (amounts < 0).any() or not (amounts > 0).any():
+        return None
+    low, high = XIRR_BOUNDS
+
+    def npv(rate):
+        return np.sum(amounts / (1 + rate) ** years)
+
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        rate = guess
+        for _ in range(50):
+            factor = (1 + rate) ** years
+            value = np.sum(amounts / factor)
+            slope = np.sum(-years * amounts / (factor * (1 + rate)))
+            if not (np.isfinite(value) and np.isfinite(slope)) or slope == 0:
+                break
+            step = float(np.clip(value / slope, -0.5, 0.5))
+            rate = min(max(rate - step, low), high)
+            if abs(step) < 1e-9:
+                return rate
+        f_low, f_high = npv(low), npv(high)
+        if not (np.isfinite(f_low) and np.isfinite(f_high)) or f_low * f_high > 0:
+            return None
+        for _ in range(200):
+            mid = (low + high) / 2
+            f_mid = npv(mid)
+            if f_low * f_mid <= 0:
+                high = mid
+            else:
+                low, f_low = mid, f_mid
+            if high - low < 1e-10:
+                break
+    return (low + high) / 2
+
+
+def lots_xirr(lots, current_value, as_of):
+    # ஒவ்வொரு lot-ம் Buy_Date அன்று வெளிச்செல்லும் பணம்; இன்றைய மதிப்பு உள்வரும் பணம்
+    amounts = np.append(-(lots['Qty'] * lots['Avg_Price']).to_numpy(), current_value)
+    dates = pd.to_datetime(lots['Buy_Date']).tolist() + [pd.Timestamp(as_of)]
+    return xirr(amounts, dates)
+
+
+def holder_summary(holder, lots=None, conn=None):
+    # lots: equity_curve-க்கான பணப் பரிமாற்றம் (Ticker alias பெயரில்)
+    conn = conn or db.connect()
+    with _memo_lock:
+        # INSERT OR REPLACE புதிய rowid தரும் - அதே நாளின் மறு run-ம் key-ஐ மாற்றும்
+        rows, last_row = conn.execute("SELECT COUNT(*), MAX(rowid) FROM history WHERE Holder = ?",
+                                      (holder,)).fetchone()
+        key = (rows, last_row, None if lots is None else
+               int(pd.util.hash_pandas_object(lots[['Ticker', 'Qty', 'Avg_Price', 'Buy_Date']], index=False).sum()))
+        cached = _memo.get(holder)
+        if cached and cached[0] == key:
+            return cached[1]
+        panel = load_history(holder, conn)
+        if panel.empty:
+            return None
+        curve = equity_curve(panel, lots)
+        dd = drawdown(curve)
+        summary = {
+            'curve': curve,
+            'drawdown': dd,
+            'max_drawdown_pct': dd.min() * 100,
+            'contribution': contribution(panel),
+            'first_date': curve.index[0],
+            'return_pct': (curve['Index'].iloc[-1] - 1) * 100,
+        }
+        _memo[holder] = (key, summary)
+        return summary
@@ -0,0 +1,149 @@
+import os
+from datetime import timedelta
+from urllib.parse import quote
+
+import db
+import metrics
+from timeutil import ist_now
+
+# git-ல் commit செய்யப்படும் Parquet அடைவு: <table>/holder=<பெயர்>/month=YYYY-MM/part-0.parquet
+ARCHIVE_DIR = 'archive'
+# SQLite-ல் வைக்கப்படும் சமீபத்திய காலம் (நாட்கள்) - அதற்கு முந்தைய வரிசைகள் Parquet-க்கு.
+# prices: தினசரி அறிக்கை 100 நாள் மட்டும் படிக்கிறது - archive-ஐத் தொடுவது பல வருட backtest மட்டுமே
+HOT_DAYS = {'history': 180, 'snapshots': 30, 'prices': 180}
+# table -> (தேதி column, holder partition column அல்லது None, primary key)
+TABLES = {
+    'history': ('Date', 'Holder', ['Date', 'Holder', 'Ticker']),
+    'snapshots': ('Ts', 'Holder', ['Holder', 'Ticker', 'Ts']),
+    'prices': ('Date', None, ['Ticker', 'Date']),
+}
+COMPRESSION = 'zstd'
+
+# pyarrow இல்லாத எச்சரிக்கை table-க்கு ஒருமுறை மட்டும்
+_warned = set()
+
+
+def available():
+    # pyarrow optional - இல்லையெனில் எல்லா வரலாறும் SQLite-லேயே இருக்கும்
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def hot_cutoff(table, now=None):
+    return ((now or ist_now()) - timedelta(days=HOT_DAYS[table])).strftime('%Y-%m-%d')
+
+
+# --- Columnar archive: பழைய வரலாறு holder / மாத Parquet partitions-ல், memory-mapped வாசிப்பு ---
+class Archive:
+    def __init__(self, root=None, conn=None):
+        self.root = root or ARCHIVE_DIR
+        self.conn = conn or db.connect()
+
+    def _path(self, table, holder, month):
+        parts = [self.root, table]
+        if holder is not None:
+            # hive partition மதிப்புகள் URI-encoded (pyarrow வாசிக்கும் போது decode செய்யும்)
+            parts.append(f"holder={quote(holder, safe='')}")
+        parts.append(f"month={month}")
+        return os.path.join(*parts, 'part-0.parquet')
+
+    def _write_partition(self, path, rows, key):
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if os.path.exists(path):
+            rows = pd.concat([pq.read_table(path, memory_map=True).to_pandas(), rows], ignore_index=True)
+        # இடையில் நின்ற compaction மீண்டும் ஓடினால் அதே key - புதியது வெல்லும்
+        rows = rows.drop_duplicates(subset=key, keep='last').sort_values(key).reset_index(drop=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        # மாதப் partitions சிறியவை - pandas / Arrow schema metadata-வே கோப்பின் பாதிக்கு மேல்; Parquet types போதும்
+        data = pa.Table.from_pandas(rows, preserve_index=False).replace_schema_metadata(None)
+        pq.write_table(data, tmp, compression=COMPRESSION, store_schema=False)
+        os.replace(tmp, path)
+        metrics.incr('archive.write', 'bytes', os.path.getsize(path))
+
+    def compact(self, now=None):
+        # hot window-க்கு முந்தைய வரிசைகள்: Parquet-ல் எழுதிய பிறகே SQLite-லிருந்து நீக்கம். {table: நகர்த்திய வரிசைகள்}
+        import pandas as pd
+        existing = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        moved = {}
+        for table, (date_col, part_col, key) in TABLES.items():
+            if table not in existing:
+                continue
+            cutoff = hot_cutoff(table, now)
+            cold = pd.read_sql_query(f"SELECT * FROM {table} WHERE {date_col} < ?", self.conn, params=(cutoff,))
+            moved[table] = len(cold)
+            if cold.empty:
+                continue
+            with metrics.stage('archive.write'):
+                month = cold[date_col].str[:7].rename('month')
+                if part_col:
+                    # holder partition பாதையில் உள்ளது - கோப்பினுள் மீண்டும் வேண்டாம்
+                    for (holder, m), rows in cold.groupby([cold[part_col], month]):
+                        self._write_partition(self._path(table, holder, m), rows.drop(columns=[part_col]),
+                                              [k for k in key if k != part_col])
+                else:
+                    for m, rows in cold.groupby(month):
+                        self._write_partition(self._path(table, None, m), rows, key)
+            with self.conn:
+                self.conn.execute(f"DELETE FROM {table} WHERE {date_col} < ?", (cutoff,))
+        if any(moved.values()):
+            # நீக்கிய pages-ஐ விடுவித்தல் - இல்லையெனில் git-ல் commit ஆகும் DB கோப்பு சுருங்காது
+            self.conn.execute("VACUUM")
+        return moved
+
+    def scan(self, table, columns=None, filters=None):
+        # pyarrow.dataset: holder / month filters தொடர்புடைய partition கோப்புகளை மட்டும் திறக்கும், columns மட்டும் decode.
+        # archive இல்லை அல்லது pyarrow இல்லையெனில் None
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return None
+        if not available():
+            if table not in _warned:
+                _warned.add(table)
+                print(f"⚠️ pyarrow நிறுவப்படவில்லை - {path} வரலாறு படிக்கப்படவில்லை (SQLite hot window மட்டும்).")
+            return None
+        import pyarrow.dataset as ds
+        import pyarrow.fs
+        import pyarrow.parquet as pq
+        dataset = ds.dataset(path, format='parquet', partitioning='hive',
+                             filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+        return dataset.scanner(columns=columns, filter=pq.filters_to_expression(filters) if filters else None)
+
+    def batches(self, table, columns=None, filters=None):
+        # record batch ஒவ்வொன்றாக pandas-ஆக - முழு archive ஒருபோதும் நினைவில் இல்லை
+        scanner = self.scan(table, columns, filters)
+        if scanner is not None:
+            yield from _frames(scanner)
+
+    def read(self, table, columns=None, filters=None):
+        # பொருந்தும் வரிசைகள் ஒரே DataFrame-ஆக; archive இல்லையெனில் None
+        scanner = self.scan(table, columns, filters)
+        if scanner is None:
+            return None
+        import pandas as pd
+        with metrics.stage('archive.read'):
+            frames = [f for f in _frames(scanner) if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def first_dates(self, tickers):
+        # backfill-க்கு: archive-ல் உள்ள ஒவ்வொரு டிக்கரின் முதல் bar - batch வாரியாக min, வரிசைகள் சேர்க்கப்படுவதில்லை
+        first = {}
+        with metrics.stage('archive.read'):
+            for frame in self.batches('prices', columns=['Ticker', 'Date'], filters=[('Ticker', 'in', list(tickers))]):
+                for t, date in frame.groupby('Ticker')['Date'].min().items():
+                    first[t] = min(first.get(t, date), date)
+        return first
+
+
+def _frames(scanner):
+    for batch in scanner.to_batches():
+        metrics.incr('archive.read', 'bytes', batch.nbytes)
+        frame = batch.to_pandas().drop(columns=['month'], errors='ignore')
+        if 'holder' in frame.columns:
+            frame['holder'] = frame['holder'].astype(str)
+        yield frame.rename(columns={'holder': 'Holder'})
@@ -0,0 +1,301 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from holdings import PROFIT_TARGET_PCT
+from stream import HEDGE_RATIO, HEDGE_TRIGGER_PCT, REBALANCE_TARGET_PCT, REBALANCE_THRESHOLD_PCT
+
+TRADING_DAYS = indicators.TRADING_DAYS
+# get_rsi_advice / get_averaging_advice-ன் எல்லைகள்
+RSI_OVERSOLD, RSI_OVERBOUGHT = 30, 70
+AVERAGING_DIP_PCT = 2.0
+# ஒவ்வொரு வாங்குதல் / விற்பனைக்கும் (brokerage + STT + slippage) ஒரு பக்க செலவு
+COST_PCT = 0.1
+# ஹெட்ஜ் பகுதி Liquid Fund-ல் - வருடாந்திர வட்டி
+LIQUID_RATE_PCT = 6.5
+# சராசரி செய்தல்: ஒரு டிக்கருக்கு இத்தனை நாட்களுக்கு ஒருமுறை மட்டும் (ஒவ்வொரு அறிக்கையிலும் அல்ல)
+AVERAGING_GAP_DAYS = 20
+# சமநிலை வர்த்தகம் சரியா: அடுத்த இத்தனை நாட்களில் வாங்கிய பகுதி விற்றதைவிட சிறப்பாக செயல்பட்டதா
+REBALANCE_HORIZON_DAYS = 20
+
+# போட்டின் தற்போதைய விதிகள் - sweep முடிவுகளில் ★
+CURRENT = {
+    'rsi': {'period': indicators.RSI_PERIOD, 'low': RSI_OVERSOLD, 'high': RSI_OVERBOUGHT},
+    'profit': {'target': PROFIT_TARGET_PCT, 'rest': 20},
+    'averaging': {'dip': AVERAGING_DIP_PCT, 'add': 0.5},
+    'hedge': {'window': 5, 'trigger': HEDGE_TRIGGER_PCT, 'ratio': HEDGE_RATIO},
+    'rebalance': {'target': REBALANCE_TARGET_PCT, 'band': REBALANCE_THRESHOLD_PCT},
+}
+GRID = {
+    'rsi': {'period': [7, 14, 21], 'low': [20, 25, 30, 35], 'high': [65, 70, 75, 80]},
+    'profit': {'target': [10, 15, 20, 25, 30, 40, 50], 'rest': [5, 20, 60]},
+    'averaging': {'dip': [2, 5, 10, 15], 'add': [0.5, 1.0]},
+    'hedge': {'window': [5, 10], 'trigger': [-1, -2, -3, -4], 'ratio': [0.1, 0.15, 0.25]},
+    'rebalance': {'target': [40, 50, 60], 'band': [2.5, 5, 10]},
+}
+
+
+# --- சந்தை தரவு: dates × tickers numpy அட்டவணைகள், ஒருமுறை மட்டும் தயாரிப்பு ---
+class Universe:
+    def __init__(self, closes, index, commodity):
+        # closes: dates × tickers Close (DataFrame); index: NIFTY Close (Series); commodity: ticker -> bool
+        closes = closes.sort_index().ffill()
+        self.dates = closes.index
+        self.tickers = list(closes.columns)
+        self.closes = closes
+        self.prices = closes.to_numpy(dtype=float)
+        self.years = max(len(self.dates) - 1, 1) / TRADING_DAYS
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rets = np.zeros_like(self.prices)
+            rets[1:] = self.prices[1:] / self.prices[:-1] - 1
+        self.returns = np.nan_to_num(rets)
+        self.log_prices = np.log(self.prices)
+        self.listed = ~np.isnan(self.prices)
+        self.index = index.reindex(self.dates).ffill().to_numpy(dtype=float)
+        self.commodity = np.array([bool(commodity.get(t)) for t in self.tickers])
+        # period -> RSI அட்டவணை; ஒரு process-ல் ஒவ்வொரு period-க்கும் ஒருமுறை மட்டும் கணக்கீடு
+        self._rsi = {}
+
+    def rsi(self, period):
+        if period not in self._rsi:
+            self._rsi[period] = indicators.rsi(self.closes, period).to_numpy()
+        return self._rsi[period]
+
+    @classmethod
+    def from_frame(cls, frame, index_ticker, is_commodity):
+        # PriceStore.load வெளியீடு: (Ticker, Price) columns
+        closes = frame.xs('Close', axis=1, level=1)
+        index = closes.pop(index_ticker) if index_ticker in closes.columns else pd.Series(dtype=float)
+        return cls(closes, index, {t: is_commodity(t) for t in closes.columns})
+
+    def basket(self, mask):
+        # சம எடை basket-ன் தினசரி வருமானம் (listing ஆன டிக்கர்கள் மட்டும்)
+        listed = self.listed[:, mask]
+        counts = listed.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            return np.where(counts > 0, (self.returns[:, mask] * listed).sum(axis=1) / np.maximum(counts, 1), 0.0)
+
+
+def _trade_stats(held, log_prices):
+    # held: dates × tickers (0/1) - t நாளின் வருமானத்தை வைத்திருந்ததா; வர்த்தகங்கள் column வாரியாக
+    padded = np.vstack([np.zeros((1, held.shape[1])), held, np.zeros((1, held.shape[1]))])
+    diff = np.diff(padded, axis=0).T
+    col_s, start = np.nonzero(diff == 1)
+    col_e, end = np.nonzero(diff == -1)
+    # t நாள் வைத்திருக்க t-1 close-ல் வாங்கியது; கடைசியாக வைத்திருந்த நாளின் close-ல் விற்பனை
+    pnl = log_prices[end - 1, col_e] - log_prices[np.maximum(start - 1, 0), col_s]
+    pnl = pnl[~np.isnan(pnl)]
+    return len(pnl), float((pnl > 0).mean() * 100) if len(pnl) else float('nan')
+
+
+def _summary(u, strategy, bench, trades, hit_rate, turnover):
+    # strategy / bench: டிக்கர் வாரியான மொத்த வருமானம் (சம எடை சராசரி)
+    return {
+        'return_pct': round(float(np.nanmean(strategy)) * 100, 2),
+        'bench_pct': round(float(np.nanmean(bench)) * 100, 2),
+        'hit_rate': round(hit_rate, 1) if hit_rate == hit_rate else None,
+        'trades': int(trades),
+        'turnover': round(float(turnover) / u.years, 2),
+    }
+
+
+def _buy_and_hold(u):
+    first = np.argmax(u.listed, axis=0)
+    start = u.prices[first, np.arange(len(u.tickers))]
+    return u.prices[-1] / start - 1
+
+
+def _compound(returns):
+    return np.prod(1 + returns, axis=0) - 1
+
+
+# --- விதிகள்: ஒவ்வொன்றும் (Universe, params) -> summary dict ---
+def rsi_rule(u, period, low, high, cost=COST_PCT):
+    # RSI <= low வாங்கு, RSI >= high விற்பனை; அடுத்த நாளிலிருந்து நடைமுறை
+    rsi = u.rsi(period)
+    signal = np.where(rsi <= low, 1.0, np.where(rsi >= high, 0.0, np.nan))
+    position = pd.DataFrame(signal).ffill().fillna(0.0).to_numpy()
+    held = np.zeros_like(position)
+    held[1:] = position[:-1]
+    switches = np.abs(np.diff(held, axis=0, prepend=0.0))
+    daily = held * u.returns - switches * cost / 100
+    trades, hit = _trade_stats(held, u.log_prices)
+    return _summary(u, _compound(daily), _buy_and_hold(u), trades, hit, switches.sum() / len(u.tickers))
+
+
+def profit_rule(u, target, rest, cost=COST_PCT):
+    # வைத்திரு; +target% எட்டியதும் முழுவதும் விற்று `rest` நாள் கழித்து மீண்டும் வாங்கு
+    n_days, n = u.prices.shape
+    held = np.zeros((n_days, n))
+    holding = np.zeros(n, dtype=bool)
+    entry = np.full(n, np.nan)
+    wait = np.zeros(n)
+    for t in range(n_days):
+        held[t] = holding
+        price = u.prices[t]
+        sell = holding & (price >= entry * (1 + target / 100))
+        holding &= ~sell
+        wait[sell] = rest
+        wait[~holding] -= 1
+        buy = ~holding & (wait <= 0) & u.listed[t]
+        holding |= buy
+        entry[buy] = price[buy]
+    switches = np.abs(np.diff(held, axis=0, prepend=0.0))
+    switches[0] = 0
+    daily = held * u.returns - switches * cost / 100
+    trades, hit = _trade_stats(held, u.log_prices)
+    return _summary(u, _compound(daily), _buy_and_hold(u), trades, hit, switches.sum() / n)
+
+
+def averaging_rule(u, dip, add, cost=COST_PCT):
+    # ஒவ்வொரு டிக்கரிலும் ₹1 உடன் தொடக்கம்; விலை சராசரியை விட dip% கீழ் வந்தால் add × qty கூடுதல் (AVERAGING_GAP_DAYS இடைவெளி)
+    n_days, n = u.prices.shape
+    qty = np.zeros(n)
+    invested = np.zeros(n)
+    last_buy = np.full(n, -AVERAGING_GAP_DAYS)
+    buys_t, buys_col, buys_price = [], [], []
+    for t in range(n_days):
+        price = u.prices[t]
+        start = u.listed[t] & (qty == 0)
+        qty[start], invested[start] = 1 / price[start], 1 + cost / 100
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = invested / qty
+        extra = (qty > 0) & ~start & (price < avg * (1 - dip / 100)) & (t - last_buy >= AVERAGING_GAP_DAYS)
+        if extra.any():
+            amount = qty[extra] * add
+            invested[extra] += amount * price[extra] * (1 + cost / 100)
+            qty[extra] += amount
+            last_buy[extra] = t
+            cols = np.nonzero(extra)[0]
+            buys_t.append(np.full(len(cols), t)); buys_col.append(cols); buys_price.append(price[cols])
+    # மொத்த மூலதன அடிப்படையில் - அதிகம் சராசரி செய்த (அதிகம் சரிந்த) டிக்கர்கள் அதிக எடை பெறும்
+    value = np.nansum(qty * u.prices[-1])
+    strategy = [value / invested.sum() - 1] if invested.sum() else [np.nan]
+    trades, hit = 0, float('nan')
+    if buys_col:
+        cols, bought = np.concatenate(buys_col), np.concatenate(buys_price)
+        trades, hit = len(cols), float((u.prices[-1, cols] > bought).mean() * 100)
+    return _summary(u, strategy, _buy_and_hold(u), trades, hit, trades / n)
+
+
+def hedge_rule(u, window, trigger, ratio, cost=COST_PCT):
+    # NIFTY window-நாள் மாற்றம் < trigger% எனில் portfolio-வின் ratio பகுதி Liquid Fund-க்கு
+    if np.isnan(u.index).all():
+        return None
+    portfolio = u.basket(np.ones(len(u.tickers), dtype=bool))
+    change = np.full(len(u.index), np.nan)
+    change[window:] = (u.index[window:] / u.index[:-window] - 1) * 100
+    on = np.zeros(len(u.index))
+    on[1:] = (change[:-1] < trigger)
+    liquid = (1 + LIQUID_RATE_PCT / 100) ** (1 / TRADING_DAYS) - 1
+    switches = np.abs(np.diff(on, prepend=0.0))
+    daily = (1 - ratio * on) * portfolio + ratio * on * liquid - switches * ratio * cost / 100
+    # ஒவ்வொரு hedge காலத்திலும் portfolio Liquid-ஐ விட குறைவாக செயல்பட்டதா (hedge உதவியதா)
+    episode = np.cumsum(np.diff(on, prepend=0.0) == 1) * on
+    helped = [np.prod(1 + portfolio[episode == k]) < (1 + liquid) ** (episode == k).sum()
+              for k in range(1, int(episode.max()) + 1)]
+    hit = float(np.mean(helped) * 100) if helped else float('nan')
+    return _summary(u, [_compound(daily)], [_compound(portfolio)], len(helped), hit, switches.sum() * ratio)
+
+
+def rebalance_rule(u, target, band, cost=COST_PCT):
+    # தங்கம்/வெள்ளி பகுதி target ± band-க்கு வெளியே சென்றால் target-க்கு மீண்டும் சமன்
+    if not u.commodity.any() or u.commodity.all():
+        return None
+    comm, equity = u.basket(u.commodity), u.basket(~u.commodity)
+    w = target / 100
+    values = np.array([w, 1 - w])
+    bench = values.copy()
+    traded, events = 0.0, []
+    for t in range(1, len(comm)):
+        growth = np.array([1 + comm[t], 1 + equity[t]])
+        values *= growth
+        bench *= growth
+        total = values.sum()
+        drift = values[0] / total - w
+        if abs(drift) * 100 > band:
+            traded += abs(drift)
+            values = np.array([w, 1 - w]) * total * (1 - abs(drift) * cost / 100)
+            events.append((t, drift > 0))
+    # drift > 0: தங்கம்/வெள்ளி விற்று பங்குகள் வாங்கியது - அடுத்த காலத்தில் பங்குகள் சிறப்பாக இருந்தால் சரி
+    helped = []
+    for t, sold_comm in events:
+        end = min(t + REBALANCE_HORIZON_DAYS, len(comm) - 1)
+        if end <= t:
+            continue
+        c, e = np.prod(1 + comm[t + 1:end + 1]), np.prod(1 + equity[t + 1:end + 1])
+        helped.append(e > c if sold_comm else c > e)
+    hit = float(np.mean(helped) * 100) if helped else float('nan')
+    return _summary(u, [values.sum() - 1], [bench.sum() - 1], len(events), hit, traded * 2)
+
+
+RULES = {
+    'rsi': rsi_rule,
+    'profit': profit_rule,
+    'averaging': averaging_rule,
+    'hedge': hedge_rule,
+    'rebalance': rebalance_rule,
+}
+
+
+# --- Parameter sweep: ஒவ்வொரு process-க்கும் Universe ஒருமுறை (initializer), பணிகள் params மட்டும் ---
+_universe = None
+
+
+def _init(universe):
+    global _universe
+    _universe = universe
+
+
+def _evaluate(task):
+    rule, params = task
+    result = RULES[rule](_universe, **params)
+    return rule, params, result
+
+
+def grid_tasks(rules=None, grid=None):
+    grid = grid or GRID
+    tasks = []
+    for rule in rules or RULES:
+        names = list(grid[rule])
+        for values in itertools.product(*(grid[rule][k] for k in names)):
+            tasks.append((rule, dict(zip(names, values))))
+    return tasks
+
+
+def sweep(universe, rules=None, grid=None, workers=None):
+    tasks = grid_tasks(rules, grid)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init(universe)
+        results = [_evaluate(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(universe,)) as pool:
+            results = list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    rows = [{'rule': rule, **{f"p_{k}": v for k, v in params.items()}, **result,
+             'current': params == {k: CURRENT[rule][k] for k in params}}
+            for rule, params, result in results if result is not None]
+    return pd.DataFrame(rows)
+
+
+def report(results, top=5):
+    # விதி வாரியாக: தற்போதைய அமைப்பு (★) + அதிக வருமானம் தந்த அமைப்புகள்
+    lines = []
+    for rule, group in results.groupby('rule', sort=False):
+        params = [c for c in group.columns if c.startswith('p_') and group[c].notna().any()]
+        best = group.sort_values('return_pct', ascending=False)
+        shown = pd.concat([best[best['current']], best.head(top)]).drop_duplicates(subset=params)
+        lines.append(f"\n📐 {rule} ({len(group)} அமைப்புகள்)")
+        lines.append(f"   {'params':<34} {'return%':>9} {'hold%':>9} {'hit%':>7} {'trades':>7} {'turn/yr':>8}")
+        for row in shown.itertuples(index=False):
+            row = row._asdict()
+            label = ", ".join(f"{c[2:]}={row[c]:g}" for c in params)
+            hit = f"{row['hit_rate']:.1f}" if row['hit_rate'] is not None and row['hit_rate'] == row['hit_rate'] else "-"
+            mark = "★" if row['current'] else " "
+            lines.append(f" {mark} {label:<34} {row['return_pct']:>9.2f} {row['bench_pct']:>9.2f} {hit:>7} "
+                         f"{row['trades']:>7} {row['turnover']:>8.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,465 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+import db
+import delivery
+import indicators
+import metrics
+import registry
+from fixtures import FixtureBundle
+from holdings import compute_holdings
+from tax import estimate_taxes
+
+
+# --- Benchmarks: `python bench.py` ---
+def synthetic_closes(n_days, n_tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, size=(n_days, n_tickers))
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    cols = [f"T{i:05d}.NS" for i in range(n_tickers)]
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=idx, columns=cols)
+
+
+def legacy_rsi(closes):
+    # பழைய get_rsi_advice பாதை: ஒவ்வொரு டிக்கருக்கும் தனி pandas chain
+    out = {}
+    for ticker in closes.columns:
+        delta = closes[ticker].diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rs = gain / loss
+        out[ticker] = 100 - (100 / (1 + rs)).iloc[-1]
+    return pd.Series(out)
+
+
+def timeit(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(fn, *args, trace=False):
+    # ஒரு முறை ஓட்டம் (வினாடிகள்); trace=True -> (வினாடிகள், உச்ச நினைவகம் MB)
+    # tracemalloc ஓட்டத்தை பல மடங்கு மெதுவாக்கும் - நேரமும் நினைவகமும் தனித்தனி ஓட்டங்களில்
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return (elapsed, peak / 1e6) if trace else elapsed
+
+
+def timed_and_peak(case):
+    # case(trace) -> அதே நிலையிலிருந்து புதிதாக ஓட்டும்; (case-ன் நேரங்கள், உச்ச நினைவகம்)
+    times = case(False)
+    peak = case(True)
+    return times, peak
+
+
+def bench_indicators(sizes=(1, 10, 100, 1000, 5000), n_days=250):
+    print(f"{'tickers':>8} {'legacy RSI':>12} {'vector RSI':>12} {'all indicators':>15}")
+    for n in sizes:
+        closes = synthetic_closes(n_days, n)
+        t_legacy = timeit(legacy_rsi, closes, repeat=1 if n > 1000 else 3)
+        t_rsi = timeit(indicators.rsi, closes)
+        t_all = timeit(indicators.compute_indicators, closes)
+        print(f"{n:>8} {t_legacy * 1000:>10.1f}ms {t_rsi * 1000:>10.1f}ms {t_all * 1000:>13.1f}ms")
+
+
+def synthetic_lots(n_lots, n_tickers=500, n_holders=50, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = np.array([f"T{i:05d}.NS" for i in range(n_tickers)])
+    dates = pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 900, n_lots), unit='D')
+    lots = pd.DataFrame({
+        'Holder': rng.choice([f"H{i:03d}" for i in range(n_holders)], n_lots),
+        'Ticker': rng.choice(tickers, n_lots),
+        'Qty': rng.integers(1, 100, n_lots).astype(float),
+        'Avg_Price': rng.uniform(10, 500, n_lots).round(2),
+        'Buy_Date': dates.strftime('%Y-%m-%d'),
+    })
+    prices = pd.Series(rng.uniform(10, 500, n_tickers).round(2), index=tickers)
+    return lots, prices
+
+
+def legacy_holdings(lots, prices):
+    # பழைய __main__ பாதை: holder வாரியாக groupby, பின் iterrows-ல் ஒவ்வொரு வரிசையும்
+    rows = []
+    for holder in lots['Holder'].unique():
+        u_data = lots[lots['Holder'] == holder].copy()
+        u_data['Total_Cost'] = u_data['Qty'] * u_data['Avg_Price']
+        grouped = u_data.groupby('Ticker').agg({'Qty': 'sum', 'Total_Cost': 'sum', 'Buy_Date': 'min'}).reset_index()
+        grouped['Avg_Price'] = grouped['Total_Cost'] / grouped['Qty']
+        for _, row in grouped.iterrows():
+            ltp = round(prices.get(row['Ticker'], 0), 2)
+            pl = round((ltp - row['Avg_Price']) * row['Qty'], 2)
+            pl_pct = (pl / (row['Avg_Price'] * row['Qty'])) * 100
+            rows.append({'Holder': holder, 'Ticker': row['Ticker'], 'Qty': row['Qty'],
+                         'Avg': row['Avg_Price'], 'Live': ltp, 'PL': pl, 'Profit_Flag': pl_pct >= 20})
+    return pd.DataFrame(rows).set_index(['Holder', 'Ticker']).sort_index()
+
+
+def bench_holdings(sizes=(10, 1000, 10000, 100000)):
+    # synthetic_lots-ல் வாங்கல்கள் மட்டும் - அங்கே FIFO-வும் பழைய groupby-யும் ஒன்றே, 'equal' அதைச் சரிபார்க்கிறது.
+    # விற்பனை உள்ள lots-ல் compute_holdings வேண்டுமென்றே வேறுபடும் (tests/test_holdings.py::test_sells_follow_fifo)
+    print(f"{'lots':>8} {'legacy':>12} {'vectorized':>12}  equal")
+    for n in sizes:
+        lots, prices = synthetic_lots(n, n_holders=min(50, n))
+        t_legacy = timeit(legacy_holdings, lots, prices, repeat=1)
+        t_vector = timeit(compute_holdings, lots, prices)
+        legacy = legacy_holdings(lots, prices)
+        fast = compute_holdings(lots, prices)[legacy.columns]
+        equal = (np.allclose(legacy[['Qty', 'Avg', 'Live', 'PL']], fast[['Qty', 'Avg', 'Live', 'PL']])
+                 and (legacy['Profit_Flag'] == fast['Profit_Flag']).all())
+        print(f"{n:>8} {t_legacy * 1000:>10.1f}ms {t_vector * 1000:>10.1f}ms  {equal}")
+
+
+def bench_tax(sizes=(10, 1000, 10000, 50000)):
+    print(f"{'lots':>8} {'FIFO tax':>12}")
+    for n in sizes:
+        lots, prices = synthetic_lots(n, n_holders=min(50, n))
+        t_tax = timeit(estimate_taxes, lots, prices, pd.Timestamp.today())
+        print(f"{n:>8} {t_tax * 1000:>10.1f}ms")
+
+
+# --- முழு run benchmarks: network இல்லாத synthetic fixture bundle-உடன் ---
+# பதிவு நேரம்: வார நாள் காலை 9:30 IST (PDF/Email சாளரத்துக்குள்)
+BENCH_AT = (pd.Timestamp.today().normalize() - pd.offsets.BDay(1)).to_pydatetime().replace(
+    hour=9, minute=30, tzinfo=timezone.utc)
+
+
+def synthetic_bundle(tickers, n_days=300, seed=0):
+    closes = synthetic_closes(n_days, len(tickers), seed)
+    closes.index = pd.bdate_range(end=BENCH_AT.date(), periods=n_days)
+    closes.columns = tickers
+    prices = {}
+    for ticker in tickers:
+        close = closes[ticker]
+        prices[ticker] = pd.DataFrame({
+            'Open': close.shift().bfill(), 'High': close * 1.01, 'Low': close * 0.99,
+            'Close': close, 'Adj Close': close, 'Volume': 1000.0,
+        })
+    published = int((BENCH_AT - timedelta(hours=6)).timestamp())
+    return FixtureBundle({
+        'recorded_at': BENCH_AT,
+        'prices': {'1d': prices},
+        'news': {t: [{'id': f"{t}-1", 'content': {'title': f"{t} quarterly results", 'pubDate': published}}]
+                 for t in tickers},
+        'info': {t: {'trailingEps': 12.5, 'bookValue': 180.0} for t in tickers},
+        'gemini': {},
+        'gemini_default': "இந்தச் செய்தியால் பங்கு உயர வாய்ப்புள்ளது.",
+        'tts': {},
+    })
+
+
+def synthetic_portfolio(n_lots, n_tickers=500):
+    holders = list(registry.Registry.load())
+    lots, prices = synthetic_lots(n_lots, n_tickers=n_tickers, n_holders=len(holders))
+    names = {f"H{i:03d}": p['name'] for i, p in enumerate(holders)}
+    return lots.assign(Holder=lots['Holder'].map(names)), prices
+
+
+@contextmanager
+def scratch_dir():
+    # portfolio.csv / holidays.csv / DB / PNG / PDF / MP3 எல்லாம் தற்காலிக அடைவில்; registry config நகலுடன்
+    here = os.getcwd()
+    path = tempfile.mkdtemp(prefix='bench_')
+    for name in (registry.HOLDERS_FILE, registry.INSTRUMENTS_FILE):
+        if os.path.exists(name):
+            shutil.copy(name, path)
+    os.chdir(path)
+    db.close()
+    real_db, db.DB_FILE = db.DB_FILE, os.path.join(path, os.path.basename(db.DB_FILE))
+    try:
+        yield path
+    finally:
+        db.close()
+        db.DB_FILE = real_db
+        os.chdir(here)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _peak(results):
+    return max(r[1] for r in results)
+
+
+def bench_end_to_end(sizes=(10, 100, 1000, 10000), n_tickers=500):
+    import stock_bot
+    print(f"{'lots':>8} {'tickers':>8} {'cold run':>12} {'warm run':>12} {'peak mem':>10}")
+    for n in sizes:
+        lots, _ = synthetic_portfolio(n, n_tickers=min(n, n_tickers))
+        tickers = sorted(lots['Ticker'].unique())
+        bundle = synthetic_bundle(tickers)
+
+        def case(trace):
+            with scratch_dir():
+                lots.to_csv('portfolio.csv', index=False)
+                with open('holidays.csv', 'w', encoding='utf-8') as f:
+                    f.write("Date,Message\n")
+                with bundle.replay():
+                    # இரண்டாவது run: விலை / fundamentals / செய்தி / AI caches நிரம்பியுள்ளன
+                    runs = [measure(stock_bot.run_once, trace=trace) for _ in range(2)]
+            return _peak(runs) if trace else runs
+
+        (t_cold, t_warm), peak = timed_and_peak(case)
+        print(f"{n:>8} {len(tickers):>8} {t_cold * 1000:>10.0f}ms {t_warm * 1000:>10.0f}ms {peak:>8.1f}MB")
+
+
+def bench_holders(sizes=(2, 50, 200), n_tickers=200, lots_per_holder=20):
+    # பல holders ஒரே டிக்கர்களைப் பகிர்ந்தாலும்: ஒரு download, டிக்கருக்கு ஒரு RSI ஆய்வு
+    import stock_bot
+    print(f"{'holders':>8} {'tickers':>8} {'run':>10} {'per holder':>11} {'downloads':>10} {'rsi calls':>10}")
+    for n in sizes:
+        lots, _ = synthetic_lots(n * lots_per_holder, n_tickers=n_tickers, n_holders=n)
+        tickers = sorted(lots['Ticker'].unique())
+        bundle = synthetic_bundle(tickers)
+        limits, delivery.RATE_LIMITS = delivery.RATE_LIMITS, dict.fromkeys(delivery.RATE_LIMITS, 0.0)
+        try:
+            with scratch_dir():
+                lots.to_csv('portfolio.csv', index=False)
+                with open('holidays.csv', 'w', encoding='utf-8') as f:
+                    f.write("Date,Message\n")
+                pd.DataFrame({
+                    'Name': [f"H{i:03d}" for i in range(n)], 'Phone': [f"9190000{i:05d}" for i in range(n)],
+                    'Prefix': [f"H{i:03d}" for i in range(n)], 'Email': [f"h{i:03d}@example.com" for i in range(n)],
+                    'Commodity_Target_Pct': 50,
+                }).to_csv(registry.HOLDERS_FILE, index=False)
+                with bundle.replay():
+                    elapsed = measure(stock_bot.run_once)
+                stages = metrics.summary('bench')['stages']
+        finally:
+            delivery.RATE_LIMITS = limits
+        print(f"{n:>8} {len(tickers):>8} {elapsed * 1000:>8.0f}ms {elapsed / n * 1000:>9.1f}ms "
+              f"{stages.get('yahoo.download', {}).get('calls', 0):>10} {stages.get('advice.rsi', {}).get('calls', 0):>10}")
+
+
+def bench_backtest(sizes=(10, 100, 500), years=3):
+    # முழு parameter grid: ஒரு process vs எல்லா cores (ProcessPool)
+    from backtest import Universe, grid_tasks, sweep
+    n_days = int(years * indicators.TRADING_DAYS)
+    print(f"{'tickers':>8} {'days':>6} {'configs':>8} {'1 process':>12} {'all cores':>12}")
+    for n in sizes:
+        closes = synthetic_closes(n_days, n)
+        index = synthetic_closes(n_days, 1, seed=1).iloc[:, 0]
+        universe = Universe(closes, index, {t: i % 4 == 0 for i, t in enumerate(closes.columns)})
+        t_one = measure(sweep, universe, None, None, 1)
+        t_all = measure(sweep, universe)
+        print(f"{n:>8} {n_days:>6} {len(grid_tasks()):>8} {t_one * 1000:>10.0f}ms {t_all * 1000:>10.0f}ms")
+
+
+def bench_archive(sizes=(10, 100, 500), years=3, n_holders=5, holder_tickers=20):
+    # compaction: DB அளவு vs Parquet; பல வருட விலை / holder வரலாறு வாசிப்பு - SQLite மட்டும் vs hot SQLite + archive
+    import analytics
+    import archive
+    from price_store import PriceStore
+    if not archive.available():
+        print("pyarrow நிறுவப்படவில்லை - archive benchmark தவிர்க்கப்பட்டது.")
+        return
+    days = int(years * 365)
+    print(f"{'tickers':>8} {'DB before':>10} {'DB after':>10} {'parquet':>10} "
+          f"{'prices sqlite':>14} {'prices archive':>15} {'history sqlite':>15} {'history archive':>16}")
+    for n in sizes:
+        closes = synthetic_closes(int(years * indicators.TRADING_DAYS), n)
+        dates = closes.index.strftime('%Y-%m-%d')
+        price_rows = [(t, d, c, c, c, c, c, 1000.0, 1) for t in closes.columns for d, c in zip(dates, closes[t])]
+        held = closes.iloc[:, :holder_tickers]
+        history_rows = [(d, f"H{h:03d}", t, 10.0, 100.0, c, (c - 100) * 10, "", 'NONE', 0.0)
+                        for h in range(n_holders) for t in held.columns for d, c in zip(dates, held[t])]
+        with scratch_dir():
+            db.init_db()
+            conn = db.connect()
+            PriceStore()
+            with conn:
+                conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", price_rows)
+                conn.executemany('''
+                    INSERT INTO history (Date, Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Est, Tax_Type, Tax_Amt)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', history_rows)
+            db.close()
+            before = os.path.getsize(db.DB_FILE)
+            t_px_sql = measure(PriceStore().load, closes.columns.tolist(), days)
+            t_hist_sql = measure(analytics.load_history, 'H000')
+            archive.Archive().compact()
+            db.close()
+            after = os.path.getsize(db.DB_FILE)
+            parquet = sum(os.path.getsize(os.path.join(root, f))
+                          for root, _, files in os.walk(archive.ARCHIVE_DIR) for f in files)
+            t_px_arc = measure(PriceStore().load, closes.columns.tolist(), days)
+            t_hist_arc = measure(analytics.load_history, 'H000')
+        print(f"{n:>8} {before / 1e6:>8.1f}MB {after / 1e6:>8.1f}MB {parquet / 1e6:>8.1f}MB "
+              f"{t_px_sql * 1000:>12.0f}ms {t_px_arc * 1000:>13.0f}ms {t_hist_sql * 1000:>13.0f}ms {t_hist_arc * 1000:>14.0f}ms")
+
+
+def bench_market_fetch(sizes=(10, 100, 500)):
+    from price_store import PriceStore
+    print(f"{'tickers':>8} {'cold sync':>12} {'warm sync':>12} {'load':>10} {'peak mem':>10}")
+    for n in sizes:
+        tickers = [f"T{i:05d}.NS" for i in range(n)]
+        bundle = synthetic_bundle(tickers)
+
+        def case(trace):
+            with scratch_dir(), bundle.replay():
+                store = PriceStore()
+                runs = [measure(store.sync, tickers, trace=trace), measure(store.sync, tickers, trace=trace),
+                        measure(store.load, tickers, 100, trace=trace)]
+            return _peak(runs) if trace else runs
+
+        (t_cold, t_warm, t_load), peak = timed_and_peak(case)
+        print(f"{n:>8} {t_cold * 1000:>10.0f}ms {t_warm * 1000:>10.1f}ms {t_load * 1000:>8.0f}ms {peak:>8.1f}MB")
+
+
+def report_frame(n_rows):
+    lots, prices = synthetic_lots(n_rows * 2, n_tickers=n_rows, n_holders=1)
+    pos = compute_holdings(lots, prices).reset_index()
+    return pos.assign(Date=BENCH_AT.strftime('%Y-%m-%d %H:%M'))
+
+
+def bench_rendering(sizes=(10, 100, 500)):
+    import charts
+    import stock_bot
+    import matplotlib.pyplot  # noqa: F401 - import நேரம் அளவீட்டில் சேராமல்
+    print(f"{'rows':>8} {'charts':>12} {'pdf':>12} {'peak mem':>10}")
+    for n in sizes:
+        df = report_frame(n)
+
+        def case(trace):
+            with scratch_dir():
+                # chart PNG cache (charts.CACHE_DIR) காலி - cold render; இல்லையெனில் cache hit நேரம் அளக்கப்படும்
+                shutil.rmtree(charts.CACHE_DIR, ignore_errors=True)
+                db.init_db()
+                pngs = {}
+                runs = [measure(lambda: pngs.update(stock_bot.create_visuals(df)), trace=trace),
+                        measure(stock_bot.create_pdf_report, df, 'Bench', pngs, trace=trace)]
+            return _peak(runs) if trace else runs
+
+        (t_charts, t_pdf), peak = timed_and_peak(case)
+        print(f"{n:>8} {t_charts * 1000:>10.0f}ms {t_pdf * 1000:>10.0f}ms {peak:>8.1f}MB")
+
+
+def bench_pdf(sizes=(50, 500, 5000)):
+    # PDF builder மட்டும்: வரிசைகள் அதிகரிக்கும் போது நேரம், பக்கங்கள், உச்ச நினைவகம்
+    from pdf_report import build_report
+    print(f"{'rows':>8} {'build':>12} {'pages':>8} {'size':>10} {'peak mem':>10}")
+    for n in sizes:
+        df = report_frame(n)
+        t_build = measure(build_report, df, 'Bench', BENCH_AT)
+        _, peak = measure(build_report, df, 'Bench', BENCH_AT, trace=True)
+        with build_report(df, 'Bench', BENCH_AT) as pdf:
+            data = pdf.read()
+        pages = data.count(b'/Type /Page') - data.count(b'/Type /Pages')
+        print(f"{n:>8} {t_build * 1000:>10.0f}ms {pages:>8} {len(data) / 1e3:>8.0f}KB {peak:>8.1f}MB")
+
+
+def legacy_visuals(df, prefix):
+    # பழைய create_visuals: ஒவ்வொரு முறையும் புதிய pyplot figures + seaborn, PNG கோப்புகள்
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.figure(figsize=(6, 4))
+    plt.pie(df['Qty'] * df['Live'], labels=df['Ticker'], autopct='%1.1f%%', colors=sns.color_palette('pastel'))
+    plt.title('Portfolio Distribution')
+    plt.tight_layout()
+    plt.savefig(f'{prefix}_pie_chart.png')
+    plt.close()
+    plt.figure(figsize=(6, 4))
+    colors = ['#66bb6a' if x >= 0 else '#ef5350' for x in df['PL']]
+    sns.barplot(x='Ticker', y='PL', data=df, palette=colors, hue='Ticker', legend=False)
+    plt.axhline(0, color='black', linewidth=0.8)
+    plt.title('Profit & Loss (Rs.)')
+    plt.ylabel('Amount (Rs)')
+    plt.tight_layout()
+    plt.savefig(f'{prefix}_bar_chart.png')
+    plt.close()
+
+
+def bench_charts(n_holders=50, positions=12):
+    # 50 holders × (pie + bar): பழைய pyplot/seaborn vs Agg templates (cold) vs மாறாத தரவு (cache)
+    import stock_bot
+    import matplotlib
+    matplotlib.use('Agg')
+    frames = [report_frame(positions).assign(Ticker=lambda d, i=i: d['Ticker'] + f"-{i}") for i in range(n_holders)]
+    with scratch_dir():
+        t_legacy = measure(lambda: [legacy_visuals(df, f"H{i}") for i, df in enumerate(frames)])
+        t_cold = measure(lambda: [stock_bot.create_visuals(df) for df in frames])
+        t_warm = measure(lambda: [stock_bot.create_visuals(df) for df in frames])
+    print(f"{'holders':>8} {'legacy':>12} {'agg cold':>12} {'cached':>12}")
+    print(f"{n_holders:>8} {t_legacy * 1000:>10.0f}ms {t_cold * 1000:>10.0f}ms {t_warm * 1000:>10.0f}ms")
+
+
+def bench_db_writes(sizes=(10, 1000, 10000)):
+    print(f"{'rows':>8} {'save_to_db':>12} {'peak mem':>10}")
+    for n in sizes:
+        df = report_frame(n).assign(Tax_Type='STCG', Tax_Amt=1.0, Tax_Estimate='STCG(20%): ₹1.0')
+
+        def case(trace):
+            with scratch_dir():
+                db.init_db()
+                return measure(db.save_to_db, df, trace=trace)
+
+        t_save, (_, peak) = timed_and_peak(case)
+        print(f"{n:>8} {t_save * 1000:>10.1f}ms {peak:>8.1f}MB")
+
+
+# பழைய stock_bot.py-ன் module-level imports (எல்லா run-களிலும் ஏற்றப்பட்டவை)
+LEGACY_IMPORTS = ("import yfinance, pandas, matplotlib.pyplot, seaborn, fpdf, gtts, requests, google.genai, "
+                  "smtplib, email.mime.multipart, whatsapp_api_client_python")
+STARTUP_CASES = [
+    ("legacy eager imports", LEGACY_IMPORTS),
+    # run_once-ன் விடுமுறை பாதை: registry, holiday check, delivery service + Green API SDK
+    ("holiday run", "import stock_bot; stock_bot.load_registry(); stock_bot.check_holiday_from_csv(); "
+                    "import delivery, requests.adapters, whatsapp_api_client_python.API"),
+    ("intraday run (no PDF)", "import stock_bot, pandas, yfinance, google.genai, gtts, whatsapp_api_client_python, "
+                              "market_data, price_store, holdings, tax, analytics"),
+]
+
+
+def bench_startup(repeat=3):
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'startup case':<24} {'wall time':>10}")
+    for label, code in STARTUP_CASES:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=here, check=True)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<24} {best * 1000:>8.0f}ms")
+
+
+BENCHMARKS = {
+    'indicators': bench_indicators,
+    'holdings': bench_holdings,
+    'tax': bench_tax,
+    'startup': bench_startup,
+    'fetch': bench_market_fetch,
+    'render': bench_rendering,
+    'charts': bench_charts,
+    'pdf': bench_pdf,
+    'db': bench_db_writes,
+    'e2e': bench_end_to_end,
+    'holders': bench_holders,
+    'backtest': bench_backtest,
+    'archive': bench_archive,
+}
+
+
+if __name__ == "__main__":
+    # `python bench.py` - எல்லாம்; `python bench.py e2e render` - தேர்ந்தெடுத்தவை மட்டும்
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
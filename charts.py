@@ -0,0 +1,153 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from datetime import date
+from functools import cache
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import metrics
+
+# seaborn 'pastel' palette - seaborn இல்லாமல் அதே நிறங்கள்
+PASTEL = ['#a1c9f4', '#ffb482', '#8de5a1', '#ff9f9b', '#d0bbff',
+          '#debb9b', '#fab0e4', '#cfcfcf', '#fffea3', '#b9f2f0']
+PROFIT_COLOR, LOSS_COLOR = '#66bb6a', '#ef5350'
+# <sha256>.png - git-ல் commit ஆகும் DB-ல் அல்ல; workflow-ல் actions/cache வழியே runs இடையே பாதுகாக்கப்படும்
+CACHE_DIR = 'chart_cache'
+# காலை PNG மாலை run வரை பயன்படும்; அதற்கு மேல் வைக்க வேண்டாம்
+CACHE_TTL_DAYS = 2
+
+
+class _Template:
+    # ஒருமுறை உருவாக்கப்பட்ட Figure + Agg canvas; title / axis அமைப்புகள் அப்படியே இருக்கும்,
+    # ஒவ்வொரு render-க்கும் தரவு artists (wedges, bars, labels) மட்டும் மாற்றப்படும்.
+    # ax.clear() ticks-ஐ மீண்டும் உருவாக்கும் - அதுவே render நேரத்தின் பெரும்பகுதி.
+    def __init__(self, setup, **adjust):
+        self.figure = Figure(figsize=(6, 4))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.figure.subplots_adjust(**adjust)
+        setup(self.ax)
+        # setup-ல் வரைந்தவை (உதா: பூஜ்ய கோடு) எல்லா renders-லும் இருக்கும்
+        self.fixed = set(self.ax.get_children())
+        self.lock = threading.Lock()
+
+    def png(self, draw, *args):
+        with self.lock:
+            ax = self.ax
+            for artist in [*ax.patches, *ax.texts, *ax.collections, *ax.lines]:
+                if artist not in self.fixed:
+                    artist.remove()
+            ax.containers.clear()
+            ax.relim()
+            draw(ax, *args)
+            buf = io.BytesIO()
+            self.figure.savefig(buf, format='png')
+            return buf.getvalue()
+
+
+def _setup_pie(ax):
+    ax.set_title('Portfolio Distribution')
+
+
+def _setup_bar(ax):
+    ax.axhline(0, color='black', linewidth=0.8)
+    ax.set_title('Profit & Loss (Rs.)')
+    ax.set_ylabel('Amount (Rs)')
+    ax.tick_params(axis='x', labelrotation=45, labelsize=8)
+
+
+def _setup_history(ax):
+    ax.axhline(0, color='black', linewidth=0.8)
+    ax.set_title('Return & Drawdown (%)')
+    ax.tick_params(axis='x', labelrotation=30, labelsize=8)
+
+
+@cache
+def _templates():
+    return {
+        'pie': _Template(_setup_pie, left=0.05, right=0.95, top=0.88, bottom=0.05),
+        'bar': _Template(_setup_bar, left=0.15, right=0.97, top=0.9, bottom=0.25),
+        'history': _Template(_setup_history, left=0.12, right=0.97, top=0.9, bottom=0.2),
+    }
+
+
+def _draw_pie(ax, labels, values):
+    # 'Qty' × 'Live' - பங்குகளின் மதிப்பு வாரியான பரவல்
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=PASTEL)
+
+
+def _draw_bar(ax, labels, values):
+    # லாபத்திற்கு பச்சை, நஷ்டத்திற்கு சிவப்பு நிறம்; எண் நிலைகள் - category units holders இடையே சேராமல்
+    positions = range(len(labels))
+    ax.bar(positions, values, color=[PROFIT_COLOR if v >= 0 else LOSS_COLOR for v in values])
+    ax.set_xticks(positions, labels)
+    ax.autoscale_view()
+
+
+def _draw_history(ax, dates, returns, drawdowns):
+    # cash-flow neutral வருமானம் (கோடு) மற்றும் உச்சத்திலிருந்து சரிவு (நிரப்பு)
+    x = [date.fromisoformat(d) for d in dates]
+    ax.plot(x, returns, color='#3498db', linewidth=1.2, label='Return')
+    ax.fill_between(x, drawdowns, 0, color=LOSS_COLOR, alpha=0.35, label='Drawdown')
+    ax.autoscale_view()
+
+
+def chart_key(kind, *data):
+    return hashlib.sha256(json.dumps([kind, *data]).encode('utf-8')).hexdigest()
+
+
+# --- Charts: in-memory PNG, வரையப்பட்ட தரவின் hash வாரியாக கோப்பு cache ---
+class ChartRenderer:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cutoff = time.time() - CACHE_TTL_DAYS * 86400
+        for entry in os.scandir(self.cache_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                # delivery pool-ன் மற்றொரு renderer ஏற்கனவே நீக்கியது
+                pass
+
+    def _render(self, kind, draw, *data):
+        path = os.path.join(self.cache_dir, f"{chart_key(kind, *data)}.png")
+        try:
+            with open(path, 'rb') as f:
+                png = f.read()
+            metrics.incr('charts.cache', 'hits')
+            return png
+        except FileNotFoundError:
+            pass
+        metrics.incr('charts.cache', 'misses')
+        png = _templates()[kind].png(draw, *data)
+        # தற்காலிக கோப்பில் எழுதி rename - ஒரே chart-ஐ இரண்டு holders ஒரே நேரத்தில் எழுதினாலும் பாதி கோப்பு இல்லை
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+        return png
+
+    def render(self, df):
+        # hash காட்டப்படும் துல்லியத்தில்: பங்கு % ஒரு தசமம், P&L முழு ரூபாய்
+        labels = [str(t) for t in df['Ticker']]
+        value = (df['Qty'] * df['Live']).astype(float)
+        total = value.sum()
+        shares = [round(v / total * 100, 1) if total else 0.0 for v in value]
+        pl = [round(float(v)) for v in df['PL']]
+        return {
+            'pie': self._render('pie', _draw_pie, labels, shares),
+            'bar': self._render('bar', _draw_bar, labels, pl),
+        }
+
+    def render_history(self, curve, drawdown):
+        # analytics.holder_summary-ன் curve / drawdown; புதிய நாள் சேரும் வரை cache-ல் இருந்து
+        dates = [d.strftime('%Y-%m-%d') for d in curve.index]
+        returns = [round(float(v), 2) for v in (curve['Index'] - 1) * 100]
+        drawdowns = [round(float(v), 2) for v in drawdown * 100]
+        return self._render('history', _draw_history, dates, returns, drawdowns)
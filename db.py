@@ -0,0 +1,149 @@
+import re
+import sqlite3
+import threading
+
+DB_FILE = 'portfolio_history.db'
+# PRAGMA user_version - schema மாற்றங்களின் பதிப்பு
+SCHEMA_VERSION = 3
+
+_conn = None
+_lock = threading.Lock()
+
+
+def connect():
+    # ஒரு run முழுவதும் ஒரே connection (WAL mode) - ஒவ்வொரு holder-க்கும் புதிதாக திறக்க வேண்டாம்
+    global _conn
+    with _lock:
+        if _conn is None:
+            _conn = sqlite3.connect(DB_FILE, timeout=30, check_same_thread=False)
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute("PRAGMA synchronous=NORMAL")
+        return _conn
+
+
+def close():
+    # git-ல் commit செய்யும் முன் WAL கோப்பை முதன்மை DB-க்குள் இணைத்தல்
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            _conn.close()
+            _conn = None
+
+
+def parse_tax_label(label):
+    # பழைய Tax_Est உரை -> (Tax_Type, Tax_Amt); உதா: "STCG(20%): ₹4.3" -> ('STCG', 4.3)
+    match = re.match(r'(STCG|LTCG)\(.*?\): ₹(-?[\d.]+)', label or "")
+    if match:
+        return match.group(1), float(match.group(2))
+    if label == "வரி இல்லை":
+        return 'NONE', 0.0
+    return None, None
+
+
+def init_db():
+    try:
+        conn = connect()
+        with conn:
+            # PRIMARY KEY: ஒரே தேதியில், ஒரு நபருக்கு, ஒரு டிக்கர் ஒரு முறை மட்டுமே பதிவாகும்
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS history (
+                    Date TEXT,
+                    Holder TEXT,
+                    Ticker TEXT,
+                    Qty REAL,
+                    Avg_Price REAL,
+                    Live_Price REAL,
+                    PL REAL,
+                    Tax_Est TEXT,
+                    PRIMARY KEY (Date, Holder, Ticker)
+                )
+            ''')
+            # ஒவ்வொரு intraday run-ம் தனி timestamp-உடன் (Ts = IST 'YYYY-MM-DD HH:MM')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    Ts TEXT,
+                    Holder TEXT,
+                    Ticker TEXT,
+                    Qty REAL,
+                    Avg_Price REAL,
+                    Live_Price REAL,
+                    PL REAL,
+                    Tax_Type TEXT,
+                    Tax_Amt REAL,
+                    PRIMARY KEY (Holder, Ticker, Ts)
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (Ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_holder ON history (Holder, Ticker, Date)")
+        migrate(conn)
+    except Exception as e:
+        print(f"❌ Init DB Error: {e}")
+
+
+def migrate(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        # v1: history-க்கு எண் வடிவ வரி columns; பழைய வரிசைகள் snapshots-க்கும் நகலெடுக்கப்படும்
+        with conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(history)")}
+            if 'Tax_Type' not in columns:
+                conn.execute("ALTER TABLE history ADD COLUMN Tax_Type TEXT")
+            if 'Tax_Amt' not in columns:
+                conn.execute("ALTER TABLE history ADD COLUMN Tax_Amt REAL")
+            rows = conn.execute("SELECT rowid, Tax_Est FROM history WHERE Tax_Type IS NULL").fetchall()
+            conn.executemany(
+                "UPDATE history SET Tax_Type = ?, Tax_Amt = ? WHERE rowid = ?",
+                [(*parse_tax_label(label), rowid) for rowid, label in rows]
+            )
+            # பழைய நாள் பதிவுகளுக்கு நேரம் தெரியாது - சந்தை முடிவு நேரமாக எடுத்துக்கொள்ளப்படுகிறது
+            conn.execute('''
+                INSERT OR IGNORE INTO snapshots
+                (Ts, Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Type, Tax_Amt)
+                SELECT Date || ' 15:30', Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Type, Tax_Amt
+                FROM history
+            ''')
+            conn.execute("PRAGMA user_version = 1")
+    if version < 2:
+        # v2: செய்தித் தலைப்புகள் அறிக்கை சென்றடைந்த பிறகே 'பார்த்தவை'; பழைய வரிசைகள் fetch-லேயே பார்த்தவையாகக் கருதப்பட்டன
+        with conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(news)")}
+            if columns and 'Delivered_At' not in columns:
+                conn.execute("ALTER TABLE news ADD COLUMN Delivered_At TEXT")
+                conn.execute("UPDATE news SET Delivered_At = Fetched_At")
+            conn.execute("PRAGMA user_version = 2")
+    if version < 3:
+        # v3: chart PNGs commit ஆகும் DB-ல் வேண்டாம் - charts.CACHE_DIR கோப்புகளுக்கு நகர்ந்தன
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS chart_cache")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def save_to_db(df):
+    # எல்லா holders-ன் வரிசைகளும் ஒரே transaction-ல், ஒரே executemany
+    try:
+        conn = connect()
+        snapshot_rows = list(df[[
+            'Date', 'Holder', 'Ticker', 'Qty', 'Avg', 'Live', 'PL', 'Tax_Type', 'Tax_Amt'
+        ]].itertuples(index=False, name=None))
+        # நேரமில்லாத தேதியை மட்டும் எடுக்க (YYYY-MM-DD) - நாளின் கடைசி run மட்டும் history-ல்
+        history_rows = [
+            (ts[:10], holder, ticker, qty, avg, live, pl, label, tax_type, tax_amt)
+            for (ts, holder, ticker, qty, avg, live, pl, tax_type, tax_amt), label
+            in zip(snapshot_rows, df['Tax_Estimate'])
+        ]
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO snapshots
+                (Ts, Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Type, Tax_Amt)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', snapshot_rows)
+            # INSERT OR REPLACE: டூப்ளிகேட் एंट्री வந்தால் பழையதை அழித்துவிட்டு புதியதைச் சேர்க்கும்
+            conn.executemany('''
+                INSERT OR REPLACE INTO history
+                (Date, Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Est, Tax_Type, Tax_Amt)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', history_rows)
+        print(f"✅ {len(snapshot_rows)} வரிசைகள் டேட்டாபேஸில் புதுப்பிக்கப்பட்டன.")
+    except Exception as e:
+        print(f"❌ Database Save Error: {e}")
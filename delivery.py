@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import db
+import metrics
+from timeutil import ist_now
+
+# உள்ளூர் stub servers-க்கு எதிராக சோதிக்க இவற்றை மாற்றலாம்
+GREEN_API_HOST = os.getenv('GREEN_API_HOST', "https://api.green-api.com")
+GREEN_API_MEDIA = os.getenv('GREEN_API_MEDIA', "https://media.green-api.com")
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', '1') == '1'
+
+MAX_WORKERS = 4
+# ஒரு channel-ல் இரண்டு அனுப்புதல்களின் தொடக்கத்துக்கு இடையே குறைந்தபட்ச இடைவெளி (வினாடி)
+RATE_LIMITS = {'whatsapp': 0.5, 'email': 0.0}
+RETRIES = 3
+BACKOFF_S = 1.0
+# ஒரே பெறுநருக்கு: உரை (அறிக்கை) → கோப்பு (குரல்) → email; ஒரே வகைக்குள் சேர்த்த வரிசை
+STAGE_ORDER = {'whatsapp.send': 0, 'whatsapp.upload': 1, 'smtp.send': 2}
+# idempotency keys ஒரு slot / நாளுக்குள் மட்டுமே பொருள் - பழைய வரிசைகள் நீக்கப்படும்
+RETENTION_DAYS = 30
+
+
+class DeliveryError(Exception):
+    pass
+
+
+class _RateLimiter:
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# --- அனுப்புதல் சேவை: ஒரு run-க்கு ஒரு Green API session, ஒரு SMTP connection ---
+class DeliveryService:
+    def __init__(self, id_instance, api_token, sender, password, conn=None,
+                 max_workers=MAX_WORKERS, retries=RETRIES, backoff=BACKOFF_S):
+        self.id_instance, self.api_token = id_instance, api_token
+        self.sender, self.password = sender, password
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.conn = conn or db.connect()
+        with self.conn:
+            # Key = idempotency key; 'sent' ஆன key மீண்டும் அனுப்பப்படாது
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    Key TEXT PRIMARY KEY,
+                    Kind TEXT,
+                    Recipient TEXT,
+                    Status TEXT,
+                    Attempts INTEGER,
+                    Latency_S REAL,
+                    Sent_At TEXT
+                )
+            ''')
+        self.queue = []
+        self.lock = threading.Lock()
+        self.limits = {kind: _RateLimiter(interval) for kind, interval in RATE_LIMITS.items()}
+        self._api = None
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- pooled clients ---
+    def api(self):
+        with self.lock:
+            if self._api is None:
+                from requests.adapters import HTTPAdapter
+                from whatsapp_api_client_python import API
+                self._api = API.GreenApi(self.id_instance, self.api_token, host=GREEN_API_HOST, media=GREEN_API_MEDIA)
+                session = getattr(self._api, 'session', None)
+                if session is not None:
+                    # SDK ஒவ்வொரு request-க்கும் 'Connection: close' அமைக்கிறது - keep-alive pool வேண்டும்
+                    session.headers.pop('Connection', None)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+            return self._api
+
+    def _smtp_connection(self):
+        if self._smtp is None:
+            import smtplib
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=60)
+            if SMTP_STARTTLS:
+                server.starttls()
+            if self.password:
+                server.login(self.sender, self.password)
+            self._smtp = server
+        return self._smtp
+
+    def close(self):
+        with self._smtp_lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except Exception:
+                    pass
+                self._smtp = None
+
+    # --- queue ---
+    def sent(self, key):
+        row = self.conn.execute("SELECT Status FROM deliveries WHERE Key = ?", (key,)).fetchone()
+        return bool(row) and row[0] == 'sent'
+
+    def _enqueue(self, kind, stage, key, recipient, send):
+        with self.lock:
+            self.queue.append((kind, stage, key, recipient, send))
+
+    def whatsapp(self, key, chat_id, message):
+        def send():
+            response = self.api().sending.sendMessage(chatId=chat_id, message=message)
+            _check(response)
+            metrics.incr('whatsapp.send', 'bytes', len(message.encode('utf-8')))
+        self._enqueue('whatsapp', 'whatsapp.send', key, chat_id, send)
+
+    def whatsapp_file(self, key, chat_id, path, file_name, caption=""):
+        def send():
+            response = self.api().sending.sendFileByUpload(chatId=chat_id, path=path, fileName=file_name, caption=caption)
+            _check(response)
+            metrics.incr('whatsapp.upload', 'bytes', os.path.getsize(path))
+        self._enqueue('whatsapp', 'whatsapp.upload', key, chat_id, send)
+
+    def email(self, key, msg):
+        def send():
+            import smtplib
+            # smtplib connection thread-safe அல்ல - emails ஒரே connection-ல் ஒன்றன் பின் ஒன்றாக
+            with self._smtp_lock:
+                try:
+                    self._smtp_connection().send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    self._smtp = None
+                    raise
+            metrics.incr('smtp.send', 'bytes', len(msg.as_bytes()))
+        self._enqueue('email', 'smtp.send', key, msg['To'], send)
+
+    # --- flush ---
+    def _deliver(self, kind, stage, key, recipient, send):
+        if self.sent(key):
+            metrics.incr('delivery', 'duplicates')
+            return {'key': key, 'kind': kind, 'recipient': recipient, 'status': 'duplicate', 'attempts': 0, 'latency_s': 0.0}
+        start = time.perf_counter()
+        status, error = 'failed', None
+        for attempt in range(1, self.retries + 1):
+            self.limits[kind].wait()
+            try:
+                with metrics.stage(stage):
+                    send()
+                status = 'sent'
+                break
+            except Exception as e:
+                error = e
+                if attempt < self.retries:
+                    metrics.incr(stage, 'retries')
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+        latency = time.perf_counter() - start
+        with self.lock, self.conn:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO deliveries (Key, Kind, Recipient, Status, Attempts, Latency_S, Sent_At)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, kind, recipient, status, attempt, latency, ist_now().isoformat()))
+        return {'key': key, 'kind': kind, 'recipient': recipient, 'status': status, 'attempts': attempt,
+                'latency_s': round(latency, 3), 'error': str(error) if status != 'sent' else None}
+
+    def _deliver_group(self, items):
+        return [self._deliver(*item) for item in items]
+
+    def flush(self):
+        # ஒரே பெறுநருக்கான செய்திகள் வரிசைப்படி (அறிக்கை → குரல்); வெவ்வேறு பெறுநர்கள் ஒரே நேரத்தில்
+        with self.lock:
+            queue, self.queue = self.queue, []
+        groups = {}
+        # render threads முடியும் வரிசையில் அல்ல - sorted() நிலையானது
+        for item in sorted(queue, key=lambda item: STAGE_ORDER[item[1]]):
+            groups.setdefault((item[0], item[3]), []).append(item)
+        if not groups:
+            return []
+        cutoff = (ist_now() - timedelta(days=RETENTION_DAYS)).isoformat()
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM deliveries WHERE Sent_At < ?", (cutoff,))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as pool:
+            results = [r for batch in pool.map(self._deliver_group, groups.values()) for r in batch]
+        for r in results:
+            icon = {'sent': '✅', 'duplicate': '⏭️'}.get(r['status'], '❌')
+            print(f"{icon} {r['kind']} → {r['recipient']} ({r['status']}, {r['attempts']} முயற்சி, {r['latency_s']:.2f}s)"
+                  + (f": {r['error']}" if r.get('error') else ""))
+        return results
+
+
+def _check(response):
+    # SDK பிழைகளை exception-ஆக எழுப்புவதில்லை - status code பார்த்து retry
+    code = getattr(response, 'code', None)
+    if code != 200:
+        raise DeliveryError(f"Green API status {code}: {getattr(response, 'error', None) or response}")
@@ -0,0 +1,267 @@
+import gzip
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import db
+import timeutil
+import voice
+
+
+def text_key(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _frozen_datetime(at):
+    # timeutil.ist_now / stock_bot-ன் datetime.now(timezone.utc) பதிவு செய்த நேரத்தையே தரும்
+    # (ist_now = UTC + 5:30, tzinfo UTC-யாகவே இருக்கும்)
+    utc = at - timedelta(hours=5, minutes=30)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return utc if tz else at.replace(tzinfo=None)
+    return FrozenDatetime
+
+
+@contextmanager
+def _patched(patches):
+    # [(object, attribute, புதிய மதிப்பு)] - வெளியேறும் போது பழைய மதிப்புகள் மீட்கப்படும்
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    for obj, name, value in patches:
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for obj, name, value in reversed(saved):
+            setattr(obj, name, value)
+
+
+# --- வெளி அழைப்புகளின் பதிவு (Yahoo, Gemini, gTTS) + replay-க்கான உள்ளூர் மாற்றுகள் ---
+class FixtureBundle:
+    def __init__(self, data=None):
+        self.data = data or {
+            'recorded_at': None,
+            'db': None,     # பதிவு தொடங்கிய போதைய portfolio_history.db (caches அதே நிலையில் replay)
+            'prices': {},   # interval -> {ticker: OHLCV frame}
+            'news': {},     # ticker -> yf.Ticker().news
+            'info': {},     # ticker -> yf.Ticker().info
+            'gemini': {},   # sha256(prompt) -> பதில்
+            'tts': {},      # sha256(phrase) -> mp3 bytes
+        }
+        # replay-ல் Green API / SMTP வழியே "அனுப்பப்பட்டவை"
+        self.sent = []
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, 'rb') as f:
+            return cls(pickle.load(f))
+
+    def save(self, path):
+        with gzip.open(path, 'wb') as f:
+            pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"🎞️ Fixture bundle சேமிக்கப்பட்டது: {path}")
+
+    # --- record: உண்மையான அழைப்புகள், பதில்கள் bundle-ல் ---
+    def _store_frame(self, frame, tickers, interval):
+        if frame is None or frame.empty:
+            return
+        store = self.data['prices'].setdefault(interval, {})
+        if not isinstance(frame.columns, pd.MultiIndex):
+            frame = pd.concat({tickers[0]: frame}, axis=1)
+        for ticker in frame.columns.get_level_values(0).unique():
+            bars = frame[ticker].dropna(how='all')
+            old = store.get(ticker)
+            if old is not None:
+                bars = pd.concat([old, bars])
+                bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+            store[ticker] = bars
+
+    @contextmanager
+    def record(self, client=None):
+        import yfinance as yf
+        import gtts
+        import stock_bot
+        bundle = self
+        real_download, real_ticker, real_tts = yf.download, yf.Ticker, gtts.gTTS
+        self.data['recorded_at'] = timeutil.ist_now()
+        db.close()
+        if os.path.exists(db.DB_FILE):
+            with open(db.DB_FILE, 'rb') as f:
+                self.data['db'] = f.read()
+
+        def download(tickers, *args, **kwargs):
+            frame = real_download(tickers, *args, **kwargs)
+            names = [tickers] if isinstance(tickers, str) else list(tickers)
+            bundle._store_frame(frame, names, kwargs.get('interval', '1d'))
+            return frame
+
+        class RecordingTicker:
+            def __init__(self, ticker, *args, **kwargs):
+                self._ticker = ticker
+                self._real = real_ticker(ticker, *args, **kwargs)
+
+            @property
+            def news(self):
+                bundle.data['news'][self._ticker] = news = self._real.news
+                return news
+
+            @property
+            def info(self):
+                bundle.data['info'][self._ticker] = info = self._real.info
+                return info
+
+            def __getattr__(self, name):
+                return getattr(self._real, name)
+
+        class RecordingTTS(real_tts):
+            def save(self, savefile):
+                super().save(savefile)
+                with open(savefile, 'rb') as f:
+                    bundle.data['tts'][text_key(self.text)] = f.read()
+
+        real_client = client or stock_bot.get_client()
+        # வெற்று குரல் cache - எல்லா phrase clips-ம் gTTS வழியே பதிவாகும்
+        voice_dir = tempfile.mkdtemp(prefix='record_voice_')
+        patches = [(yf, 'download', download), (yf, 'Ticker', RecordingTicker), (gtts, 'gTTS', RecordingTTS),
+                   (voice, 'CACHE_DIR', voice_dir)]
+        if real_client is not None:
+            real_generate = real_client.models.generate_content
+
+            def generate_content(model, contents, **kwargs):
+                response = real_generate(model=model, contents=contents, **kwargs)
+                bundle.data['gemini'][text_key(contents)] = response.text
+                return response
+            patches.append((real_client.models, 'generate_content', generate_content))
+        try:
+            with _patched(patches):
+                yield
+        finally:
+            shutil.rmtree(voice_dir, ignore_errors=True)
+
+    # --- replay: network இல்லாத உள்ளூர் மாற்றுகள் ---
+    def _download(self, tickers, start=None, end=None, period=None, interval='1d', **kwargs):
+        names = [tickers] if isinstance(tickers, str) else list(tickers)
+        store = self.data['prices'].get(interval, {})
+        frames = {}
+        for ticker in names:
+            bars = store.get(ticker)
+            if bars is None or bars.empty:
+                continue
+            dates = bars.index.tz_localize(None) if bars.index.tz is not None else bars.index
+            if start is not None:
+                bars = bars[dates >= pd.Timestamp(start)]
+            elif period == '1d':
+                bars = bars[dates.normalize() == dates.normalize().max()]
+            frames[ticker] = bars
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    @contextmanager
+    def replay(self):
+        import yfinance as yf
+        import gtts
+        import smtplib
+        import stock_bot
+        from whatsapp_api_client_python import API
+        from whatsapp_api_client_python.response import Response
+        bundle = self
+
+        class ReplayTicker:
+            def __init__(self, ticker, *args, **kwargs):
+                self.ticker = ticker
+
+            @property
+            def news(self):
+                return bundle.data['news'].get(self.ticker, [])
+
+            @property
+            def info(self):
+                return bundle.data['info'].get(self.ticker, {})
+
+        class ReplayModels:
+            def generate_content(self, model, contents, **kwargs):
+                text = bundle.data['gemini'].get(text_key(contents), bundle.data.get('gemini_default'))
+                if text is None:
+                    raise KeyError("Gemini பதில் fixture-ல் இல்லை")
+                return type('Response', (), {'text': text})()
+
+        client = type('ReplayClient', (), {'models': ReplayModels()})()
+
+        class ReplayTTS:
+            def __init__(self, text, lang='ta', **kwargs):
+                self.text = text
+
+            def save(self, savefile):
+                with open(savefile, 'wb') as f:
+                    f.write(bundle.data['tts'].get(text_key(self.text), b'ID3'))
+
+        class ReplaySending:
+            def sendMessage(self, chatId, message, **kwargs):
+                bundle.sent.append(('whatsapp', chatId, len(message.encode('utf-8'))))
+                return Response(200, '{}')
+
+            def sendFileByUpload(self, chatId, path, fileName=None, caption=None, **kwargs):
+                bundle.sent.append(('whatsapp_file', chatId, os.path.getsize(path)))
+                return Response(200, '{}')
+
+        class ReplayGreenApi:
+            def __init__(self, *args, **kwargs):
+                self.sending = ReplaySending()
+
+        class ReplaySMTP:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def starttls(self):
+                pass
+
+            def login(self, *args):
+                pass
+
+            def send_message(self, msg):
+                bundle.sent.append(('email', msg['To'], len(msg.as_bytes())))
+
+            def quit(self):
+                pass
+
+        # பதிவு நேர DB நிலையின் (இல்லையெனில் தற்போதைய DB-ன்) தற்காலிக நகலில் replay - உண்மையான DB மாறாது
+        db.close()
+        real_db = db.DB_FILE
+        scratch = tempfile.mkdtemp(prefix='replay_')
+        scratch_db = os.path.join(scratch, os.path.basename(real_db))
+        if self.data.get('db') is not None:
+            with open(scratch_db, 'wb') as f:
+                f.write(self.data['db'])
+        elif os.path.exists(real_db):
+            shutil.copy(real_db, scratch_db)
+        patches = [
+            (yf, 'download', self._download), (yf, 'Ticker', ReplayTicker), (gtts, 'gTTS', ReplayTTS),
+            (smtplib, 'SMTP', ReplaySMTP), (API, 'GreenApi', ReplayGreenApi),
+            (stock_bot, 'get_client', lambda: client), (db, 'DB_FILE', scratch_db),
+            (voice, 'CACHE_DIR', os.path.join(scratch, voice.CACHE_DIR)),
+        ]
+        if self.data.get('recorded_at') is not None:
+            frozen = _frozen_datetime(self.data['recorded_at'])
+            patches += [(timeutil, 'datetime', frozen), (stock_bot, 'datetime', frozen)]
+        try:
+            with _patched(patches):
+                try:
+                    yield self.sent
+                finally:
+                    db.close()
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
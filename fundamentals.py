@@ -0,0 +1,82 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import db
+import metrics
+from timeutil import ist_now
+
+MAX_WORKERS = 8
+
+
+def _download(ticker):
+    try:
+        with metrics.stage('yahoo.info'):
+            info = yf.Ticker(ticker).info or {}
+        metrics.incr('yahoo.info', 'bytes', len(json.dumps(info, default=str).encode('utf-8')))
+    except Exception as e:
+        print(f"Fundamentals fetch error for {ticker}: {e}")
+        info = {}
+    return ticker, info.get('trailingEps'), info.get('forwardEps'), info.get('bookValue')
+
+
+# --- Fundamentals cache: EPS / Book Value நாளுக்கு ஒருமுறை மட்டும் ---
+class FundamentalsStore:
+    def __init__(self, conn=None):
+        self.conn = conn or db.connect()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS fundamentals (
+                Ticker TEXT PRIMARY KEY,
+                Trailing_Eps REAL,
+                Forward_Eps REAL,
+                Book_Value REAL,
+                Fetched_At TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def refresh(self, tickers):
+        # இன்று (IST) இதுவரை எடுக்கப்படாத டிக்கர்கள் மட்டும், ஒரே bulk batch-ல்
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return 0
+        now = ist_now()
+        placeholders = ",".join("?" * len(tickers))
+        fetched = dict(self.conn.execute(
+            f"SELECT Ticker, Fetched_At FROM fundamentals WHERE Ticker IN ({placeholders})", tickers
+        ).fetchall())
+        today = now.strftime('%Y-%m-%d')
+        stale = [t for t in tickers if not (fetched.get(t) or "").startswith(today)]
+        metrics.incr('fundamentals.cache', 'hits', len(tickers) - len(stale))
+        metrics.incr('fundamentals.cache', 'misses', len(stale))
+        if not stale:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(stale))) as pool:
+            rows = list(pool.map(_download, stale))
+        # தரவு இல்லாத டிக்கர்களும் (Mutual Funds) NULL-ஆக சேமிக்கப்படும் - இன்று மீண்டும் கேட்க வேண்டாம்
+        self.conn.executemany('''
+            INSERT OR REPLACE INTO fundamentals (Ticker, Trailing_Eps, Forward_Eps, Book_Value, Fetched_At)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(*row, now.isoformat()) for row in rows])
+        self.conn.commit()
+        return len(stale)
+
+    def load(self, tickers):
+        tickers = sorted(set(tickers))
+        placeholders = ",".join("?" * len(tickers))
+        return pd.read_sql_query(
+            f"SELECT Ticker, Trailing_Eps, Forward_Eps, Book_Value FROM fundamentals WHERE Ticker IN ({placeholders})",
+            self.conn, params=tickers, index_col='Ticker'
+        ).reindex(tickers)
+
+
+def graham_number(fund):
+    # Graham Number = √(22.5 × EPS × Book Value); EPS அல்லது BV ≤ 0 என்றால் NaN
+    eps = fund['Trailing_Eps'].fillna(fund['Forward_Eps']).astype(float)
+    book_value = fund['Book_Value'].astype(float)
+    valid = (eps > 0) & (book_value > 0)
+    return pd.Series(np.where(valid, np.sqrt(22.5 * eps.where(valid) * book_value.where(valid)), np.nan),
+                     index=fund.index, name='Intrinsic_Value')
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from tax import open_lots
+
+# இந்த சதவீத லாபத்தை எட்டினால் profit booking ஆலோசனை
+PROFIT_TARGET_PCT = 20.0
+
+
+# --- Holdings engine: எல்லா holders-ன் positions ஒரே vectorized pass-ல் ---
+def compute_holdings(lots, prices, profit_target=PROFIT_TARGET_PCT):
+    # lots: Holder, Ticker, Qty, Avg_Price, Buy_Date (lot வரிசைகள்; விற்பனை = எதிர்மறை Qty)
+    # prices: Ticker -> நேரலை விலை (Series); விலை இல்லாத டிக்கர்களுக்கு Live = NaN
+    # விற்பனைகள் FIFO-படி பழைய lots-ல் கழிந்த பின் மீதமுள்ளவை மட்டும் - வரிக் கணக்கின் அதே lots.
+    # முழுதும் விற்ற டிக்கர்கள் positions-ல் வராது
+    lots = open_lots(lots)
+    lots = lots.assign(Qty=lots['Open_Qty'], Total_Cost=lots['Open_Qty'] * lots['Avg_Price'])
+    pos = lots.groupby(['Holder', 'Ticker'], sort=True).agg(
+        Qty=('Qty', 'sum'),
+        Total_Cost=('Total_Cost', 'sum'),
+        Buy_Date=('Buy_Date', 'min'),
+    )
+    pos['Buy_Date'] = pos['Buy_Date'].dt.strftime('%Y-%m-%d')
+    pos['Avg'] = pos['Total_Cost'] / pos['Qty']
+    live = prices.reindex(pos.index.get_level_values('Ticker')).to_numpy(dtype=float)
+    pos['Live'] = np.where(live > 0, live, np.nan)
+    pos['PL'] = ((pos['Live'] - pos['Avg']) * pos['Qty']).round(2)
+    pos['PL_Pct'] = pos['PL'] / pos['Total_Cost'] * 100
+    pos['Value'] = pos['Qty'] * pos['Live']
+    pos['Alloc_Pct'] = pos['Value'] / pos.groupby(level='Holder')['Value'].transform('sum') * 100
+    pos['Profit_Flag'] = pos['PL_Pct'] >= profit_target
+    return pos
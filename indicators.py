@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+RSI_PERIOD = 14
+TRADING_DAYS = 252
+
+
+# --- Indicator engine: dates × tickers அட்டவணையில் எல்லா columns-க்கும் ஒரே pass ---
+def _values(closes):
+    # விடுமுறை/NAV இடைவெளிகளை முந்தைய விலையால் நிரப்புதல்; தொடக்க NaN அப்படியே இருக்கும்
+    return closes.ffill().to_numpy(dtype=float)
+
+
+def _wilder(values, period):
+    # Wilder smoothing = alpha 1/n EMA, முதல் மதிப்பு = முதல் `period` மாற்றங்களின் சராசரி
+    seed = _rolling_sum(values, period) / period
+    has_seed = ~np.isnan(seed)
+    first = has_seed & (np.cumsum(has_seed, axis=0) == 1)
+    before = np.cumsum(has_seed, axis=0) == 0
+    seeded = np.where(before, np.nan, np.where(first, seed, values))
+    return pd.DataFrame(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+
+def rsi(closes, period=RSI_PERIOD):
+    values = _values(closes)
+    out = np.full(values.shape, np.nan)
+    if len(values) > period:
+        delta = np.diff(values, axis=0)
+        gains = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+        losses = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+        avg_gain = _wilder(gains, period)
+        avg_loss = _wilder(losses, period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+            out[1:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + rs))
+        out[1:][np.isnan(avg_gain)] = np.nan
+    return pd.DataFrame(out, index=closes.index, columns=closes.columns)
+
+
+def _rolling_sum(values, window):
+    csum = np.cumsum(np.nan_to_num(values), axis=0)
+    counts = np.cumsum(~np.isnan(values), axis=0)
+    out = csum.copy()
+    out[window:] = csum[window:] - csum[:-window]
+    n = counts.copy()
+    n[window:] = counts[window:] - counts[:-window]
+    out[n < window] = np.nan
+    return out
+
+
+def sma(closes, window):
+    values = _values(closes)
+    out = _rolling_sum(values, window) / window
+    return pd.DataFrame(out, index=closes.index, columns=closes.columns)
+
+
+def returns(closes, days):
+    values = _values(closes)
+    out = np.full(values.shape, np.nan)
+    if len(values) > days:
+        out[days:] = values[days:] / values[:-days] - 1
+    return pd.DataFrame(out * 100, index=closes.index, columns=closes.columns)
+
+
+def volatility(closes, window=20):
+    # தினசரி log returns-ன் rolling std, வருடாந்திர %
+    values = _values(closes)
+    log_ret = np.full(values.shape, np.nan)
+    log_ret[1:] = np.log(values[1:] / values[:-1])
+    s1 = _rolling_sum(log_ret, window)
+    s2 = _rolling_sum(log_ret ** 2, window)
+    var = (s2 - s1 ** 2 / window) / (window - 1)
+    out = np.sqrt(np.clip(var, 0, None) * TRADING_DAYS) * 100
+    return pd.DataFrame(out, index=closes.index, columns=closes.columns)
+
+
+def compute_indicators(closes):
+    # ஒவ்வொரு டிக்கருக்கும் கடைசி நாளின் மதிப்புகள் (index = Ticker)
+    if closes.empty:
+        return pd.DataFrame(columns=['RSI', 'SMA_20', 'SMA_50', 'Ret_5D', 'Ret_20D', 'Vol_20D'])
+    table = pd.DataFrame({
+        'RSI': rsi(closes).iloc[-1],
+        'SMA_20': sma(closes, 20).iloc[-1],
+        'SMA_50': sma(closes, 50).iloc[-1],
+        'Ret_5D': returns(closes, 5).iloc[-1],
+        'Ret_20D': returns(closes, 20).iloc[-1],
+        'Vol_20D': volatility(closes, 20).iloc[-1],
+    })
+    table.index.name = 'Ticker'
+    return table
@@ -0,0 +1,86 @@
+from functools import cached_property
+
+import pandas as pd
+
+import indicators
+
+
+# --- சந்தை தரவு: PriceStore.load() வழங்கும் (Ticker, Field) frame மீது ---
+class MarketData:
+    def __init__(self, frame):
+        # columns: (Ticker, Open/High/Low/Close/Adj Close/Volume)
+        self.frame = frame
+
+    @cached_property
+    def tickers(self):
+        # frame மாறுவதில்லை - ஒருமுறை கணக்கிட்டால் போதும் (per-ticker loops-லும்)
+        if self.frame.empty:
+            return []
+        return self.frame.columns.get_level_values(0).unique().tolist()
+
+    @cached_property
+    def _ticker_set(self):
+        return frozenset(self.tickers)
+
+    def history(self, ticker):
+        if ticker not in self._ticker_set:
+            return pd.DataFrame()
+        return self.frame[ticker].dropna(subset=['Close'])
+
+    def last_price(self, ticker):
+        # சந்தை நேரத்தில் இன்றைய daily bar-ன் Close தான் நேரலை விலை
+        hist = self.history(ticker)
+        if hist.empty:
+            return 0
+        return round(float(hist['Close'].iloc[-1]), 2)
+
+    @property
+    def closes(self):
+        # dates × tickers அகலமான Close அட்டவணை
+        if self.frame.empty:
+            return pd.DataFrame()
+        return self.frame.xs('Close', axis=1, level=1)
+
+    @cached_property
+    def indicators(self):
+        # RSI, SMA, returns, volatility - எல்லா டிக்கர்களுக்கும் ஒரே vectorized pass
+        return indicators.compute_indicators(self.closes)
+
+
+# --- NIFTY snapshot: ஒரு run-க்கு ஒரே ஒரு முறை index download ---
+INDEX_TICKER = "^NSEI"
+
+
+class IndexSnapshot:
+    def __init__(self, hist, rsi=None):
+        self.hist = hist.dropna(subset=['Close']) if not hist.empty else hist
+        if rsi is None and not self.hist.empty:
+            rsi = indicators.rsi(self.hist[['Close']]).iloc[-1, 0]
+        self.rsi = rsi
+
+    @classmethod
+    def from_market(cls, market, ticker=INDEX_TICKER):
+        ind = market.indicators
+        rsi = ind.at[ticker, 'RSI'] if ticker in ind.index else None
+        return cls(market.history(ticker), rsi)
+
+    @property
+    def empty(self):
+        return self.hist.empty
+
+    def tail(self, days):
+        return self.hist.tail(days)
+
+    def day_change_pct(self):
+        # இன்றைய bar: Open-ல் இருந்து தற்போதைய Close வரை
+        if self.hist.empty:
+            return None
+        today = self.hist.iloc[-1]
+        return ((today['Close'] - today['Open']) / today['Open']) * 100
+
+    def change_pct(self, days):
+        hist = self.tail(days)
+        if len(hist) < 2:
+            return None
+        start_price = hist['Close'].iloc[0]
+        return ((hist['Close'].iloc[-1] - start_price) / start_price) * 100
@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+import db
+
+# name -> {'calls', 'seconds', 'max_s', 'errors'} (stage) மற்றும் hits / misses / retries / bytes counters
+_stats = {}
+_lock = threading.Lock()
+_started = None
+# run-over-run போக்குக்கு போதுமானது; பழைய வரிசைகள் committed DB-ஐ ஒவ்வொரு run-லும் பெரிதாக்கும்
+RETENTION_DAYS = 90
+
+
+# --- Instrumentation: ஒவ்வொரு stage / வெளி அழைப்பின் நேரம், எண்ணிக்கை, cache, bytes ---
+def reset():
+    global _started
+    with _lock:
+        _stats.clear()
+        _started = time.perf_counter()
+
+
+def _entry(name):
+    return _stats.setdefault(name, {})
+
+
+def incr(name, key, n=1):
+    with _lock:
+        entry = _entry(name)
+        entry[key] = entry.get(key, 0) + n
+
+
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _entry(name)
+            entry['calls'] = entry.get('calls', 0) + 1
+            entry['seconds'] = entry.get('seconds', 0.0) + elapsed
+            entry['max_s'] = max(entry.get('max_s', 0.0), elapsed)
+            entry['errors'] = entry.get('errors', 0) + failed
+
+
+def timed(name):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary(mode):
+    ist = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
+    with _lock:
+        stages = {name: {k: round(v, 4) if isinstance(v, float) else v for k, v in entry.items()}
+                  for name, entry in sorted(_stats.items())}
+    wall = time.perf_counter() - _started if _started is not None else 0.0
+    return {'run_at': ist.strftime('%Y-%m-%d %H:%M:%S'), 'mode': mode, 'wall_s': round(wall, 3), 'stages': stages}
+
+
+def save(run, conn=None):
+    conn = conn or db.connect()
+    with conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS metrics (
+                Run_At TEXT,
+                Mode TEXT,
+                Wall_S REAL,
+                Summary TEXT
+            )
+        ''')
+        conn.execute("INSERT INTO metrics (Run_At, Mode, Wall_S, Summary) VALUES (?, ?, ?, ?)",
+                     (run['run_at'], run['mode'], run['wall_s'], json.dumps(run, ensure_ascii=False)))
+        cutoff = datetime.strptime(run['run_at'], '%Y-%m-%d %H:%M:%S') - timedelta(days=RETENTION_DAYS)
+        conn.execute("DELETE FROM metrics WHERE Run_At < ?", (cutoff.strftime('%Y-%m-%d %H:%M:%S'),))
+
+
+def track_run(mode):
+    # ஒரு முழு run: தொடக்கத்தில் reset, முடிவில் JSON சுருக்கம் (stdout + metrics table)
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            reset()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                run = summary(mode)
+                print(f"📊 Run summary: {json.dumps(run, ensure_ascii=False)}")
+                try:
+                    save(run)
+                except Exception as e:
+                    print(f"Metrics Save Error: {e}")
+        return wrapper
+    return decorator
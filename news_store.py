@@ -0,0 +1,96 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import yfinance as yf
+
+import db
+import metrics
+from timeutil import ist_now
+
+MAX_WORKERS = 8
+# ஒரு டிக்கருக்கு ஆய்வுக்கு அனுப்பப்படும் அதிகபட்ச செய்திகள்
+MAX_HEADLINES = 2
+# Yahoo feed-ல் இதைவிடப் பழைய தலைப்புகள் மீண்டும் வருவதில்லை - committed DB-ல் வைத்திருக்க வேண்டாம்
+RETENTION_DAYS = 30
+
+
+def _parse(item):
+    # yfinance-ன் பழைய (flat) மற்றும் புதிய ('content' உள்ளே) வடிவங்கள் இரண்டும்
+    content = item.get('content') or item
+    news_id = item.get('id') or item.get('uuid') or content.get('id')
+    title = content.get('title')
+    published = content.get('pubDate') or content.get('providerPublishTime')
+    if isinstance(published, (int, float)):
+        published = datetime.fromtimestamp(published, tz=timezone.utc).isoformat()
+    return news_id or title, title, published or ""
+
+
+# --- செய்தி cache: ஒரு run-க்கு ஒரு டிக்கருக்கு ஒருமுறை மட்டும் fetch ---
+class NewsStore:
+    def __init__(self, conn=None):
+        self.conn = conn or db.connect()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS news (
+                Ticker TEXT,
+                News_Id TEXT,
+                Title TEXT,
+                Published_At TEXT,
+                Fetched_At TEXT,
+                Delivered_At TEXT,
+                PRIMARY KEY (Ticker, News_Id)
+            )
+        ''')
+        self.conn.commit()
+
+    def _download(self, ticker):
+        try:
+            with metrics.stage('yahoo.news'):
+                items = yf.Ticker(ticker).news or []
+            metrics.incr('yahoo.news', 'bytes', len(json.dumps(items, default=str).encode('utf-8')))
+        except Exception as e:
+            print(f"News fetch error for {ticker}: {e}")
+            return None
+        return [parsed for parsed in map(_parse, items) if parsed[1]]
+
+    def fetch_latest(self, tickers):
+        # {ticker: சமீபத்திய MAX_HEADLINES [(News_Id, Title, புதியதா)]}; fetch பிழை என்றால் None
+        # புதியது = இதுவரை எந்த WhatsApp அறிக்கையிலும் சென்றடையாதது; fetch மட்டும் 'பார்த்தது' ஆகாது
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tickers))) as pool:
+            downloaded = dict(zip(tickers, pool.map(self._download, tickers)))
+
+        now = ist_now()
+        rows = [(ticker, news_id, title, published, now.isoformat())
+                for ticker, items in downloaded.items() if items for news_id, title, published in items]
+        with self.conn:
+            self.conn.execute("DELETE FROM news WHERE Fetched_At < ?", ((now - timedelta(days=RETENTION_DAYS)).isoformat(),))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO news (Ticker, News_Id, Title, Published_At, Fetched_At) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        placeholders = ",".join("?" * len(tickers))
+        delivered = set(self.conn.execute(
+            f"SELECT Ticker, News_Id FROM news WHERE Ticker IN ({placeholders}) AND Delivered_At IS NOT NULL", tickers
+        ).fetchall())
+
+        latest = {}
+        for ticker, items in downloaded.items():
+            if items is None:
+                latest[ticker] = None
+                continue
+            # புதிய தலைப்பு வரும் வரை அதே தொகுப்பு - AI cache key நிலையாக இருக்கும்
+            items = sorted(items, key=lambda it: it[2], reverse=True)[:MAX_HEADLINES]
+            latest[ticker] = [(news_id, title, (ticker, news_id) not in delivered) for news_id, title, _ in items]
+        return latest
+
+    def mark_delivered(self, headlines):
+        # headlines: [(Ticker, News_Id)] - அறிக்கை சென்றடைந்த பிறகு மட்டும்
+        now = ist_now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE news SET Delivered_At = ? WHERE Ticker = ? AND News_Id = ? AND Delivered_At IS NULL",
+                [(now, ticker, news_id) for ticker, news_id in headlines]
+            )
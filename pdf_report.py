@@ -0,0 +1,148 @@
+import io
+import tempfile
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+# ஒரு நேரத்தில் DataFrame-லிருந்து எடுக்கப்படும் வரிசைகள் - முழு அட்டவணையும் dicts / உரைகளாக மாறாது.
+# இது நினைவகத்துக்கு எல்லை அல்ல: fpdf2 எல்லாப் பக்கங்களையும் output() வரை வைத்திருக்கும், எனவே
+# உச்ச நினைவகம் பக்கங்களுடன் நேர்விகிதத்தில் வளரும் (bench.py pdf: 50 வரிசை 0.4MB, 500 - 0.6MB, 5000 - 3.2MB)
+CHUNK_ROWS = 500
+# இதைவிடப் பெரிய PDF தானாக தற்காலிக கோப்புக்கு மாறும் (SpooledTemporaryFile) - output() முழு
+# ஆவணத்தையும் bytes-ஆக உருவாக்கிய பிறகே எழுதும், ஆகவே இது attachment-ன் நகலை மட்டும் disk-க்கு நகர்த்தும்
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+ROW_HEIGHT = 8
+
+HOLDING_COLUMNS = [('Date', 27), ('Ticker', 35), ('Qty', 18), ('Avg', 26), ('Live', 26), ('P&L', 30), ('P&L%', 28)]
+HISTORY_COLUMNS = [('Month', 30), ('Value', 38), ('Cost', 38), ('P&L', 36), ('Return%', 24), ('Drawdown%', 24)]
+CONTRIBUTION_COLUMNS = [('Ticker', 60), ('P&L Change', 60), ('Share%', 40)]
+
+
+class PortfolioPDF(FPDF):
+    def __init__(self):
+        super().__init__()
+        self.set_auto_page_break(True, margin=15)
+        # தற்போது எழுதப்படும் அட்டவணையின் columns - புதிய பக்கத்தில் header மீண்டும் வரும்
+        self.table = None
+
+    def header(self):
+        self.set_font('helvetica', 'B', 16)
+        self.set_text_color(0, 0, 0)
+        self.cell(0, 10, 'Advanced Portfolio Report', align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(5)
+        if self.table:
+            self.table_header()
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font('helvetica', '', 8)
+        self.set_text_color(120, 120, 120)
+        self.cell(0, 8, f"Page {self.page_no()}", align='C')
+
+    def section(self, title, keep_with=40):
+        # தலைப்பு பக்கத்தின் அடியில் தனியாக நிற்காமல், அடுத்த உள்ளடக்கத்துடன் சேர்ந்து
+        if self.get_y() + keep_with > self.page_break_trigger:
+            self.add_page()
+        self.set_font('helvetica', 'B', 12)
+        self.set_text_color(0, 0, 0)
+        self.cell(0, 10, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def table_header(self):
+        self.set_font('helvetica', 'B', 9)
+        self.set_fill_color(52, 152, 219)  # Blue
+        self.set_text_color(255, 255, 255)  # White
+        for label, width in self.table:
+            self.cell(width, ROW_HEIGHT + 2, label, border=1, align='C', fill=True)
+        self.ln()
+        self.set_font('helvetica', '', 9)
+        self.set_text_color(0, 0, 0)
+
+    def write_table(self, columns, rows):
+        # rows: (cells, color) iterable - auto page break ஒவ்வொரு பக்கத்திலும் header-ஐ மீண்டும் வரையும்
+        self.table = columns
+        self.table_header()
+        for cells, color in rows:
+            self.set_text_color(*color)
+            for (_, width), text in zip(columns, cells):
+                self.cell(width, ROW_HEIGHT, text, border=1, align='C')
+            self.ln()
+        self.table = None
+        self.set_text_color(0, 0, 0)
+        self.ln(4)
+
+    def images(self, pngs, width=90, height=60):
+        # படங்கள் பக்கத்தில் பொருந்தாவிட்டால் புதிய பக்கம்
+        pngs = [png for png in pngs if png]
+        if not pngs:
+            return
+        if self.get_y() + height > self.page_break_trigger:
+            self.add_page()
+        y = self.get_y()
+        for i, png in enumerate(pngs):
+            self.image(io.BytesIO(png), x=10 + i * (width + 5), y=y, w=width)
+        self.set_y(y + height + 5)
+
+
+def _color(value):
+    return (0, 128, 0) if value >= 0 else (255, 0, 0)
+
+
+def _chunks(df, columns):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield from df.iloc[start:start + CHUNK_ROWS][columns].itertuples(index=False, name=None)
+
+
+def holding_rows(df):
+    for date, ticker, qty, avg, live, pl in _chunks(df, ['Date', 'Ticker', 'Qty', 'Avg', 'Live', 'PL']):
+        pct = round((live - avg) / avg * 100, 2) if avg else 0.0
+        yield ([str(date).split(' ')[0], str(ticker), f"{qty:g}", f"{avg:,.2f}", f"{live:,.2f}", f"{pl:,.2f}",
+                f"{pct}%"], _color(pl))
+
+
+def history_rows(curve, drawdown):
+    # மாத இறுதி நிலை; drawdown அந்த மாதத்தின் மிகக் குறைந்த மதிப்பு
+    monthly = curve.resample('ME').last().dropna(subset=['Value'])
+    worst = drawdown.resample('ME').min()
+    for month, value, cost, pl, index in monthly[['Value', 'Cost', 'PL', 'Index']].itertuples(name=None):
+        yield ([month.strftime('%Y-%m'), f"{value:,.2f}", f"{cost:,.2f}", f"{pl:,.2f}", f"{(index - 1) * 100:+.2f}%",
+                f"{worst.get(month, 0) * 100:.2f}%"], _color(pl))
+
+
+def contribution_rows(contribution, top=10):
+    for ticker, change, share in contribution.head(top).itertuples(name=None):
+        yield [str(ticker), f"{change:,.2f}", f"{share:.1f}%"], _color(change)
+
+
+# --- PDF அறிக்கை: வரிசைகள் chunks-ஆக, தானியங்கி பக்கப் பிரிவு, கோப்பு இல்லாத (spooled) output ---
+def build_report(df, name, generated_at, charts=None, history=None, history_chart=None):
+    pdf = PortfolioPDF()
+    pdf.add_page()
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(0, 10, f"Report for: {name}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font('helvetica', '', 10)
+    pdf.cell(0, 8, f"Date: {generated_at.strftime('%Y-%m-%d %I:%M %p')}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    total_value = float((df['Qty'] * df['Live']).sum())
+    total_pl = float(df['PL'].sum())
+    pdf.cell(0, 8, f"Positions: {len(df)} | Value: Rs. {total_value:,.2f} | P&L: Rs. {total_pl:,.2f}",
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(3)
+
+    pdf.section('Holdings')
+    pdf.write_table(HOLDING_COLUMNS, holding_rows(df))
+    charts = charts or {}
+    pdf.images([charts.get('pie'), charts.get('bar')])
+
+    if history is not None:
+        pdf.section('History & Drawdown', keep_with=140 if history_chart else 40)
+        pdf.set_font('helvetica', '', 10)
+        pdf.cell(0, 8, f"Since {history['first_date']:%d-%m-%Y}: return {history['return_pct']:+.2f}% | "
+                       f"max drawdown {history['max_drawdown_pct']:.2f}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.images([history_chart], width=180, height=120)
+        pdf.write_table(HISTORY_COLUMNS, history_rows(history['curve'], history['drawdown']))
+        pdf.section('Top Contributors')
+        pdf.write_table(CONTRIBUTION_COLUMNS, contribution_rows(history['contribution']))
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    pdf.output(buffer)
+    buffer.seek(0)
+    return buffer
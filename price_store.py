@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import yfinance as yf
+
+import db
+import metrics
+from archive import Archive, hot_cutoff
+from timeutil import MARKET_CLOSE, ist_now
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+# புதிய டிக்கருக்கு முதல் முறை எடுக்கும் வரலாறு
+LOOKBACK_DAYS = 400
+# சந்தை நேரத்தில் இன்றைய (intraday) bar எவ்வளவு நேரம் புதியதாகக் கருதப்படும்
+INTRADAY_TTL = timedelta(minutes=15)
+# இதைவிடப் பழைய settled bars நீக்கப்படும்
+RETENTION_DAYS = 3 * 365
+
+
+# --- உள்ளூர் OHLC cache: இல்லாத bars மட்டும் download ---
+class PriceStore:
+    def __init__(self, conn=None):
+        self.conn = conn or db.connect()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS prices (
+                Ticker TEXT,
+                Date TEXT,
+                Open REAL,
+                High REAL,
+                Low REAL,
+                Close REAL,
+                Adj_Close REAL,
+                Volume REAL,
+                Settled INTEGER,
+                PRIMARY KEY (Ticker, Date)
+            )
+        ''')
+        # ஒவ்வொரு டிக்கரும் கடைசியாக Yahoo-வில் சரிபார்க்கப்பட்ட நேரம்
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS price_sync (
+                Ticker TEXT PRIMARY KEY,
+                Checked_At TEXT
+            )
+        ''')
+        # backfill: இந்தத் தேதி வரை பழைய வரலாறு ஏற்கனவே கேட்கப்பட்டது (பின்னர் listing ஆனவை மீண்டும் கேட்கப்படாது)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS price_backfill (
+                Ticker TEXT PRIMARY KEY,
+                Since TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def _is_fresh(self, checked_at, now):
+        if checked_at is None:
+            return False
+        checked = datetime.fromisoformat(checked_at)
+        if checked.date() != now.date():
+            return False
+        # சந்தை முடிந்த பின் சரிபார்த்திருந்தால் இன்றைய நாள் முழுவதும் போதும்
+        if (checked.hour, checked.minute) >= MARKET_CLOSE:
+            return True
+        return now - checked < INTRADAY_TTL
+
+    def stale_tickers(self, tickers, now=None):
+        now = now or ist_now()
+        placeholders = ",".join("?" * len(tickers))
+        rows = self.conn.execute(
+            f"SELECT Ticker, Checked_At FROM price_sync WHERE Ticker IN ({placeholders})", tickers
+        ).fetchall()
+        checked = dict(rows)
+        return [t for t in tickers if not self._is_fresh(checked.get(t), now)]
+
+    def _start_dates(self, tickers, now):
+        # கடைசி settled தேதிக்கு அடுத்த நாளிலிருந்து மட்டும் எடுத்தால் போதும்
+        placeholders = ",".join("?" * len(tickers))
+        rows = self.conn.execute(
+            f"SELECT Ticker, MAX(Date) FROM prices WHERE Settled = 1 AND Ticker IN ({placeholders}) GROUP BY Ticker",
+            tickers
+        ).fetchall()
+        last_settled = dict(rows)
+        default_start = (now - timedelta(days=LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+        starts = {}
+        for t in tickers:
+            if last_settled.get(t):
+                start = (pd.Timestamp(last_settled[t]) + timedelta(days=1)).strftime('%Y-%m-%d')
+            else:
+                start = default_start
+            starts.setdefault(start, []).append(t)
+        return starts
+
+    def sync(self, tickers):
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return 0
+        now = ist_now()
+        stale = self.stale_tickers(tickers, now)
+        metrics.incr('prices.cache', 'hits', len(tickers) - len(stale))
+        metrics.incr('prices.cache', 'misses', len(stale))
+        if not stale:
+            return 0
+        fetched = 0
+        # ஒரே தொடக்கத் தேதி கொண்ட டிக்கர்கள் ஒரே batch-ல்
+        for start, group in self._start_dates(stale, now).items():
+            with metrics.stage('yahoo.download'):
+                frame = yf.download(
+                    group, start=start, interval="1d", group_by="ticker",
+                    auto_adjust=False, threads=True, progress=False
+                )
+            # yfinance உண்மையான HTTP அளவைத் தருவதில்லை - பெறப்பட்ட frame-ன் அளவு
+            metrics.incr('yahoo.download', 'bytes', int(frame.memory_usage(deep=True).sum()))
+            fetched += self._write(frame, now)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO price_sync (Ticker, Checked_At) VALUES (?, ?)",
+            [(t, now.isoformat()) for t in stale]
+        )
+        self.evict(now)
+        self.conn.commit()
+        return fetched
+
+    def backfill(self, tickers, days):
+        # backtest-க்கு பல வருட வரலாறு: cache-ன் முதல் bar-க்கு முந்தைய பகுதி மட்டும், டிக்கருக்கு ஒருமுறை
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return 0
+        now = ist_now()
+        since = (now - timedelta(days=min(days, RETENTION_DAYS))).strftime('%Y-%m-%d')
+        placeholders = ",".join("?" * len(tickers))
+        done = dict(self.conn.execute(
+            f"SELECT Ticker, Since FROM price_backfill WHERE Ticker IN ({placeholders})", tickers
+        ).fetchall())
+        first = dict(self.conn.execute(
+            f"SELECT Ticker, MIN(Date) FROM prices WHERE Ticker IN ({placeholders}) GROUP BY Ticker", tickers
+        ).fetchall())
+        # SQLite hot window-க்கு முந்தைய bars archive-ல் ஏற்கனவே உள்ளன
+        for t, date in Archive(conn=self.conn).first_dates(tickers).items():
+            first[t] = min(first.get(t) or date, date)
+        # ஒரே முடிவுத் தேதி கொண்டவை ஒரே batch-ல்; cache-ல் இல்லாதவை இன்று வரை
+        groups = {}
+        for t in tickers:
+            if done.get(t) and done[t] <= since:
+                continue
+            if first.get(t) and first[t] <= since:
+                continue
+            groups.setdefault(first.get(t), []).append(t)
+        fetched = 0
+        for end, group in groups.items():
+            with metrics.stage('yahoo.download'):
+                frame = yf.download(
+                    group, start=since, end=end, interval="1d", group_by="ticker",
+                    auto_adjust=False, threads=True, progress=False
+                )
+            metrics.incr('yahoo.download', 'bytes', int(frame.memory_usage(deep=True).sum()))
+            fetched += self._write(frame, now)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO price_backfill (Ticker, Since) VALUES (?, ?)",
+            [(t, since) for t in tickers]
+        )
+        self.conn.commit()
+        return fetched
+
+    def _write(self, frame, now):
+        if frame.empty:
+            return 0
+        today = now.strftime('%Y-%m-%d')
+        market_closed = (now.hour, now.minute) >= MARKET_CLOSE
+        rows = []
+        for ticker in frame.columns.get_level_values(0).unique():
+            bars = frame[ticker].dropna(subset=['Close'])
+            if bars.empty:
+                continue
+            bars = bars.reindex(columns=FIELDS)
+            dates = [d.strftime('%Y-%m-%d') for d in bars.index]
+            settled = [int(d < today or market_closed) for d in dates]
+            rows.extend(zip(
+                [ticker] * len(bars), dates,
+                *(bars[f].astype(float).tolist() for f in FIELDS),
+                settled
+            ))
+        self.conn.executemany('''
+            INSERT OR REPLACE INTO prices
+            (Ticker, Date, Open, High, Low, Close, Adj_Close, Volume, Settled)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return len(rows)
+
+    def evict(self, now=None):
+        now = now or ist_now()
+        cutoff = (now - timedelta(days=RETENTION_DAYS)).strftime('%Y-%m-%d')
+        self.conn.execute("DELETE FROM prices WHERE Date < ?", (cutoff,))
+
+    def load(self, tickers, days=None):
+        # yf.download போன்றே (Ticker, Field) columns கொண்ட frame
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return pd.DataFrame()
+        placeholders = ",".join("?" * len(tickers))
+        query = f'''
+            SELECT Ticker, Date, Open, High, Low, Close, Adj_Close AS "Adj Close", Volume
+            FROM prices WHERE Ticker IN ({placeholders})
+        '''
+        params = list(tickers)
+        start = (ist_now() - timedelta(days=days)).strftime('%Y-%m-%d') if days else None
+        if start:
+            query += " AND Date >= ?"
+            params.append(start)
+        df = pd.read_sql_query(query, self.conn, params=params)
+        if start is None or start < hot_cutoff('prices'):
+            # பல வருட வரலாறு: பழைய bars Parquet archive-லிருந்து (தேவையான மாதங்கள் / டிக்கர்கள் மட்டும்)
+            filters = [('Ticker', 'in', tickers)]
+            if start:
+                filters += [('month', '>=', start[:7]), ('Date', '>=', start)]
+            cold = Archive(conn=self.conn).read(
+                'prices', columns=['Ticker', 'Date', 'Open', 'High', 'Low', 'Close', 'Adj_Close', 'Volume'],
+                filters=filters)
+            if cold is not None and not cold.empty:
+                cold = cold.rename(columns={'Adj_Close': 'Adj Close'})
+                df = pd.concat([cold, df], ignore_index=True).drop_duplicates(['Ticker', 'Date'], keep='last')
+        if df.empty:
+            return pd.DataFrame()
+        df['Date'] = pd.to_datetime(df['Date'])
+        frame = df.pivot(index='Date', columns='Ticker', values=FIELDS)
+        frame = frame.swaplevel(axis=1).sort_index(axis=1)
+        frame.columns.names = ['Ticker', 'Price']
+        return frame
@@ -0,0 +1,91 @@
+import csv
+import os
+
+HOLDERS_FILE = 'holders.csv'
+INSTRUMENTS_FILE = 'instruments.csv'
+ASSET_CLASSES = ('equity', 'commodity', 'mutual_fund')
+# instruments.csv-ல் இல்லாத டிக்கர்கள்: பெயரில் GOLD அல்லது SILV இருந்தால் Commodity
+COMMODITY_KEYWORDS = ['GOLD', 'SILV']
+# holders.csv-ல் Commodity_Target_Pct இல்லையெனில் 50% தங்கம்/வெள்ளி | 50% பங்குகள்
+DEFAULT_COMMODITY_TARGET_PCT = 50.0
+
+
+def _float(value, default=None):
+    value = (value or '').strip()
+    return float(value) if value else default
+
+
+def _phone(value):
+    # '$MY_WA_PHONE' - எண் config கோப்பில் அல்ல, GitHub Secret / env-ல்
+    value = (value or '').strip()
+    return os.getenv(value[1:]) if value.startswith('$') else value or None
+
+
+# --- Holder / instrument registry: ஒருமுறை ஏற்றப்படும் config, பெயர் / டிக்கர் வாரியான dicts ---
+class Registry:
+    def __init__(self, holders, instruments):
+        # holders: name -> {'name', 'phone', 'prefix', 'email', 'commodity_target'} (config வரிசையில்)
+        # instruments: ticker -> {'alias', 'asset_class', 'target_weight'}
+        self.holders = holders
+        self.instruments = instruments
+        self.aliases = {t: i['alias'] for t, i in instruments.items() if i['alias']}
+
+    @classmethod
+    def load(cls, holders_file=None, instruments_file=None):
+        # pandas இல்லாமல் - விடுமுறை வாழ்த்துக்கும் இதே registry
+        holders = {}
+        with open(holders_file or HOLDERS_FILE, encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                name = row['Name'].strip()
+                if name in holders:
+                    raise ValueError(f"holders.csv: '{name}' இருமுறை உள்ளது")
+                holders[name] = {
+                    'name': name,
+                    'phone': _phone(row.get('Phone')),
+                    'prefix': (row.get('Prefix') or '').strip() or name,
+                    'email': (row.get('Email') or '').strip() or None,
+                    'commodity_target': _float(row.get('Commodity_Target_Pct'), DEFAULT_COMMODITY_TARGET_PCT),
+                }
+        instruments = {}
+        path = instruments_file or INSTRUMENTS_FILE
+        if os.path.exists(path):
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    asset_class = (row.get('Asset_Class') or '').strip().lower() or None
+                    if asset_class and asset_class not in ASSET_CLASSES:
+                        raise ValueError(f"instruments.csv: {row['Ticker']} - தெரியாத Asset_Class '{asset_class}'")
+                    instruments[row['Ticker'].strip()] = {
+                        'alias': (row.get('Alias') or '').strip() or None,
+                        'asset_class': asset_class,
+                        'target_weight': _float(row.get('Target_Weight')),
+                    }
+        return cls(holders, instruments)
+
+    def __iter__(self):
+        return iter(self.holders.values())
+
+    def __len__(self):
+        return len(self.holders)
+
+    def alias(self, ticker):
+        return self.aliases.get(ticker, ticker)
+
+    def asset_class(self, ticker):
+        inst = self.instruments.get(ticker)
+        if inst and inst['asset_class']:
+            return inst['asset_class']
+        return 'commodity' if any(k in ticker.upper() for k in COMMODITY_KEYWORDS) else 'equity'
+
+    def is_commodity(self, ticker):
+        return self.asset_class(ticker) == 'commodity'
+
+    def targets(self):
+        return {name: h['commodity_target'] for name, h in self.holders.items()}
+
+    def frame(self, tickers):
+        # ஒரு run-ன் தனித்த டிக்கர்களுக்கு ஒருமுறை: Alias / Asset_Class / Target_Weight
+        import pandas as pd
+        rows = {t: (self.alias(t), self.asset_class(t), (self.instruments.get(t) or {}).get('target_weight'))
+                for t in tickers}
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['Alias', 'Asset_Class', 'Target_Weight'],
+                                      dtype=object).astype({'Target_Weight': float})
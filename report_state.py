@@ -0,0 +1,82 @@
+import json
+
+import db
+from timeutil import ist_now
+
+# கடைசியாக அனுப்பியதிலிருந்து ஏதேனும் ஒரு position-ன் விலை இத்தனை % நகர்ந்தால் சுருக்கச் செய்தி
+PRICE_MOVE_PCT = 1.0
+# மொத்த P&L மாற்றம் - portfolio மதிப்பின் % ஆக
+PL_MOVE_PCT = 0.5
+# get_rsi_advice-ன் அதே எல்லைகள்
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+
+FULL, DIFF, SKIP = 'full', 'diff', 'skip'
+
+
+def rsi_zone(rsi):
+    if rsi is None or rsi != rsi:  # NaN - போதுமான தரவு இல்லை
+        return 'NA'
+    if rsi >= RSI_OVERBOUGHT:
+        return 'OVERBOUGHT'
+    if rsi <= RSI_OVERSOLD:
+        return 'OVERSOLD'
+    return 'NEUTRAL'
+
+
+def fingerprint(df, total_pl, total_val, zones, rebalance, hedge, day):
+    # சிறிய JSON: Symbol -> [விலை, Qty, ஆலோசனை flags] + holder நிலைகள்; ஆலோசனை உரை அல்ல (அதில் RSI மதிப்பு ஒவ்வொரு run-ம் மாறும்)
+    positions = {}
+    for sym, live, qty, profit, avg_advice, tax_type in zip(df['Symbol'], df['Live'], df['Qty'], df['Profit_Flag'],
+                                                            df['Avg_Advice'], df['Tax_Type']):
+        flags = [zones.get(sym, 'NA'), bool(profit), bool(avg_advice), str(tax_type)]
+        positions[sym] = [round(float(live), 4), float(qty), flags]
+    return {'day': day, 'pl': round(float(total_pl), 2), 'value': round(float(total_val), 2),
+            'positions': positions, 'rebalance': rebalance, 'hedge': bool(hedge)}
+
+
+def compare(prev, curr):
+    # (FULL | DIFF | SKIP, changes) - ஆலோசனை மாறினால் முழு அறிக்கை, விலை / P&L மட்டும் நகர்ந்தால் சுருக்கம்
+    changes = {'moved': [], 'pl': (prev or {}).get('pl'), 'new_pl': curr['pl']}
+    if not prev or prev.get('day') != curr['day']:
+        return FULL, changes
+    if (prev['rebalance'], prev['hedge']) != (curr['rebalance'], curr['hedge']):
+        return FULL, changes
+    if prev['positions'].keys() != curr['positions'].keys():
+        return FULL, changes
+    for sym, (price, qty, flags) in curr['positions'].items():
+        old_price, old_qty, old_flags = prev['positions'][sym]
+        if qty != old_qty or flags != old_flags:
+            return FULL, changes
+        if old_price and abs(price - old_price) / old_price * 100 >= PRICE_MOVE_PCT:
+            changes['moved'].append((sym, old_price, price))
+    pl_moved = curr['value'] and abs(curr['pl'] - prev['pl']) / curr['value'] * 100 >= PL_MOVE_PCT
+    return (DIFF if changes['moved'] or pl_moved else SKIP), changes
+
+
+# --- கடைசியாக அனுப்பிய அறிக்கையின் fingerprint, holder-க்கு ஒரு வரிசை ---
+class ReportState:
+    def __init__(self, conn=None):
+        self.conn = conn or db.connect()
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS report_state (
+                    Holder TEXT PRIMARY KEY,
+                    Fingerprint TEXT,
+                    Mode TEXT,
+                    Sent_At TEXT
+                )
+            ''')
+
+    def load(self):
+        return {holder: json.loads(fp) for holder, fp in
+                self.conn.execute("SELECT Holder, Fingerprint FROM report_state")}
+
+    def save(self, rows):
+        # rows: [(holder, fingerprint, mode)] - WhatsApp சென்றடைந்த பிறகு மட்டும்
+        sent_at = ist_now().isoformat()
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO report_state (Holder, Fingerprint, Mode, Sent_At)
+                VALUES (?, ?, ?, ?)
+            ''', [(holder, json.dumps(fp, separators=(',', ':')), mode, sent_at) for holder, fp, mode in rows])
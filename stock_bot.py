@@ -1,23 +1,20 @@
-import yfinance as yf
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
-from gtts import gTTS
+# கனமான libraries (pandas, yfinance, matplotlib, fpdf, gTTS, genai, Green API, smtplib)
+# அவற்றைப் பயன்படுத்தும் functions-க்குள் மட்டுமே import செய்யப்படுகின்றன -
+# விடுமுறை நாள் மற்றும் PDF இல்லாத runs அவற்றுக்கான நேரத்தைச் செலவிடாது.
 import os
-import requests
-import google.genai as genai
-import sqlite3
-import smtplib
+import sys
+import csv
+import json
+import subprocess
 from datetime import datetime, timedelta, timezone
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from whatsapp_api_client_python import API
 from dotenv import load_dotenv
 import warnings
+import threading
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import db
+import metrics
 
 # பிழைகளைத் தவிர்க்க
 warnings.filterwarnings("ignore", category=SyntaxWarning)
@@ -28,68 +25,95 @@ SENDER_EMAIL = "cselvakumar735@gmail.com"
 SENDER_PASSWORD = os.getenv('EMAIL_PASS')
 ID_INSTANCE = os.getenv('ID_INSTANCE')
 API_TOKEN = os.getenv('API_TOKEN')
-MY_PHONE = os.getenv('MY_WA_PHONE')
-WIFE_PHONE = os.getenv('WIFE_WA_PHONE')
 GEMINI_KEY = os.getenv('GEMINI_API_KEY')
 
-# Gemini AI செட்டப்
-client = genai.Client(api_key=GEMINI_KEY) if GEMINI_KEY else None
+# Gemini AI செட்டப் - முதல் AI அழைப்பின் போது மட்டும் client உருவாக்கப்படும்
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    if not GEMINI_KEY: return None
+    with _client_lock:
+        if _client is None:
+            import google.genai as genai
+            _client = genai.Client(api_key=GEMINI_KEY)
+    return _client
+
+def delivery_service():
+    # ஒரு run-க்கு ஒரு pooled Green API session + ஒரு SMTP connection; அனுப்புதல்கள் queue-ல் சேர்ந்து flush-ல் போகும்
+    from delivery import DeliveryService
+    return DeliveryService(ID_INSTANCE, API_TOKEN, SENDER_EMAIL, SENDER_PASSWORD)
 
 # --- 1. அழகான விடுமுறை வாழ்த்து ---
 def check_holiday_from_csv():
     try:
-        h_df = pd.read_csv('holidays.csv')
+        # pandas இல்லாமல் - விடுமுறை நாளில் கனமான imports தேவையில்லை
         today = (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)).strftime('%Y-%m-%d')
-        match = h_df[h_df['Date'] == today]
-        if not match.empty:
-            msg = match.iloc[0]['Message']
+        with open('holidays.csv', encoding='utf-8-sig', newline='') as f:
+            match = [r for r in csv.DictReader(f) if r['Date'] == today]
+        if match:
+            msg = match[0]['Message']
             return f"✨ *சிறப்பு அறிவிப்பு* ✨\n\n{msg}\n\n🏖️ *இன்று ஓய்வெடுங்கள், மீண்டும் நாளை சந்திப்போம்!*"
     except:
         return None
     return None
 
-def create_voice_report(name, total_pl, df, prefix):
+def create_voice_report(name, total_pl, df, prefix, nifty):
     status = "உயர்ந்துள்ளது" if total_pl >= 0 else "சரிந்துள்ளது"
     
-    # சொல்ல வேண்டிய செய்தி (Script)
-    script = f"வணக்கம் {name}. இன்றைய பங்குச்சந்தை நிலவரப்படி உங்கள் போர்ட்ஃபோலியோ {abs(total_pl):.2f} ரூபாய் {status}. "
+    # சொல்ல வேண்டிய செய்தி (Script) - நிலையான சொற்றொடர்களும் எண்களும் தனித்தனி பகுதிகள்,
+    # அதனால் நிலையானவை cache-ல் இருந்து; மாறும் தொகைகள் மட்டும் புதிதாக உருவாக்கப்படும்
+    script = [f"வணக்கம் {name}.", "இன்றைய பங்குச்சந்தை நிலவரப்படி உங்கள் போர்ட்ஃபோலியோ",
+              f"{abs(total_pl):.2f} ரூபாய்", f"{status}."]
     
     top_stock = df.loc[df['PL'].idxmax()]
     if top_stock['PL'] > 0:
-        script += f"இன்று அதிகபட்சமாக {top_stock['Ticker']} பங்கு {top_stock['PL']:.2f} ரூபாய் லாபத்தில் உள்ளது. "
+        script += ["இன்று அதிகபட்சமாக", f"{top_stock['Ticker']} பங்கு", f"{top_stock['PL']:.2f} ரூபாய்", "லாபத்தில் உள்ளது."]
     elif top_stock['PL'] < 0:
-        script += f"இன்று உங்களின் எல்லா பங்குகளும் நஷ்டத்தில் உள்ளன. இதில் {top_stock['Ticker']} பங்கு மற்றவற்றை விட குறைவான நஷ்டத்தில் உள்ளது. "
+        script += ["இன்று உங்களின் எல்லா பங்குகளும் நஷ்டத்தில் உள்ளன. இதில்", f"{top_stock['Ticker']} பங்கு",
+                   "மற்றவற்றை விட குறைவான நஷ்டத்தில் உள்ளது."]
     else:
-        script += f"இன்று {top_stock['Ticker']} பங்கில் மாற்றமில்லை. "
-    sentiment_text = get_market_sentiment_advice()
+        script += ["இன்று", f"{top_stock['Ticker']} பங்கில் மாற்றமில்லை."]
+    sentiment_text = get_market_sentiment_advice(nifty)
     if "பயத்தில்" in sentiment_text:
-        script += " தற்போது சந்தையில் பலரும் பயத்தில் இருக்கிறார்கள், எனவே இது உங்களுக்கு நல்ல முதலீட்டு வாய்ப்பு. "
+        script.append("தற்போது சந்தையில் பலரும் பயத்தில் இருக்கிறார்கள், எனவே இது உங்களுக்கு நல்ல முதலீட்டு வாய்ப்பு.")
     elif "பேராசையில்" in sentiment_text:
-        script += " சந்தை இப்போது உச்சத்தில் உள்ளது, எனவே கவனமாக இருங்கள். "
+        script.append("சந்தை இப்போது உச்சத்தில் உள்ளது, எனவே கவனமாக இருங்கள்.")
     else:
-        script += " சந்தை இப்போது நிதானமாக உள்ளது. "
-
-    script += "தொடர்ந்து முதலீடு செய்யுங்கள். நன்றி!"
-
-    # குரலாக மாற்றுதல் (Tamil Language)
-    tts = gTTS(text=script, lang='ta')
-    audio_file = f"{prefix}_voice_report.mp3"
-    tts.save(audio_file)
-    
-    return audio_file
-
-def get_ai_news_analysis(name, ticker):
-    if not client: return "   ┗ 📰 NEWS: ஆலோசனை தயார் நிலையில் இல்லை.\n"
+        script.append("சந்தை இப்போது நிதானமாக உள்ளது.")
+
+    script.append("தொடர்ந்து முதலீடு செய்யுங்கள். நன்றி!")
+
+    # குரலாக மாற்றுதல் (Tamil Language) - cache-ல் இல்லாத பகுதிகள் மட்டும், ஒரே நேரத்தில்
+    from voice import VoiceEngine
+    return VoiceEngine().render(script, f"{prefix}_voice_report.mp3")
+
+@metrics.timed('advice.ai_news')
+def get_ai_news_analysis(tickers):
+    # ஒவ்வொரு டிக்கருக்கும் ஒருமுறை மட்டும் - எல்லா Gemini அழைப்புகளும் ஒரே நேரத்தில்
+    # (ஆய்வு உரைகள், {ticker: தலைப்புகள்}) - தலைப்புகள் அறிக்கை சென்றடைந்த பின் 'பார்த்தவை' ஆகும்
+    client = get_client()
+    if not client: return {t: "   ┗ 📰 NEWS: ஆலோசனை தயார் நிலையில் இல்லை.\n" for t in tickers}, {}
+    from ai_advisor import AIAdvisor
+    from news_store import NewsStore
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news[:2] # கடைசி 2 முக்கிய செய்திகள்
-        
-        if not news:
-            return f"   ┗ 📰 NEWS: {ticker} குறித்து இன்று புதிய செய்திகள் ஏதுமில்லை.\n"
-        
-        titles = [n['title'] for n in news]
+        # சமீபத்திய 2 தலைப்புகள்; இதுவரை அனுப்பாதவை 'புதியவை'
+        headlines = NewsStore().fetch_latest(tickers)
+    except Exception as e:
+        print(f"News Store Error: {e}")
+        headlines = {}
+    results, jobs = {}, {}
+    for ticker in tickers:
+        items = headlines.get(ticker)
+        if items is None:
+            results[ticker] = f"   ┗ 📰 NEWS: செய்திகளை ஆய்வு செய்வதில் பிழை."
+            continue
+        if not any(new for _, _, new in items):
+            results[ticker] = f"   ┗ 📰 NEWS: {ticker} குறித்து இன்று புதிய செய்திகள் ஏதுமில்லை.\n"
+            continue
+        titles = [title for _, title, _ in items]
         prompt = f"""
-        Investor Name: {name}
         Stock: {ticker}
         Latest News: {titles}
         
@@ -97,26 +121,28 @@ def get_ai_news_analysis(name, ticker):
         இந்த செய்தி பங்கின் விலையை உயர்த்துமா அல்லது குறைக்குமா என்று மட்டும் சொல்லவும்.
         உதாரணம்: "இன்று இந்தச் செய்தியால் உங்கள் {ticker} உயர வாய்ப்புள்ளது."
         """
-        
-        response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
-        return f"   ┗ 🤖 *செய்தி ஆய்வு:* _{response.text.strip()}_\n"
-    except:
-        return f"   ┗ 📰 NEWS: செய்திகளை ஆய்வு செய்வதில் பிழை."
+        # Cache key: (model, ticker, சமீபத்திய தலைப்புகள்) - அறிக்கை அனுப்பும் வரை ஒவ்வொரு run-லும் அதே key
+        jobs[ticker] = ((ticker, titles), prompt)
 
-def get_rsi_advice(ticker):
     try:
-        # கடந்த 14 நாட்களுக்கான தரவை எடுத்தல்
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="1mo") # 1 மாத தரவு தேவை
-        
-        if len(hist) < 14: return "   ┣ 📈 *RSI:* போதுமான தரவு இல்லை\n"
-
-        delta = hist['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        answers = AIAdvisor(client).generate_many(jobs)
+    except Exception as e:
+        print(f"AI News Error: {e}")
+        answers = {}
+    for ticker in jobs:
+        text = answers.get(ticker)
+        results[ticker] = f"   ┗ 🤖 *செய்தி ஆய்வு:* _{text}_\n" if text else f"   ┗ 📰 NEWS: செய்திகளை ஆய்வு செய்வதில் பிழை."
+    return results, {t: [(t, news_id) for news_id, _, new in items if new] for t, items in headlines.items() if items}
+
+@metrics.timed('advice.rsi')
+def get_rsi_advice(ticker, market):
+    import pandas as pd
+    try:
+        # Wilder RSI - indicator engine ஏற்கனவே எல்லா டிக்கர்களுக்கும் கணக்கிட்டுள்ளது
+        ind = market.indicators
+        rsi = ind.at[ticker, 'RSI'] if ticker in ind.index else float('nan')
         
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
+        if pd.isna(rsi): return "   ┣ 📈 *RSI:* போதுமான தரவு இல்லை\n"
         
         rsi_val = round(rsi, 1)
         
@@ -129,29 +155,20 @@ def get_rsi_advice(ticker):
     except:
         return "   ┣ 📈 *RSI:* கணக்கிட முடியவில்லை\n"
 
-def get_market_breadth():
+def get_market_breadth(nifty):
     try:
-        nifty = yf.Ticker("^NSEI")
-        hist = nifty.history(period="1d")
-        if not hist.empty:
-            change = hist['Close'].iloc[-1] - hist['Open'].iloc[-0]
-            pct = (change / hist['Open'].iloc[0]) * 100
-            
+        pct = nifty.day_change_pct()
+        if pct is not None:
             status = "🟢 வலுவாக உள்ளது" if pct > 0 else "🔴 பலவீனமாக உள்ளது"
             return f"📊 *சந்தை (NIFTY 50):*\n   ┗ {status} ({pct:+.2f}%)"
     except:
         return ""
     return ""
-def get_intrinsic_value_advice(ticker, current_price):
+def get_intrinsic_value_advice(current_price, intrinsic_value):
+    import pandas as pd
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        eps = info.get('trailingEps') or info.get('forwardEps')
-        book_value = info.get('bookValue') or info.get('priceToBook') # Price to book
-        
-        if eps and book_value and eps > 0:
-            intrinsic_value = (22.5 * row['eps'] * row['book_value']) ** 0.5
-            
+        # intrinsic_value: fundamentals cache-ல் இருந்து vectorized Graham Number
+        if not pd.isna(intrinsic_value) and intrinsic_value > 0:
             # தள்ளுபடி (Discount) கணக்கீடு
             if current_price < intrinsic_value:
                 discount = ((intrinsic_value - current_price) / intrinsic_value) * 100
@@ -164,9 +181,10 @@ def get_intrinsic_value_advice(ticker, current_price):
     return "   ℹ️ *Intrinsic Value:* தரவு கிடைக்கவில்லை\n"
 
 def get_ai_expert_advice(name, total_pl, df):
+    client = get_client()
     if not client: return "AI ஆலோசனை தற்போது கிடைக்கவில்லை."
     try:
-        holdings = ", ".join([f"{r['Ticker']}: ₹{r['PL']}" for _, r in df.iterrows()])
+        holdings = ", ".join([f"{t}: ₹{pl}" for t, pl in zip(df['Ticker'], df['PL'])])
         prompt = f"""
         Investor: {name}
         Total P&L: ₹{total_pl}
@@ -176,26 +194,22 @@ def get_ai_expert_advice(name, total_pl, df):
         தற்போதைய இந்திய சந்தை நிலவரத்தைக் கருத்தில் கொண்டு 2 வரிகளில் தமிழில் ஆலோசனை கூறவும். 
         பங்குகளைத் தக்கவைக்கலாமா (Hold) அல்லது லாபத்தை எடுக்கலாமா (Profit Booking) என்று மட்டும் கூறவும்.
         """
-        response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+        with metrics.stage('gemini.expert'):
+            response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+        metrics.incr('gemini.expert', 'bytes', len(prompt.encode('utf-8')) + len(response.text.encode('utf-8')))
         return response.text
     except: return "சந்தையை அவதானித்து முதலீடு செய்யவும்."
 
-def get_market_sentiment_advice():
+def get_market_sentiment_advice(nifty):
+    import pandas as pd
     try:
-        nifty = yf.Ticker("^NSEI")
         # 1. இன்றைய மாற்றத்தைக் கணக்கிடுதல்
-        hist_1d = nifty.history(period="1d")
-        daily_change = 0
-        if not hist_1d.empty:
-            daily_change = ((hist_1d['Close'].iloc[-1] - hist_1d['Open'].iloc[0]) / hist_1d['Open'].iloc[0]) * 100
-
-        # 2. 14 நாள் RSI கணக்கிடுதல்
-        hist_14d = nifty.history(period="20d")
-        delta = hist_14d['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
+        daily_change = nifty.day_change_pct() or 0
+
+        # 2. 14 நாள் Wilder RSI (indicator engine-ல் இருந்து)
+        rsi = nifty.rsi
+        if rsi is None or pd.isna(rsi):
+            return "⚖️ சந்தை உணர்வுகளை இப்போது கணக்கிட முடியவில்லை."
 
         # 3. ஒருங்கிணைந்த முடிவு (Combined Logic)
         # இன்றைய வீழ்ச்சி 1.5% மேல் இருந்தால், RSI என்ன சொன்னாலும் சந்தை பயத்தில் உள்ளது என்றே காட்டப்படும்
@@ -212,16 +226,13 @@ def get_market_sentiment_advice():
     except Exception as e:
         return "⚖️ சந்தை உணர்வுகளை இப்போது கணக்கிட முடியவில்லை."
     
-def get_rebalancing_advice(df):
+def get_rebalancing_advice(df, target_pct=50.0):
     try:
-        # 1. சொத்துக்களைப் பிரித்தல் (Asset Classification)
-        # Ticker பெயரில் GOLD அல்லது SILV இருந்தால் அவை Commodity
-        commodity_tickers = ['GOLD', 'SILV', 'SETFGOLD', 'TATAGOLD', 'TATSILV']
-        
+        # 1. சொத்துக்களைப் பிரித்தல் (Asset Classification) - instruments.csv-ன் Asset_Class
         df['Total_Value'] = df['Qty'] * df['Live']
         
         # Commodity மற்றும் Equity மதிப்புகளைக் கணக்கிடுதல்
-        is_commodity = df['Ticker'].str.contains('|'.join(commodity_tickers), case=False)
+        is_commodity = df['Asset_Class'] == 'commodity'
         comm_val = df[is_commodity]['Total_Value'].sum()
         equity_val = df[~is_commodity]['Total_Value'].sum()
         
@@ -232,8 +243,8 @@ def get_rebalancing_advice(df):
         current_comm_pct = (comm_val / total_portfolio) * 100
         current_equity_pct = (equity_val / total_portfolio) * 100
 
-        # 3. இலக்கு (Target: 50% Commodity | 50% Equity)
-        target_pct = 50.0
+        # 3. இலக்கு (holders.csv Commodity_Target_Pct; இயல்பாக 50% Commodity | 50% Equity)
+        equity_target = 100 - target_pct
         threshold = 5.0 # 5% வித்தியாசம் இருந்தால் மட்டும் எச்சரிக்கை
 
         advice = "⚖️ *போர்ட்ஃபோலியோ சமநிலை (Rebalancing):*\n"
@@ -241,8 +252,8 @@ def get_rebalancing_advice(df):
         advice += f"   ┣ பங்குகள் (Equity): {current_equity_pct:.1f}%\n"
 
         # 4. ஆலோசனை வழங்குதல்
-        if current_equity_pct > (target_pct + threshold):
-            diff_val = total_portfolio * ((current_equity_pct - target_pct) / 100)
+        if current_equity_pct > (equity_target + threshold):
+            diff_val = total_portfolio * ((current_equity_pct - equity_target) / 100)
             advice += f"   ┗ ⚠️ *அறிவுரை:* பங்குகள் அதிகமாக உள்ளன. ₹{diff_val:,.0f} மதிப்பிற்கு பங்குகளை விற்று தங்கம்/வெள்ளியில் முதலீடு செய்யவும்.\n"
         elif current_comm_pct > (target_pct + threshold):
             diff_val = total_portfolio * ((current_comm_pct - target_pct) / 100)
@@ -250,25 +261,28 @@ def get_rebalancing_advice(df):
         else:
             advice += "   ┗ ✅ உங்கள் சொத்துக்கள் சரியான சமநிலையில் உள்ளன.\n"
 
+        # 5. instruments.csv-ல் Target_Weight உள்ள டிக்கர்களின் விலகல்
+        weighted = df[df['Target_Weight'].notna()]
+        for ticker, alloc, target in zip(weighted['Ticker'], weighted['Alloc_Pct'], weighted['Target_Weight']):
+            if abs(alloc - target) > threshold:
+                advice += f"   ┗ 🎯 {ticker}: {alloc:.1f}% (இலக்கு {target:.0f}%)\n"
+
         return advice
     except Exception as e:
         return f"Rebalancing Error: {e}"
 def get_profit_booking_advice(df):
+    from holdings import PROFIT_TARGET_PCT
     try:
-        booking_list = []
-        for _, r in df.iterrows():
-            # முதலீடு செய்த தொகையைக் கணக்கிடுதல்
-            invested_val = r['Avg'] * r['Qty']
-            # லாப சதவீதத்தைக் கணக்கிடுதல்
-            pl_pct = (r['PL'] / invested_val) * 100
-            
-            # 20% அல்லது அதற்கு மேல் லாபம் இருந்தால்
-            if pl_pct >= 20:
-                # எவ்வளவு லாபம் கிடைத்துள்ளது என்பதை ரூபாயில் காட்டுதல்
-                booking_list.append(
-                    f"   ┣ 🚀 *{r['Ticker']}:* {pl_pct:.1f}% லாபம் (₹{r['PL']:,.2f})\n"
-                    f"   ┗ ✨ *அறிவுரை:* இலக்கை எட்டியது! லாபத்தை புக் செய்ய ஒரு பகுதியை விற்கலாம்."
-                )
+        # லாப சதவீதம் - முதலீடு செய்த தொகையின் அடிப்படையில் (vectorized)
+        pl_pct = df['PL'] / (df['Avg'] * df['Qty']) * 100
+        # 20% அல்லது அதற்கு மேல் லாபம் இருந்தால்
+        hits = pl_pct >= PROFIT_TARGET_PCT
+        # எவ்வளவு லாபம் கிடைத்துள்ளது என்பதை ரூபாயில் காட்டுதல்
+        booking_list = [
+            f"   ┣ 🚀 *{t}:* {pct:.1f}% லாபம் (₹{pl:,.2f})\n"
+            f"   ┗ ✨ *அறிவுரை:* இலக்கை எட்டியது! லாபத்தை புக் செய்ய ஒரு பகுதியை விற்கலாம்."
+            for t, pct, pl in zip(df.loc[hits, 'Ticker'], pl_pct[hits], df.loc[hits, 'PL'])
+        ]
         
         if not booking_list:
             return "   ┗ ✅ அனைத்து பங்குகளும் தற்போது ஹோல்டிங்கில் இருக்கலாம்.\n"
@@ -276,25 +290,33 @@ def get_profit_booking_advice(df):
         return "\n".join(booking_list) + "\n"
     except Exception as e:
         return f"Profit Booking Error: {e}"    
-# --- 2. வரி மதிப்பீடு ---
-def estimate_tax(buy_date_str, total_pl):
-    if total_pl <= 0: return "வரி இல்லை"
+def get_history_advice(name, lots, total_value):
+    import analytics
     try:
-        # சராசரி அடக்க விலையை அடிப்படையாகக் கொண்ட மொத்த லாபம் (total_pl) இங்கு பயன்படுத்தப்படுகிறது
-        buy_date = datetime.strptime(buy_date_str, '%Y-%m-%d')
-        days = (datetime.now() - buy_date).days
-        
-        if days < 365:
-            # 1 வருடத்திற்குள் - STCG 20%
-            tax_amt = total_pl * 0.20
-            return f"STCG(20%): ₹{round(tax_amt, 1)}"
-        else:
-            # 1 வருடத்திற்கு மேல் - LTCG 12.5% (₹1.25L விலக்குக்கு பின்)
-            taxable_pl = max(0, total_pl - 125000)
-            tax_amt = taxable_pl * 0.125
-            return f"LTCG(12.5%): ₹{round(tax_amt, 1)}"
-    except:
-        return "தேதி பிழை"
+        # portfolio_history.db-ன் அதே நிலைக்கு ஒருமுறை மட்டும் கணக்கீடு (PDF அறிக்கையும் இதையே பயன்படுத்தும்)
+        stats = analytics.holder_summary(name, lots)
+        if stats is None: return ""
+        today = (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)).date()
+        rate = analytics.lots_xirr(lots, total_value, today)
+
+        advice = "📈 *வரலாற்று செயல்திறன்:*\n"
+        advice += f"   ┣ {stats['first_date']:%d-%m-%Y} முதல் வருமானம்: {stats['return_pct']:+.2f}%\n"
+        advice += f"   ┣ அதிகபட்ச சரிவு (Max Drawdown): {stats['max_drawdown_pct']:.2f}%\n"
+        top = stats['contribution'].head(1)
+        if not top.empty:
+            advice += f"   ┣ அதிக பங்களிப்பு: {top.index[0]} (₹{top['PL_Change'].iloc[0]:,.2f})\n"
+        if rate is not None:
+            advice += f"   ┗ XIRR (ஆண்டு வருமானம்): {rate * 100:.2f}%\n"
+        return advice
+    except Exception as e:
+        return f"History Error: {e}"
+# --- 2. வரி மதிப்பீடு (lot வாரியாக - tax.py) ---
+def tax_label(tax_type, tax_amt):
+    if tax_type == 'STCG': return f"STCG(20%): ₹{tax_amt}"
+    if tax_type == 'LTCG': return f"LTCG(12.5%): ₹{tax_amt}"
+    if tax_type == 'MIXED': return f"STCG+LTCG: ₹{tax_amt}"
+    if tax_type == 'NONE': return "வரி இல்லை"
+    return "தேதி பிழை"
     
 def get_averaging_advice(current_qty, avg_price, live_price):
     # சந்தை விலை சராசரி விலையை விட 2% கீழ் இருந்தால் மட்டும் ஆலோசனை
@@ -308,17 +330,12 @@ def get_averaging_advice(current_qty, avg_price, live_price):
         return advice
     return ""
 
-def get_hedging_advice(total_portfolio_value):
+def get_hedging_advice(total_portfolio_value, nifty):
     try:
         # நிஃப்டி 50 இன் கடந்த 5 நாள் தரவை ஆய்வு செய்தல்
-        nifty = yf.Ticker("^NSEI")
-        hist = nifty.history(period="5d")
+        market_change = nifty.change_pct(5)
         
-        if len(hist) < 2: return "✅ சந்தை தரவு போதிய அளவில் இல்லை."
-
-        start_price = hist['Close'].iloc[0]
-        current_price = hist['Close'].iloc[-1]
-        market_change = ((current_price - start_price) / start_price) * 100
+        if market_change is None: return "✅ சந்தை தரவு போதிய அளவில் இல்லை."
 
         # சந்தை 2% க்கும் மேல் சரிந்தால் ஹெட்ஜிங் ஆலோசனை வழங்குதல்
         if market_change < -2.0:
@@ -331,70 +348,16 @@ def get_hedging_advice(total_portfolio_value):
         return "✅ சந்தை சீராக உள்ளது. ஹெட்ஜிங் தேவையில்லை."
     except Exception as e:
         return f"Hedging Error: {e}"
-def init_db():
-    try:
-        conn = sqlite3.connect('portfolio_history.db', timeout=30)
-        cursor = conn.cursor()
-        # PRIMARY KEY: ஒரே தேதியில், ஒரு நபருக்கு, ஒரு டிக்கர் ஒரு முறை மட்டுமே பதிவாகும்
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS history (
-                Date TEXT,
-                Holder TEXT,
-                Ticker TEXT,
-                Qty REAL,
-                Avg_Price REAL,
-                Live_Price REAL,
-                PL REAL,
-                Tax_Est TEXT,
-                PRIMARY KEY (Date, Holder, Ticker)
-            )
-        ''')
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"❌ Init DB Error: {e}")
-def save_to_db(df, holder_name):
-    try:
-        conn = sqlite3.connect('portfolio_history.db')
-        cursor = conn.cursor()
-        
-        # நேரமில்லாத தேதியை மட்டும் எடுக்க (YYYY-MM-DD)
-        current_date = datetime.now().strftime('%Y-%m-%d')
-
-        for _, row in df.iterrows():
-            # INSERT OR REPLACE: டூப்ளிகேட் एंट्री வந்தால் பழையதை அழித்துவிட்டு புதியதைச் சேர்க்கும்
-            cursor.execute('''
-                INSERT OR REPLACE INTO history 
-                (Date, Holder, Ticker, Qty, Avg_Price, Live_Price, PL, Tax_Est)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                current_date, 
-                holder_name, 
-                row['Ticker'], 
-                row['Qty'], 
-                row['Avg'], 
-                row['Live'], 
-                row['PL'],
-                str(row.get('Tax_Estimate', '0.0')) 
-            ))
-        
-        conn.commit()
-        conn.close()
-        print(f"✅ {holder_name}-ன் தரவுகள் டேட்டாபேஸில் புதுப்பிக்கப்பட்டன.")
-    except Exception as e:
-        print(f"❌ Database Save Error: {e}")
 # --- 4. வாட்ஸ்அப் மெசேஜ் டெக்கரேஷன் ---
-def send_whatsapp_green(wa_phone, name, df, total_pl, hedge_msg):
+def send_whatsapp_green(outbox, key, wa_phone, name, df, total_pl, hedge_msg, nifty, history_msg="", rebalance_msg=""):
     try:
-        green_api = API.GreenApi(ID_INSTANCE, API_TOKEN)
         chat_id = f"{wa_phone}@c.us"
         ai_advice = get_ai_expert_advice(name, total_pl, df)
         ist_time = (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)).strftime('%I:%M %p')
         emoji_main = "🚀" if total_pl >= 0 else "📉"
-        market_status = get_market_breadth()
-        rebalance_msg = get_rebalancing_advice(df)
+        market_status = get_market_breadth(nifty)
         profit_msg = get_profit_booking_advice(df)
-        sentiment_msg = get_market_sentiment_advice()
+        sentiment_msg = get_market_sentiment_advice(nifty)
 
         message = f"🌟 *பங்குச்சந்தை நேரலை அறிக்கை* 🌟\n"
         message += f"━━━━━━━━━━━━━━━━━━\n"
@@ -402,7 +365,7 @@ def send_whatsapp_green(wa_phone, name, df, total_pl, hedge_msg):
         message += f"⏰ *நேரம்:* {ist_time}\n"
         message += f"━━━━━━━━━━━━━━━━━━\n"
 
-        for _, r in df.iterrows():
+        for r in df.to_dict('records'):
             icon = "🟢" if r['PL'] >= 0 else "🔴"
             pl_label = "லாபம்" if r['PL'] >= 0 else "நஷ்டம்"
             pl_display = f"ரூ. {r['PL']:,.2f}"
@@ -443,218 +406,586 @@ def send_whatsapp_green(wa_phone, name, df, total_pl, hedge_msg):
             message += f"━━━━━━━━━━━━━━━━━━\n{rebalance_msg}\n"
         if hedge_msg:
             message += f"━━━━━━━━━━━━━━━━━━\n{hedge_msg}\n"
+        if history_msg:
+            message += f"━━━━━━━━━━━━━━━━━━\n{history_msg}"
             
         message += f"━━━━━━━━━━━━━━━━━━\n"
         message += f"💡 _தொடர்ந்து முதலீடு செய்யுங்கள்!_"
 
-        green_api.sending.sendMessage(chatId=chat_id, message=message)
-        print(f"✅ வாட்ஸ்அப் அறிக்கை {name}-க்கு அனுப்பப்பட்டது.")
+        outbox.whatsapp(key, chat_id, message)
     except Exception as e: 
         print(f"WA Error: {e}")
-def create_visuals(df, prefix):
-    # 1. Pie Chart - போர்ட்ஃபோலியோ பரவல்
-    plt.figure(figsize=(6, 4))
-    # 'Qty' மற்றும் 'Live' விலையைப் பெருக்கி பங்குகளின் மதிப்பை கணக்கிடுகிறது
-    plt.pie(df['Qty'] * df['Live'], labels=df['Ticker'], autopct='%1.1f%%', colors=sns.color_palette('pastel'))
-    plt.title('Portfolio Distribution')
-    plt.tight_layout()
-    plt.savefig(f'{prefix}_pie_chart.png')
-    plt.close()
-
-    # 2. Bar Chart - லாப நஷ்ட விவரம்
-    plt.figure(figsize=(6, 4))
-    # லாபத்திற்கு பச்சை, நஷ்டத்திற்கு சிவப்பு நிறம்
-    colors = ['#66bb6a' if x >= 0 else '#ef5350' for x in df['PL']]
-    sns.barplot(x='Ticker', y='PL', data=df, palette=colors, hue='Ticker', legend=False)
-    plt.axhline(0, color='black', linewidth=0.8)
-    plt.title('Profit & Loss (Rs.)')
-    plt.ylabel('Amount (Rs)')
-    plt.tight_layout()
-    plt.savefig(f'{prefix}_bar_chart.png')
-    plt.close()
-class PortfolioPDF(FPDF):
-    def header(self):
-        self.set_font('helvetica', 'B', 16)
-        self.cell(0, 10, 'Advanced Portfolio Report', align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-        self.ln(5)
-def create_pdf_report(df, prefix, name):
-    pdf_file = f"{prefix}_report.pdf"
-    pdf = PortfolioPDF()
-    pdf.add_page()
+@metrics.timed('render.charts')
+def create_visuals(df):
+    # Agg backend, மீண்டும் பயன்படும் Figure templates; மாறாத charts chart_cache/ கோப்புகளிலிருந்து (PNG bytes)
+    from charts import ChartRenderer
+    return ChartRenderer().render(df)
+@metrics.timed('render.pdf')
+def create_pdf_report(df, name, charts=None, lots=None):
+    # holdings / history அட்டவணைகள் chunks-ஆக, பல பக்கங்கள்; கோப்பு இல்லை - நினைவகத்தில் (spooled) buffer
+    import analytics
+    from pdf_report import build_report
     ist = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
-    pdf.set_font('helvetica', 'B', 12)
-    pdf.cell(0, 10, f"Report for: {name}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.set_font('helvetica', '', 10)
-    pdf.cell(0, 10, f"Date: {ist.strftime('%Y-%m-%d %I:%M %p')}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf.ln(5)
-    pdf.set_font('helvetica', 'B', 9)
-    pdf.set_fill_color(52, 152, 219) # Blue
-    pdf.set_text_color(255, 255, 255) # White
-    cols = ['Date', 'Ticker', 'Qty', 'Avg', 'Live', 'P&L', 'P&L%']
-    widths = [27, 27, 20, 28, 28, 30, 30]
-    for i in range(len(cols)):
-        pdf.cell(widths[i], 10, cols[i], border=1, align='C', fill=True)
-    pdf.ln()
-    pdf.set_text_color(0, 0, 0)
-    pdf.set_font('helvetica', '', 9)
-    for _, row in df.iterrows():
-        color = (0, 128, 0) if row['PL'] >= 0 else (255, 0, 0)
-        pdf.set_text_color(*color)
-        date_str = str(row['Date']).split(' ')[0]
-        pdf.cell(widths[0], 10, date_str, border=1, align='C')
-        pdf.cell(widths[1], 10, str(row['Ticker']), border=1, align='C')
-        pdf.cell(widths[2], 10, str(row['Qty']), border=1, align='C')
-        pdf.cell(widths[3], 10, f"{row['Avg']:,.2f}", border=1, align='C')
-        pdf.cell(widths[4], 10, f"{row['Live']:,.2f}", border=1, align='C')
-        pdf.cell(widths[5], 10, f"{row['PL']:,.2f}", border=1, align='C')
-        p_perc = round(((row['Live'] - row['Avg']) / row['Avg']) * 100, 2)
-        pdf.cell(widths[6], 10, f"{p_perc}%", border=1, align='C')
-        pdf.ln()
-    pdf.ln(10)
-    y_pos = pdf.get_y()
-    if os.path.exists(f'{prefix}_pie_chart.png'):
-        pdf.image(f'{prefix}_pie_chart.png', x=10, y=y_pos, w=90)
-    if os.path.exists(f'{prefix}_bar_chart.png'):
-        pdf.image(f'{prefix}_bar_chart.png', x=105, y=y_pos, w=90)
-    pdf.output(pdf_file)
-    return pdf_file
-
-def send_email(receiver, pdf_path, name):
+    history, history_chart = None, None
+    try:
+        history = analytics.holder_summary(name, lots)
+        if history is not None and len(history['curve']) > 1:
+            from charts import ChartRenderer
+            history_chart = ChartRenderer().render_history(history['curve'], history['drawdown'])
+    except Exception as e:
+        print(f"PDF History Error: {e}")
+    buffer = build_report(df, name, ist, charts, history, history_chart)
+    metrics.incr('render.pdf', 'bytes', buffer.seek(0, 2))
+    buffer.seek(0)
+    return buffer
+
+def send_email(outbox, key, receiver, pdf, filename, name):
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.base import MIMEBase
+    from email import encoders
     msg = MIMEMultipart()
     msg['From'], msg['To'], msg['Subject'] = SENDER_EMAIL, receiver, f"Stock Report - {name}"
     msg.attach(MIMEText(f"Hi {name}, find attached your visual report.", 'plain'))
-    with open(pdf_path, "rb") as f:
-        part = MIMEBase('application', 'octet-stream')
-        part.set_payload(f.read()); encoders.encode_base64(part)
-        part.add_header('Content-Disposition', f"attachment; filename={os.path.basename(pdf_path)}")
-        msg.attach(part)
-    with smtplib.SMTP('smtp.gmail.com', 587) as server:
-        server.starttls(); server.login(SENDER_EMAIL, SENDER_PASSWORD); server.send_message(msg)
-
-# --- 6. முதன்மைச் செயல்பாடு ---
-if __name__ == "__main__":
-    init_db()
+    # create_pdf_report-ன் buffer நேரடியாக - disk-லிருந்து மீண்டும் படிக்க வேண்டாம்
+    part = MIMEBase('application', 'pdf')
+    part.set_payload(pdf.read()); encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f"attachment; filename={filename}")
+    msg.attach(part)
+    outbox.email(key, msg)
+
+# --- 6. முதன்மைச் செயல்பாடு: fetch → compute → render → deliver ---
+# ஒரே நேரத்தில் இயங்கும் அனுப்புதல் (WhatsApp / Voice / PDF) பணிகள்
+DELIVERY_WORKERS = 6
+
+def send_whatsapp_diff(outbox, key, wa_phone, name, df, changes):
+    # ஆலோசனைகள் மாறவில்லை, விலை / P&L மட்டும் நகர்ந்தது - AI, குரல் இல்லாத சுருக்கச் செய்தி
+    try:
+        chat_id = f"{wa_phone}@c.us"
+        ist_time = (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)).strftime('%I:%M %p')
+        aliases = dict(zip(df['Symbol'], df['Ticker']))
+        message = f"🔄 *விலை மாற்றங்கள்* ({ist_time})\n"
+        message += f"👤 {name}\n"
+        message += f"━━━━━━━━━━━━━━━━━━\n"
+        for sym, old, new in changes['moved']:
+            change = (new - old) / old * 100
+            icon = "🟢" if change >= 0 else "🔴"
+            message += f"{icon} *{aliases.get(sym, sym)}*: ₹{old:,.2f} → *₹{new:,.2f}* ({change:+.1f}%)\n"
+        old_pl, new_pl = changes['pl'], changes['new_pl']
+        status_icon = "💰" if new_pl >= 0 else "⚠️"
+        message += f"{status_icon} *மொத்த P&L:* ₹{old_pl:,.2f} → *₹{new_pl:,.2f}* ({new_pl - old_pl:+,.2f})\n"
+        message += f"━━━━━━━━━━━━━━━━━━\n"
+        message += f"💡 _ஆலோசனைகளில் மாற்றம் இல்லை - முழு அறிக்கை அடுத்த முக்கிய மாற்றத்தின் போது._"
+        outbox.whatsapp(key, chat_id, message)
+    except Exception as e:
+        print(f"WA Diff Error: {e}")
+
+def trigger_slot(ist):
+    # GitHub Actions தூண்டிய cron (UTC) - தாமதமாக ஓடினாலும் அதன் சொந்த slot
+    schedule = os.getenv('TRIGGER_SCHEDULE')
+    if schedule:
+        minute, hour = (int(x) for x in schedule.split()[:2])
+        return ist.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(hours=5, minutes=30)
+    # கைமுறை rerun: அருகிலுள்ள slot, SLOT_TOLERANCE-க்குள் இருந்தால் மட்டும்
+    near = [s for s in today_slots(ist) if abs(s - ist) <= SLOT_TOLERANCE]
+    return min(near, key=lambda s: abs(s - ist)) if near else None
+
+def delivery_key(ist, channel, holder, slot=None):
+    # ஒரே slot-ன் மறு-run அதே key பெறும் - ஏற்கனவே அனுப்பியது மீண்டும் போகாது; slot இல்லையெனில் run நேரமே key
+    slot = slot or trigger_slot(ist) or ist
+    return f"{slot:%Y-%m-%d %H:%M}|{channel}|{holder}"
+
+def send_holiday_greetings(h_msg, recipients):
+    day = (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)).strftime('%Y-%m-%d')
+    with delivery_service() as outbox:
+        for person in recipients:
+            outbox.whatsapp(f"{day}|holiday|{person['name']}", f"{person['phone']}@c.us",
+                            f"வணக்கம் {person['name']}!\n{h_msg}")
+        outbox.flush()
+    print("✅ Holiday notification sent.")
+
+@metrics.timed('stage.fetch')
+def fetch_stage(all_tickers):
+    from market_data import MarketData, IndexSnapshot, INDEX_TICKER
+    from price_store import PriceStore
+    from fundamentals import FundamentalsStore, graham_number
+    print("⏳ தரவுகளைச் சேகரிக்கிறது (Stocks & Mutual Funds)...")
+    store = PriceStore()
+    try:
+        # cache-ல் இல்லாத bars மட்டும் ஒரே batch-ல் download
+        store.sync(all_tickers + [INDEX_TICKER])
+    except Exception as e:
+        print(f"Error fetching market data: {e}")
+    market = MarketData(store.load(all_tickers + [INDEX_TICKER], days=100))
+    # NIFTY தரவு ஒருமுறை மட்டும் - breadth, sentiment, hedging எல்லாம் இதிலிருந்தே
+    nifty = IndexSnapshot.from_market(market)
+    # EPS / Book Value - நாளுக்கு ஒருமுறை bulk refresh, Graham Number எல்லா டிக்கர்களுக்கும் ஒன்றாக
+    fund_store = FundamentalsStore()
+    try:
+        fund_store.refresh(all_tickers)
+    except Exception as e:
+        print(f"Fundamentals Error: {e}")
+    intrinsic_values = graham_number(fund_store.load(all_tickers))
+    # செய்தி ஆய்வு (Gemini) இங்கு அல்ல - மாற்றம் கண்டறிந்த பிறகு, முழு அறிக்கை பெறும் holders-க்கு மட்டும்
+    return {"market": market, "nifty": nifty, "intrinsic_values": intrinsic_values}
+
+def ticker_advice(tickers, prices, ctx):
+    # RSI / Intrinsic Value ஆலோசனை டிக்கருக்கு ஒருமுறை - எத்தனை holders வைத்திருந்தாலும்
+    from report_state import rsi_zone
+    market, ivs = ctx['market'], ctx['intrinsic_values']
+    rsi = market.indicators['RSI'] if 'RSI' in market.indicators else {}
+    return {
+        'rsi': {t: get_rsi_advice(t, market) for t in tickers},
+        'iv': {t: get_intrinsic_value_advice(prices.get(t), ivs.get(t)) for t in tickers},
+        # fingerprint-க்கு RSI மண்டலம் மட்டும் (Overbought / Oversold / Neutral)
+        'zone': {t: rsi_zone(rsi.get(t)) for t in tickers},
+    }
+
+def compute_holder(p, positions, taxes, lots, ctx, ist):
+    import pandas as pd
+    from report_state import fingerprint
+    from stream import rebalance_state, hedge_state
+    if p['name'] not in positions.index.get_level_values('Holder'): return None
+    pos = positions.xs(p['name'], level='Holder').reset_index()
+    for ticker in pos.loc[pos['Live'].isna(), 'Ticker']:
+        print(f"⚠️ {ticker} க்கான விலை கிடைக்கவில்லை!")
+    pos = pos[pos['Live'].notna()]
+    if pos.empty: return None
+
+    # lot வாரியான FIFO வரி, holder-க்கு ஒருமுறை ₹1.25L விலக்கு
+    tax = taxes.reindex(pd.MultiIndex.from_arrays([[p['name']] * len(pos), pos['Ticker']]))
+    tax_type = tax['Tax_Type'].fillna('ERROR').to_numpy()
+    tax_amt = tax['Tax_Amt'].to_numpy()
+    # சராசரி ஆலோசனை 2% கீழ் உள்ள வரிசைகளுக்கு மட்டும்
+    below = pos['Live'] < pos['Avg'] * 0.98
+    # Alias / Asset_Class / Target_Weight - registry-லிருந்து run-க்கு ஒருமுறை கட்டிய அட்டவணை
+    inst = ctx['instruments'].reindex(pos['Ticker'])
+    df_res = pd.DataFrame({
+        'Date': ist.strftime("%Y-%m-%d %H:%M"),
+        'Ticker': inst['Alias'].to_numpy(), 'Symbol': pos['Ticker'],
+        'Qty': pos['Qty'], 'Avg': pos['Avg'], 'Live': pos['Live'], 'PL': pos['PL'],
+        'PL_Pct': pos['PL_Pct'], 'Alloc_Pct': pos['Alloc_Pct'], 'Profit_Flag': pos['Profit_Flag'],
+        'Tax_Estimate': [tax_label(t, a) for t, a in zip(tax_type, tax_amt)],
+        'Tax_Type': tax_type, 'Tax_Amt': tax_amt,
+        'Avg_Advice': [get_averaging_advice(q, a, l) if b else "" for q, a, l, b in zip(pos['Qty'], pos['Avg'], pos['Live'], below)],
+        'IV_Advice': pos['Ticker'].map(ctx['advice']['iv']),
+        'RSI_Advice': pos['Ticker'].map(ctx['advice']['rsi']),
+        'AI_News': "",
+        'Asset_Class': inst['Asset_Class'].to_numpy(), 'Target_Weight': inst['Target_Weight'].to_numpy(),
+    }).reset_index(drop=True)
+
+    total_pl = df_res['PL'].sum()
+    total_val = (df_res['Live'] * df_res['Qty']).sum()
+    # lots: இந்த holder-ன் lots மட்டும் (run_once-ல் ஒருமுறை groupby)
+    priced_lots = lots[lots['Ticker'].isin(pos['Ticker'])]
+    # history அட்டவணையில் டிக்கர்கள் alias பெயரில் - equity curve பணப் பரிமாற்றங்களும் அதே பெயரில்
+    history_lots = priced_lots.assign(Ticker=ctx['instruments']['Alias'].reindex(priced_lots['Ticker']).to_numpy())
+    comm_val = (df_res['Live'] * df_res['Qty'])[df_res['Asset_Class'] == 'commodity'].sum()
+    comm_pct = comm_val / total_val * 100 if total_val else 0.0
+    return {
+        "holder": p, "df": df_res, "total_pl": total_pl, "total_val": total_val,
+        "fingerprint": fingerprint(df_res, total_pl, total_val, ctx['advice']['zone'],
+                                   rebalance_state(comm_pct, p['commodity_target']),
+                                   hedge_state(ctx['nifty'].change_pct(5)), ist.strftime("%Y-%m-%d")),
+        "hedge_msg": get_hedging_advice(total_val, ctx['nifty']),
+        "rebalance_msg": get_rebalancing_advice(df_res, p['commodity_target']),
+        "history_lots": history_lots,
+        "history_msg": get_history_advice(p['name'], history_lots, total_val),
+    }
+
+# ஒவ்வொரு channel-ம் உள்ளடக்கத்தை உருவாக்கி outbox-ல் சேர்க்கும்; இந்த slot-ல் ஏற்கனவே அனுப்பியிருந்தால் உருவாக்கவே வேண்டாம்
+def deliver_whatsapp(report, ctx, outbox, key):
+    p = report['holder']
+    send_whatsapp_green(outbox, key, p['phone'], p['name'], report['df'], report['total_pl'],
+                        report['hedge_msg'], ctx['nifty'], report['history_msg'], report['rebalance_msg'])
+
+def deliver_diff(report, ctx, outbox, key):
+    p = report['holder']
+    send_whatsapp_diff(outbox, key, p['phone'], p['name'], report['df'], report['changes'])
+
+def deliver_voice(report, ctx, outbox, key):
+    # 4. Voice Report
+    p = report['holder']
+    audio_path = create_voice_report(p['name'], report['total_pl'], report['df'], p['prefix'], ctx['nifty'])
+    outbox.whatsapp_file(key, f"{p['phone']}@c.us", audio_path, f"{p['name']}_Market_Report.mp3",
+                         caption="🎤 இன்றைய குரல் அறிக்கை!")
+
+def deliver_pdf(report, ctx, outbox, key):
+    # 5. Visual Reports
+    p = report['holder']
+    charts = create_visuals(report['df'])
+    with create_pdf_report(report['df'], p['name'], charts, report['history_lots']) as pdf:
+        send_email(outbox, key, p['email'], pdf, f"{p['prefix']}_report.pdf", p['name'])
+
+@metrics.timed('stage.deliver')
+def deliver_stage(reports, ctx, ist, slot=None):
+    from report_state import ReportState, FULL, DIFF
+    slot = slot or trigger_slot(ist) or ist
+    # முழு அறிக்கை: WhatsApp + குரல்; விலை மட்டும் நகர்ந்தால்: சுருக்கச் செய்தி; மாற்றம் இல்லையெனில்: எதுவும் இல்லை
+    modes = {FULL: [("WA", deliver_whatsapp), ("Voice Mail", deliver_voice)], DIFF: [("WA", deliver_diff)]}
+    # காலை 9-10 மற்றும் மாலை 3-4 slots-ல் மட்டும் PDF/Email - மாற்றம் இல்லாவிட்டாலும் (தனி அட்டவணை)
+    pdf_channels = [("PDF/Email", deliver_pdf)] if (9 <= slot.hour <= 10) or (15 <= slot.hour <= 16) else []
+
+    with delivery_service() as outbox:
+        # ஒவ்வொரு holder × channel தனிப் பணி - ஒன்றின் பிழை மற்றவற்றைத் தடுக்காது
+        with ThreadPoolExecutor(max_workers=DELIVERY_WORKERS) as pool:
+            futures = {}
+            for report in reports:
+                name = report['holder']['name']
+                channels = modes.get(report['mode'], []) + pdf_channels
+                if report['mode'] not in modes:
+                    print(f"😴 {name}: கடைசி அறிக்கைக்குப் பிறகு குறிப்பிடத்தக்க மாற்றம் இல்லை - WhatsApp / குரல் தவிர்க்கப்பட்டது.")
+                for label, fn in channels:
+                    key = delivery_key(ist, label, name, slot)
+                    if outbox.sent(key):
+                        print(f"⏭️ {label} ({name}) இந்த slot-ல் ஏற்கனவே அனுப்பப்பட்டது.")
+                        continue
+                    futures[pool.submit(fn, report, ctx, outbox, key)] = (label, name)
+            for future in as_completed(futures):
+                label, name = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"{label} Error ({name}): {e}")
+        # எல்லா செய்திகளும் ஒரே pooled session / SMTP connection வழியே, ஒரே நேரத்தில்
+        results = outbox.flush()
+    # WhatsApp சென்றடைந்த holders-க்கு மட்டும் புதிய fingerprint - தோல்வியெனில் அடுத்த run மீண்டும் ஒப்பிடும்
+    status = {r['key']: r['status'] for r in results}
+    delivered = [(r['holder']['name'], r['fingerprint'], r['mode']) for r in reports
+                 if r['mode'] in modes and status.get(delivery_key(ist, "WA", r['holder']['name'], slot)) == 'sent']
+    if delivered:
+        ReportState().save(delivered)
+    # அறிக்கையில் சென்ற புதிய தலைப்புகள் - பகிரப்பட்ட டிக்கரின் எந்த holder-க்காவது தோல்வியெனில் அடுத்த run மீண்டும்
+    sent = {name for name, _, _ in delivered}
+    shown = [r for r in reports if r.get('headlines')]
+    missed = {h for r in shown if r['holder']['name'] not in sent for h in r['headlines']}
+    seen = {h for r in shown if r['holder']['name'] in sent for h in r['headlines']} - missed
+    if seen:
+        from news_store import NewsStore
+        NewsStore().mark_delivered(sorted(seen))
+    if results:
+        latencies = sorted(r['latency_s'] for r in results if r['status'] == 'sent')
+        if latencies:
+            print(f"📬 {len(latencies)}/{len(results)} அனுப்பப்பட்டன | latency median {latencies[len(latencies) // 2]:.2f}s, "
+                  f"max {latencies[-1]:.2f}s")
+
+def load_registry():
+    # holders.csv (பெயர், தொலைபேசி env, prefix, email, இலக்கு) + instruments.csv (alias, asset class, weight)
+    from registry import Registry
+    try:
+        return Registry.load()
+    except Exception as e:
+        print(f"Error: holders.csv / instruments.csv படிக்க முடியவில்லை! {e}")
+        return None
+
+@metrics.track_run('report')
+def run_once(slot=None):
+    import pandas as pd
+    from holdings import compute_holdings
+    from tax import estimate_taxes
+    db.init_db()
     ist = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
+    holders = load_registry()
+    if holders is None: return
     
     # 1. Holiday Check
     h_msg = check_holiday_from_csv()
     if h_msg:
-        api = API.GreenApi(ID_INSTANCE, API_TOKEN)
-        recipients = [{"name": "Selvakumar", "phone": MY_PHONE}, {"name": "Annalakshmi", "phone": WIFE_PHONE}]
-        for person in recipients:
-            api.sending.sendMessage(chatId=f"{person['phone']}@c.us", message=f"வணக்கம் {person['name']}!\n{h_msg}")
-        print("✅ Holiday notification sent.")
-        exit()
+        send_holiday_greetings(h_msg, holders)
+        return
 
     # 2. Portfolio Loading
     try:
         p_df_all = pd.read_csv('portfolio.csv')
     except Exception as e:
         print(f"Error: portfolio.csv not found! {e}")
-        exit()
-    
-    holders = [
-        {"name": "Selvakumar", "phone": MY_PHONE, "prefix": "Sfin", "email": "cselvakumar735@gmail.com"},
-        {"name": "Annalakshmi", "phone": WIFE_PHONE, "prefix": "Afin", "email": "selvakumarannalakshmi22@gmail.com"}
-    ]
+        return
 
+    # 3. Fetch → Compute
+    unknown = set(p_df_all['Holder']) - set(holders.holders)
+    if unknown:
+        print(f"⚠️ holders.csv-ல் இல்லாத holders (அறிக்கை இல்லை): {', '.join(sorted(unknown))}")
+    # ஒவ்வொரு தனித்த டிக்கரும் ஒருமுறை மட்டும் fetch / ஆய்வு - எத்தனை holders வைத்திருந்தாலும்
     all_tickers = p_df_all['Ticker'].unique().tolist()
-    market_data = {}
-
-    print("⏳ தரவுகளைச் சேகரிக்கிறது (Stocks & Mutual Funds)...")
-    for ticker in all_tickers:
+    ctx = fetch_stage(all_tickers)
+    # எல்லா holders-ன் positions / P&L / allocation ஒரே vectorized pass-ல்
+    with metrics.stage('stage.compute'):
+        prices = pd.Series({t: ctx['market'].last_price(t) for t in all_tickers}, dtype=float)
+        positions = compute_holdings(p_df_all, prices)
+        taxes, _ = estimate_taxes(p_df_all, prices, ist.date())
+        ctx['instruments'] = holders.frame(all_tickers)
+        ctx['advice'] = ticker_advice(all_tickers, prices, ctx)
+        lots_by_holder = dict(tuple(p_df_all.groupby('Holder')))
+        reports = [r for r in (compute_holder(p, positions, taxes, lots_by_holder[p['name']], ctx, ist)
+                               for p in holders if p['name'] in lots_by_holder) if r]
+
+    # சேமிப்பு (ஒரே transaction) - அனுப்புதலுக்கு முன்பே
+    if reports:
+        with metrics.stage('db.save'):
+            db.save_to_db(pd.concat([r['df'].assign(Holder=r['holder']['name']) for r in reports], ignore_index=True))
+
+    # 4. மாற்றம் கண்டறிதல்: கடைசியாக அனுப்பிய அறிக்கையின் fingerprint-உடன் ஒப்பீடு
+    if reports:
+        from report_state import ReportState, compare, FULL, DIFF, SKIP
+        last_sent = ReportState().load()
+        for r in reports:
+            r['mode'], r['changes'] = compare(last_sent.get(r['holder']['name']), r['fingerprint'])
+        counts = {mode: sum(r['mode'] == mode for r in reports) for mode in (FULL, DIFF, SKIP)}
+        print(f"🔍 மாற்றம் கண்டறிதல்: முழு அறிக்கை {counts[FULL]} | சுருக்கம் {counts[DIFF]} | மாற்றம் இல்லை {counts[SKIP]}")
+        # செய்தி ஆய்வு (Gemini): முழு அறிக்கை பெறும் holders-ன் டிக்கர்களுக்கு மட்டும், டிக்கருக்கு ஒருமுறை
+        full = [r for r in reports if r['mode'] == FULL]
+        if full:
+            news, headlines = get_ai_news_analysis(list(dict.fromkeys(s for r in full for s in r['df']['Symbol'])))
+            for r in full:
+                r['df']['AI_News'] = r['df']['Symbol'].map(news).fillna("")
+                r['headlines'] = [h for s in r['df']['Symbol'] for h in headlines.get(s, [])]
+
+    # 5. Render → Deliver
+    deliver_stage(reports, ctx, ist, slot)
+    print("🏁 Processing Completed Successfully!")
+
+# --- 7. Daemon mode: சந்தை நேரம் முழுவதும் ஒரே process ---
+# .github/workflows/daily_stock.yml cron நேரங்கள் (IST)
+REPORT_SLOTS = [(9, 10), (10, 0), (10, 40), (11, 20), (12, 0), (12, 40), (13, 20), (14, 0), (14, 40), (15, 20)]
+# slots 40 நிமிட இடைவெளி - பாதிக்குள் இருந்தால் மட்டும் அந்த slot-ன் மறு-run
+SLOT_TOLERANCE = timedelta(minutes=15)
+
+def today_slots(now):
+    if now.weekday() >= 5: return []
+    return [now.replace(hour=h, minute=m, second=0, microsecond=0) for h, m in REPORT_SLOTS]
+
+def run_daemon():
+    # warm caches (DB connection, Gemini client, imports) ticks இடையே அப்படியே இருக்கும்
+    now = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
+    slots = [t for t in today_slots(now) if t > now - timedelta(minutes=5)]
+    if not slots:
+        print("😴 இன்று மீதமுள்ள அறிக்கை நேரங்கள் இல்லை.")
+        return
+    # விடுமுறை நாளில் வாழ்த்து ஒருமுறை மட்டும், பிறகு daemon நின்றுவிடும்
+    if check_holiday_from_csv():
+        run_once()
+        return
+    for slot in slots:
+        while True:
+            remaining = (slot - (datetime.now(timezone.utc) + timedelta(hours=5, minutes=30))).total_seconds()
+            if remaining <= 0: break
+            time.sleep(min(remaining, 60))
+        print(f"⏰ {slot.strftime('%I:%M %p')} அறிக்கை தொடங்குகிறது...")
         try:
-            stock = yf.Ticker(ticker)
-            market_data[ticker] = stock.info.get('regularMarketPrice', 0)
+            run_once(slot)
         except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-            market_data[ticker] = 0 
-
-    for p in holders:
-        u_data = p_df_all[p_df_all['Holder'] == p['name']].copy()
-        if u_data.empty: continue
-        u_data['Total_Cost'] = u_data['Qty'] * u_data['Avg_Price']
-        u_data_grouped = u_data.groupby('Ticker').agg({
-            'Qty': 'sum',
-            'Total_Cost': 'sum',
-            'Buy_Date': 'min' 
-        }).reset_index()
-        u_data_grouped['Avg_Price'] = u_data_grouped['Total_Cost'] / u_data_grouped['Qty']
-
-        results = []
-        for _, row in u_data_grouped.iterrows():
-            ticker = row['Ticker']
-            try:
-                if ticker == "0P0001217S.BO" or ticker == "M_MIDCAP" or ticker == "0P00012ALS.BO":
-                    display_name = "Motilal Midcap SIP"
-                else:
-                    display_name = str(ticker)
-                qty = row['Qty']
-                avg_price = row['Avg_Price']
-                ltp = round(market_data.get(ticker, 0), 2)
-                if ltp == 0:
-                    stock = yf.Ticker(ticker)
-                    hist = stock.history(period="1d")
-                    if not hist.empty:
-                        ltp = round(hist['Close'].iloc[-1], 2)
-                    else:
-                        print(f"⚠️ {ticker} க்கான விலை கிடைக்கவில்லை!")
-                        continue 
-                pl = round((ltp - row['Avg_Price']) * row['Qty'], 2)
-                tax = estimate_tax(row['Buy_Date'], pl)
-                avg_adv = get_averaging_advice(row['Qty'], row['Avg_Price'], ltp)
-                iv_adv = get_intrinsic_value_advice(ticker, ltp)
-                rsi_adv = get_rsi_advice(ticker)
-                ai_news = get_ai_news_analysis(p['name'], ticker)
-
-                single_stock_df = pd.DataFrame([{
-                    'Ticker': ticker, 'Qty': row['Qty'], 'Avg': row['Avg_Price'], 'PL': pl
-                }])
-                profit_adv = get_profit_booking_advice(single_stock_df)
-
-                results.append({
-                    'Date': ist.strftime("%Y-%m-%d %H:%M"), 
-                    'Ticker': display_name, 'Qty': row['Qty'],
-                    'Avg': row['Avg_Price'], 'Live': ltp, 'PL': pl, 
-                    'Tax_Estimate': tax, 'Avg_Advice': avg_adv, 
-                    'IV_Advice': iv_adv, 'Profit_Advice': profit_adv, 
-                    'RSI_Advice': rsi_adv, 'AI_News': ai_news
-                })
-            except Exception as e:
-                print(f"Error processing {ticker}: {e}")
-
-        if not results: continue
-        
-        df_res = pd.DataFrame(results)
-        total_pl = df_res['PL'].sum()
-        total_val = (df_res['Live'] * df_res['Qty']).sum()
-        hedge_msg = get_hedging_advice(total_val)
-
-        # சேமிப்பு மற்றும் அறிக்கைகள்
-        save_to_db(df_res, p['name'])
-        send_whatsapp_green(p['phone'], p['name'], df_res, total_pl, hedge_msg)
-
-        # 4. Voice Report - Green API ஆப்ஜெக்ட் ஒருமுறை மட்டும்
+            print(f"Daemon Tick Error: {e}")
+
+# --- 8. Streaming mode: ஒவ்வொரு விலை மாற்றத்துக்கும் O(1) update, எல்லை கடந்தால் மட்டும் alert ---
+def stream_alert_message(live, holder, kind, detail):
+    from stream import HEDGE_RATIO
+    if kind == 'HEDGE':
+        change = live.index_change_pct()
+        if detail:
+            hedge_amount = live.value[holder] * HEDGE_RATIO
+            return (f"🛡️ *ஹெட்ஜிங் எச்சரிக்கை:* நிஃப்டி 5 நாளில் {change:.1f}% சரிந்துள்ளது.\n"
+                    f"   ┗ ₹{hedge_amount:,.0f} மதிப்பிற்கு Gold ETF அல்லது Liquid Case வாங்கவும்.")
+        return f"✅ நிஃப்டி மீண்டது ({change:.1f}%). ஹெட்ஜிங் தேவையில்லை."
+    comm_pct = live.commodity_pct(holder)
+    if detail == 'EQUITY_HEAVY':
+        note = "பங்குகள் அதிகமாக உள்ளன - தங்கம்/வெள்ளியில் சமன் செய்யவும்."
+    elif detail == 'COMMODITY_HEAVY':
+        note = "தங்கம்/வெள்ளி அதிகமாக உள்ளது - பங்குகளில் சமன் செய்யவும்."
+    else:
+        note = "சொத்துக்கள் மீண்டும் சமநிலையில் உள்ளன."
+    return (f"⚖️ *சமநிலை எச்சரிக்கை:* தங்கம்/வெள்ளி {comm_pct:.1f}% | பங்குகள் {100 - comm_pct:.1f}%\n"
+            f"   ┣ {note}\n"
+            f"   ┗ நேரலை P&L: ₹{live.pl(holder):,.2f}")
+
+@metrics.track_run('stream')
+def run_stream(replay=None, interval=60):
+    import pandas as pd
+    from holdings import compute_holdings
+    from market_data import MarketData, IndexSnapshot, INDEX_TICKER
+    from price_store import PriceStore
+    from stream import LivePortfolio, replay_feed, poll_feed
+    db.init_db()
+    if check_holiday_from_csv() and not replay:
+        print("😴 இன்று விடுமுறை - streaming இல்லை.")
+        return
+    p_df_all = pd.read_csv('portfolio.csv')
+    all_tickers = p_df_all['Ticker'].unique().tolist()
+    store = PriceStore()
+    if not replay:
         try:
-            audio_path = create_voice_report(p['name'], total_pl, df_res, p['prefix'])
-            green_api = API.GreenApi(ID_INSTANCE, API_TOKEN)
-            green_api.sending.sendFileByUpload(
-                chatId=f"{p['phone']}@c.us", 
-                path=audio_path, 
-                fileName=f"{p['name']}_Market_Report.mp3",
-                caption="🎤 இன்றைய குரல் அறிக்கை!"
-            )
+            store.sync(all_tickers + [INDEX_TICKER])
         except Exception as e:
-            print(f"Voice Mail Error: {e}")
-
-        # 5. Visual Reports (காலை 9-10 மற்றும் மாலை 3-4 நேரங்களில் மட்டும்)
-        if (9 <= ist.hour <= 10) or (15 <= ist.hour <= 16):
-            try:
-                create_visuals(df_res, p['prefix'])
-                pdf_path = create_pdf_report(df_res, p['prefix'], p['name'])
-                send_email(p['email'], pdf_path, p['name'])
-                print(f"✅ PDF Report emailed to {p['name']}.")
-            except Exception as e: 
-                print(f"PDF/Email Error: {e}")
-
-print("🏁 Processing Completed Successfully!")
\ No newline at end of file
+            print(f"Error fetching market data: {e}")
+    market = MarketData(store.load(all_tickers + [INDEX_TICKER], days=30))
+    prices = pd.Series({t: market.last_price(t) for t in all_tickers}, dtype=float)
+    # தொடக்க நிலை ஒருமுறை மட்டும் vectorized; பிறகு ஒவ்வொரு tick-ம் delta மட்டும்
+    nifty = IndexSnapshot.from_market(market)
+    index_hist = nifty.tail(5)
+    index_ref = index_hist['Close'].iloc[0] if len(index_hist) >= 2 else None
+    index_price = index_hist['Close'].iloc[-1] if len(index_hist) else None
+    registry = load_registry()
+    if registry is None: return
+    live = LivePortfolio(compute_holdings(p_df_all, prices), registry.is_commodity, index_ref, index_price,
+                         targets=registry.targets())
+
+    phones = {p['name']: p['phone'] for p in registry}
+    feed = replay_feed(replay) if replay else poll_feed(all_tickers + [INDEX_TICKER], interval)
+    ticks = sent = 0
+    print(f"📡 Streaming தொடங்கியது ({len(live.prices)} டிக்கர்கள்)...")
+    with delivery_service() as outbox:
+        for ticker, price in feed:
+            ticks += 1
+            alerts = [a for a in live.on_price(ticker, price) if phones.get(a[0])]
+            if not alerts: continue
+            ist = datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
+            for holder, kind, detail in alerts:
+                outbox.whatsapp(f"{ist:%Y-%m-%d %H:%M:%S}#{ticks}|alert|{holder}|{kind}|{detail}", f"{phones[holder]}@c.us",
+                                f"வணக்கம் {holder}!\n{stream_alert_message(live, holder, kind, detail)}")
+            # alerts உடனே - ஆனால் அதே pooled session வழியே
+            sent += sum(r['status'] == 'sent' for r in outbox.flush())
+    for holder in live.value:
+        print(f"   {holder}: P&L ₹{live.pl(holder):,.2f} | தங்கம்/வெள்ளி {live.commodity_pct(holder):.1f}%")
+    print(f"🏁 Streaming முடிந்தது: {ticks} ticks, {sent} alerts.")
+
+# --- 9. Record / replay: வெளி அழைப்புகளின் பதிவுடன் ஒரு run ---
+def run_with_fixtures(record=None, replay=None):
+    from fixtures import FixtureBundle
+    if replay:
+        # Yahoo / Gemini / gTTS பதிவிலிருந்து; WhatsApp / Email அனுப்பப்படாது, DB தற்காலிக நகலில்
+        with FixtureBundle.load(replay).replay() as sent:
+            run_once()
+        print(f"🎞️ Replay முடிந்தது: {len(sent)} வெளிச்செல்லும் அனுப்புதல்கள் (உள்ளூரில் மட்டும்).")
+        return
+    bundle = FixtureBundle()
+    try:
+        with bundle.record():
+            run_once()
+    finally:
+        bundle.save(record)
+
+# --- 10. Backtest: ஆலோசனை விதிகள் சேமித்த வரலாற்றில் லாபம் தந்தனவா ---
+@metrics.track_run('backtest')
+def run_backtest(years=3, workers=None):
+    import pandas as pd
+    from backtest import Universe, sweep, report
+    from market_data import INDEX_TICKER
+    from price_store import PriceStore
+    db.init_db()
+    registry = load_registry()
+    if registry is None: return
+    tickers = pd.read_csv('portfolio.csv')['Ticker'].unique().tolist() + [INDEX_TICKER]
+    store = PriceStore()
+    try:
+        # cache-ல் இல்லாத பழைய bars மட்டும் ஒருமுறை; பிறகு backtest முழுவதும் உள்ளூர் தரவில்
+        store.sync(tickers)
+        store.backfill(tickers, int(years * 365))
+    except Exception as e:
+        print(f"Error fetching market data: {e}")
+    frame = store.load(tickers, days=int(years * 365))
+    if frame.empty:
+        print("⚠️ Backtest-க்கு விலை தரவு இல்லை.")
+        return
+    universe = Universe.from_frame(frame, INDEX_TICKER, registry.is_commodity)
+    print(f"🧪 Backtest: {len(universe.tickers)} டிக்கர்கள் + NIFTY, {universe.dates[0]:%d-%m-%Y} → "
+          f"{universe.dates[-1]:%d-%m-%Y} ({universe.years:.1f} வருடம்)")
+    with metrics.stage('backtest.sweep'):
+        results = sweep(universe, workers=workers)
+    print(report(results))
+    print("\n★ = போட்டின் தற்போதைய அமைப்பு | return% = விதியுடன் (செலவுகள் உட்பட), hold% = வாங்கி வைத்திருந்தால் | "
+          "hit% = லாபம் தந்த வர்த்தகங்கள் / உதவிய hedge, rebalance | turn/yr = வருட turnover")
+    return results
+
+# --- 11. Archive: hot window-க்கு முந்தைய வரலாறு / விலைகள் Parquet-க்கு, SQLite சிறியதாக ---
+@metrics.track_run('archive')
+def run_archive():
+    from archive import Archive, available, ARCHIVE_DIR, HOT_DAYS
+    from price_store import PriceStore
+    if not available():
+        print("⚠️ pyarrow நிறுவப்படவில்லை - archive தவிர்க்கப்பட்டது (எல்லா வரலாறும் SQLite-லேயே).")
+        return
+    db.init_db()
+    PriceStore()
+    # WAL checkpoint - அளவுகள் ஒப்பிடத்தக்கவை
+    db.close()
+    before = os.path.getsize(db.DB_FILE)
+    moved = Archive().compact()
+    db.close()
+    after = os.path.getsize(db.DB_FILE)
+    for table, rows in moved.items():
+        print(f"🗄️ {table}: {rows} வரிசைகள் → {ARCHIVE_DIR}/{table} (SQLite-ல் கடைசி {HOT_DAYS[table]} நாட்கள்)")
+    print(f"📦 {db.DB_FILE}: {before / 1024:,.0f} KB → {after / 1024:,.0f} KB")
+    return moved
+
+# --- 12. Startup profiling ---
+# ஒரு முழு அறிக்கை run-ல் தேவைப்படும் கனமான modules
+REPORT_MODULES = [
+    'pandas', 'yfinance', 'market_data', 'price_store', 'fundamentals', 'news_store', 'ai_advisor',
+    'holdings', 'tax', 'analytics', 'google.genai', 'whatsapp_api_client_python', 'gtts',
+    'charts', 'pdf_report', 'voice', 'delivery', 'smtplib', 'email.mime.multipart',
+]
+
+# புதிய interpreter-ல் ஒவ்வொரு படியின் கூடுதல் import நேரத்தையும் அளவிடும் script
+_PROFILE_SCRIPT = """
+import importlib, json, time
+t0 = time.perf_counter()
+import stock_bot
+rows = [('stock_bot', time.perf_counter() - t0)]
+# விடுமுறை நாள் பாதை: registry → holiday check → delivery (Green API SDK உட்பட; DB / network தொடாமல்)
+t = time.perf_counter(); stock_bot.load_registry(); rows.append(('registry', time.perf_counter() - t))
+t = time.perf_counter(); stock_bot.check_holiday_from_csv(); rows.append(('holiday check', time.perf_counter() - t))
+t = time.perf_counter(); import delivery, requests.adapters, whatsapp_api_client_python.API; rows.append(('delivery', time.perf_counter() - t))
+for name in stock_bot.REPORT_MODULES:
+    t = time.perf_counter(); importlib.import_module(name); rows.append((name, time.perf_counter() - t))
+print(json.dumps(rows))
+"""
+
+def profile_startup():
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([sys.executable, '-c', _PROFILE_SCRIPT], capture_output=True, text=True, cwd=here)
+    rows = json.loads(proc.stdout.strip().splitlines()[-1])
+    holiday_ms = sum(sec for _, sec in rows[:4]) * 1000
+    report_ms = sum(sec for _, sec in rows) * 1000
+    print("⏱️ Startup profile (ஒவ்வொரு module-ன் கூடுதல் import நேரம்):")
+    for name, sec in rows:
+        print(f"   {sec * 1000:>8.1f} ms  {name}")
+    print(f"   விடுமுறை நாள் run: {holiday_ms:.1f} ms | முழு அறிக்கை imports: {report_ms:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stock Report Bot")
+    parser.add_argument('--daemon', action='store_true',
+                        help="சந்தை நேரம் முழுவதும் இயங்கி, REPORT_SLOTS நேரங்களில் அறிக்கை அனுப்பும்")
+    parser.add_argument('--stream', action='store_true',
+                        help="நேரலை விலைகளைத் தொடர்ந்து கண்காணித்து, எல்லை கடந்தால் மட்டும் WhatsApp alert")
+    parser.add_argument('--replay', metavar='CSV',
+                        help="--stream-க்கு network-க்குப் பதிலாக உள்ளூர் விலை பதிவு (Ts, Ticker, Price)")
+    parser.add_argument('--interval', type=int, default=60,
+                        help="--stream poll இடைவெளி (வினாடிகள்)")
+    parser.add_argument('--record', metavar='BUNDLE',
+                        help="ஒரு முழு run-ன் Yahoo / Gemini / gTTS பதில்களை fixture bundle-ஆக சேமிக்கும்")
+    parser.add_argument('--fixtures', metavar='BUNDLE',
+                        help="network இல்லாமல், பதிவு செய்த bundle-லிருந்து ஒரு run")
+    parser.add_argument('--backtest', action='store_true',
+                        help="RSI / profit booking / averaging / hedge / rebalance விதிகளை வரலாற்றில் parameter sweep")
+    parser.add_argument('--years', type=float, default=3,
+                        help="--backtest வரலாற்று காலம் (வருடங்கள், cache retention 3 வரை)")
+    parser.add_argument('--archive', action='store_true',
+                        help="பழைய history / snapshots / விலைகளை Parquet archive-க்கு நகர்த்தி SQLite-ஐச் சுருக்கும்")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="module வாரியான import நேரத்தை அளவிட்டு காட்டும்")
+    args = parser.parse_args()
+    if args.profile_startup:
+        profile_startup()
+        sys.exit()
+    try:
+        if args.archive:
+            run_archive()
+        elif args.backtest:
+            run_backtest(args.years)
+        elif args.stream:
+            run_stream(args.replay, args.interval)
+        elif args.record or args.fixtures:
+            run_with_fixtures(args.record, args.fixtures)
+        else:
+            run_daemon() if args.daemon else run_once()
+    finally:
+        db.close()
@@ -0,0 +1,142 @@
+import csv
+import time
+
+from market_data import INDEX_TICKER
+from timeutil import MARKET_CLOSE, ist_now
+
+# get_rebalancing_advice / get_hedging_advice-ன் அதே எல்லைகள்; இலக்கு தங்கம்/வெள்ளி % (holders.csv இல்லையெனில்)
+REBALANCE_TARGET_PCT = 50.0
+REBALANCE_THRESHOLD_PCT = 5.0
+HEDGE_TRIGGER_PCT = -2.0
+HEDGE_RATIO = 0.15
+
+
+# நேரலை alerts மற்றும் அறிக்கை fingerprint இரண்டுக்கும் ஒரே நிலை வரையறை
+def rebalance_state(comm_pct, target=REBALANCE_TARGET_PCT):
+    if 100 - comm_pct > (100 - target) + REBALANCE_THRESHOLD_PCT:
+        return 'EQUITY_HEAVY'
+    if comm_pct > target + REBALANCE_THRESHOLD_PCT:
+        return 'COMMODITY_HEAVY'
+    return 'BALANCED'
+
+
+def hedge_state(index_change_pct):
+    return index_change_pct is not None and index_change_pct < HEDGE_TRIGGER_PCT
+
+
+# --- நேரலை portfolio: ஒவ்வொரு tick-க்கும் O(1) delta மாற்றம், DataFrame மறுகட்டமைப்பு இல்லை ---
+class LivePortfolio:
+    def __init__(self, positions, is_commodity, index_ref=None, index_price=None, targets=None):
+        # positions: (Holder, Ticker) index, Qty / Avg / Live columns (compute_holdings வெளியீடு)
+        self.prices = {}
+        self.holders_of = {}
+        self.commodity = {}
+        self.value = {}
+        self.cost = {}
+        self.comm_value = {}
+        # விலை இன்னும் தெரியாத positions - முதல் tick வந்ததும் சேர்க்கப்படும்
+        self.pending = {}
+        for (holder, ticker), qty, avg, live in zip(positions.index, positions['Qty'], positions['Avg'], positions['Live']):
+            self.commodity[ticker] = is_commodity(ticker)
+            if live != live:  # NaN - விலை இல்லை
+                self.pending.setdefault(ticker, []).append((holder, qty, avg))
+                continue
+            self.prices[ticker] = live
+            self._add(holder, ticker, qty, avg, live)
+        # holder -> தங்கம்/வெள்ளி இலக்கு % (registry)
+        self.targets = targets or {}
+        self.index_ref = index_ref
+        self.index_price = index_price
+        self.rebalance_state = {h: self._rebalance_state(h) for h in self.value}
+        self.hedge_on = self._hedge_state()
+
+    def _add(self, holder, ticker, qty, avg, live):
+        self.holders_of.setdefault(ticker, []).append((holder, qty))
+        self.value[holder] = self.value.get(holder, 0.0) + qty * live
+        self.cost[holder] = self.cost.get(holder, 0.0) + qty * avg
+        if self.commodity[ticker]:
+            self.comm_value[holder] = self.comm_value.get(holder, 0.0) + qty * live
+
+    def pl(self, holder):
+        return self.value[holder] - self.cost[holder]
+
+    def commodity_pct(self, holder):
+        total = self.value[holder]
+        return self.comm_value.get(holder, 0.0) / total * 100 if total else 0.0
+
+    def _rebalance_state(self, holder):
+        return rebalance_state(self.commodity_pct(holder), self.targets.get(holder, REBALANCE_TARGET_PCT))
+
+    def index_change_pct(self):
+        if not self.index_ref or self.index_price is None:
+            return None
+        return (self.index_price - self.index_ref) / self.index_ref * 100
+
+    def _hedge_state(self):
+        return hedge_state(self.index_change_pct())
+
+    def on_price(self, ticker, price):
+        # alerts: [(holder, kind, விவரம்)] - எல்லையைக் கடக்கும் போது மட்டும்
+        if ticker == INDEX_TICKER:
+            return self.on_index(price)
+        if ticker in self.pending:
+            self.prices[ticker] = price
+            for holder, qty, avg in self.pending.pop(ticker):
+                self._add(holder, ticker, qty, avg, price)
+                self.rebalance_state.setdefault(holder, self._rebalance_state(holder))
+            return self._check(h for h, _ in self.holders_of[ticker])
+        old = self.prices.get(ticker)
+        if old is None or price == old:
+            return []
+        self.prices[ticker] = price
+        delta = price - old
+        for holder, qty in self.holders_of[ticker]:
+            self.value[holder] += qty * delta
+            if self.commodity[ticker]:
+                self.comm_value[holder] += qty * delta
+        return self._check(h for h, _ in self.holders_of[ticker])
+
+    def _check(self, holders):
+        alerts = []
+        for holder in dict.fromkeys(holders):
+            state = self._rebalance_state(holder)
+            if state != self.rebalance_state[holder]:
+                self.rebalance_state[holder] = state
+                alerts.append((holder, 'REBALANCE', state))
+        return alerts
+
+    def on_index(self, price):
+        self.index_price = price
+        hedge_on = self._hedge_state()
+        if hedge_on == self.hedge_on:
+            return []
+        self.hedge_on = hedge_on
+        return [(holder, 'HEDGE', hedge_on) for holder in self.value]
+
+
+def replay_feed(path):
+    # உள்ளூர் CSV (Ts, Ticker, Price) - network இல்லாமல் சோதிக்க
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield row['Ticker'], float(row['Price'])
+
+
+def poll_feed(tickers, interval=60):
+    # ஒவ்வொரு poll-லும் எல்லா டிக்கர்களுக்கும் ஒரே batch (1 நிமிட bars); சந்தை முடியும் வரை
+    import yfinance as yf
+    last = {}
+    while (ist_now().hour, ist_now().minute) < MARKET_CLOSE:
+        try:
+            frame = yf.download(sorted(tickers), period="1d", interval="1m", group_by="ticker",
+                                auto_adjust=False, threads=True, progress=False)
+            for ticker in frame.columns.get_level_values(0).unique():
+                closes = frame[ticker]['Close'].dropna()
+                if closes.empty:
+                    continue
+                price = round(float(closes.iloc[-1]), 2)
+                if last.get(ticker) != price:
+                    last[ticker] = price
+                    yield ticker, price
+        except Exception as e:
+            print(f"Stream poll error: {e}")
+        time.sleep(interval)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+STCG_RATE = 0.20
+LTCG_RATE = 0.125
+# ஒரு நிதியாண்டில் ஒரு நபருக்கு LTCG விலக்கு
+LTCG_EXEMPTION = 125000
+LTCG_DAYS = 365
+
+
+def financial_year(dates):
+    # ஏப்ரல் 1 முதல் மார்ச் 31 வரை; FY 2025 = 2025-04-01 .. 2026-03-31
+    dates = pd.DatetimeIndex(dates)
+    return np.where(dates.month >= 4, dates.year, dates.year - 1)
+
+
+# --- Lot-level வரி engine: FIFO, lot வாரியாக STCG/LTCG, holder வாரியாக விலக்கு ---
+def open_lots(lots):
+    # விற்பனை (Qty < 0) வரிசைகள் பழைய lots-ல் இருந்து முதலில் கழிக்கப்படும் (FIFO)
+    # தவறான தேதி கொண்ட lots Buy_Date = NaT உடன் கடைசியில் - அளவில் சேரும், வரி மட்டும் தெரியாது
+    lots = lots.assign(Buy_Date=pd.to_datetime(lots['Buy_Date'], format='%Y-%m-%d', errors='coerce'))
+    lots = lots.sort_values(['Holder', 'Ticker', 'Buy_Date'], na_position='last')
+    buys = lots[lots['Qty'] > 0].copy()
+    sold = (-lots.loc[lots['Qty'] < 0].groupby(['Holder', 'Ticker'])['Qty'].sum()).rename('Sold')
+    buys = buys.join(sold, on=['Holder', 'Ticker'])
+    buys['Sold'] = buys['Sold'].fillna(0)
+    cum_qty = buys.groupby(['Holder', 'Ticker'])['Qty'].cumsum()
+    buys['Open_Qty'] = np.clip(cum_qty - buys['Sold'], 0, buys['Qty'])
+    return buys[buys['Open_Qty'] > 0]
+
+
+def estimate_taxes(lots, prices, as_of):
+    # prices: Ticker -> நேரலை விலை; as_of: இன்றைய தேதி
+    as_of = pd.Timestamp(as_of)
+    lots = open_lots(lots)
+    # தேதி தெரியாத lot உள்ள position: STCG/LTCG பிரிக்க முடியாது - அதன் வரி மட்டும் 'ERROR'
+    undated = pd.MultiIndex.from_frame(lots.loc[lots['Buy_Date'].isna(), ['Holder', 'Ticker']]).unique()
+    lots = lots.dropna(subset=['Buy_Date'])
+    live = prices.reindex(lots['Ticker']).to_numpy(dtype=float)
+    lots = lots.assign(Gain=(live - lots['Avg_Price'].to_numpy()) * lots['Open_Qty'].to_numpy())
+    lots = lots[np.isfinite(lots['Gain'])]
+    long_term = ((as_of - lots['Buy_Date']).dt.days >= LTCG_DAYS).to_numpy()
+    lots = lots.assign(
+        ST_Gain=np.where(long_term, 0.0, lots['Gain']),
+        LT_Gain=np.where(long_term, lots['Gain'], 0.0),
+        # விற்றால் இந்த நிதியாண்டில் தான் வரி - விலக்கு (Holder, FY) வாரியாக
+        FY=financial_year([as_of] * len(lots)),
+    )
+
+    pos = lots.groupby(['Holder', 'Ticker'])[['ST_Gain', 'LT_Gain']].sum()
+    holder = lots.groupby(['Holder', 'FY'])[['ST_Gain', 'LT_Gain']].sum().reset_index('FY')
+    # STCL முதலில் STCG-ஐ, மீதி LTCG-ஐ ஈடுசெய்யும்; LTCL LTCG-ஐ மட்டும்
+    st_net = holder['ST_Gain'].clip(lower=0)
+    lt_net = (holder['LT_Gain'] + holder['ST_Gain'].clip(upper=0)).clip(lower=0)
+    holder['STCG_Tax'] = st_net * STCG_RATE
+    holder['LTCG_Taxable'] = (lt_net - LTCG_EXEMPTION).clip(lower=0)
+    holder['LTCG_Tax'] = holder['LTCG_Taxable'] * LTCG_RATE
+
+    # holder வரியை லாபம் உள்ள positions-க்கு விகிதப்படி பகிர்தல்
+    st_pos = pos['ST_Gain'].clip(lower=0)
+    lt_pos = pos['LT_Gain'].clip(lower=0)
+    st_share = st_pos / st_pos.groupby(level='Holder').transform('sum')
+    lt_share = lt_pos / lt_pos.groupby(level='Holder').transform('sum')
+    holders = pos.index.get_level_values('Holder')
+    pos['STCG_Tax'] = (st_share.fillna(0) * holder['STCG_Tax'].reindex(holders).to_numpy()).round(1)
+    pos['LTCG_Tax'] = (lt_share.fillna(0) * holder['LTCG_Tax'].reindex(holders).to_numpy()).round(1)
+    pos['Tax_Amt'] = pos['STCG_Tax'] + pos['LTCG_Tax']
+    has_st, has_lt = st_pos > 0, lt_pos > 0
+    pos['Tax_Type'] = np.select([has_st & has_lt, has_st, has_lt], ['MIXED', 'STCG', 'LTCG'], default='NONE')
+    pos = pos.reindex(pos.index.union(undated))
+    pos.loc[undated, 'Tax_Type'] = 'ERROR'
+    pos.loc[undated, ['STCG_Tax', 'LTCG_Tax', 'Tax_Amt']] = np.nan
+    return pos, holder
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import db
+import delivery
+
+
+@pytest.fixture
+def scratch_db(tmp_path, monkeypatch):
+    # ஒவ்வொரு test-க்கும் தனி portfolio_history.db (tmp அடைவில்) - உண்மையான DB தொடப்படாது
+    db.close()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db, 'DB_FILE', str(tmp_path / 'portfolio_history.db'))
+    yield tmp_path
+    db.close()
+
+
+# --- உள்ளூர் Green API stub: கோரிக்கைகளைப் பதிவு செய்து, விரும்பிய chatId-க்கு 5xx தரும் ---
+class GreenStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _GreenHandler)
+        self.requests = []
+        self.failures = {}   # chatId -> இன்னும் தர வேண்டிய 500 பதில்கள் (-1 = எப்போதும்)
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def messages(self, chat):
+        return [text for _, c, text in self.requests if c == chat]
+
+    def chats(self):
+        return [chat for _, chat, _ in self.requests]
+
+
+class _GreenHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        stub = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            payload = json.loads(body)
+            chat, text = payload.get('chatId'), payload.get('message')
+        else:
+            # sendFileByUpload: multipart form - chatId புலம்
+            chat, text = body.split(b'name="chatId"\r\n\r\n', 1)[-1].split(b'\r\n', 1)[0].decode(), None
+        with stub.lock:
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            stub.requests.append((self.path.split('/')[2], chat, text))
+            left = stub.failures.get(chat, 0)
+            if left > 0:
+                stub.failures[chat] = left - 1
+        time.sleep(stub.delay)
+        with stub.lock:
+            stub.in_flight -= 1
+        status, payload = (500, b'{"error":"stub"}') if left else (200, b'{"idMessage":"stub"}')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def green_stub(monkeypatch):
+    stub = GreenStub()
+    thread = threading.Thread(target=stub.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(delivery, 'GREEN_API_HOST', stub.url)
+    monkeypatch.setattr(delivery, 'GREEN_API_MEDIA', stub.url)
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+# --- smtplib.SMTP-க்குப் பதில்: அனுப்பிய செய்திகளை நினைவில் வைக்கும் ---
+class FakeSMTP:
+    instances = []
+    fail_to = set()
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.quit()
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        if msg['To'] in FakeSMTP.fail_to:
+            import smtplib
+            raise smtplib.SMTPRecipientsRefused({msg['To']: (550, b'stub')})
+        self.sent.append(msg)
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    import smtplib
+    FakeSMTP.instances, FakeSMTP.fail_to = [], set()
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    return FakeSMTP
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+from ai_advisor import AIAdvisor, cache_key
+from timeutil import ist_now
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, model, contents):
+        self.calls.append((model, contents))
+        return SimpleNamespace(text=f"பதில் {len(self.calls)}")
+
+
+class FakeClient:
+    def __init__(self):
+        self.models = FakeModels()
+
+
+def test_identical_key_is_not_sent_again(scratch_db):
+    client = FakeClient()
+    first = AIAdvisor(client).generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    # prompt உரை மாறினாலும் key (model, ticker, titles) ஒன்றே - cache-லிருந்து
+    second = AIAdvisor(client).generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt v2")})
+    assert len(client.models.calls) == 1
+    assert second == first == {'TCS.NS': "பதில் 1"}
+
+
+def test_changed_titles_call_gemini_again(scratch_db):
+    client = FakeClient()
+    advisor = AIAdvisor(client)
+    advisor.generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    answer = advisor.generate_many({'TCS.NS': (('TCS.NS', ['Q2 results', 'New order win']), "prompt")})
+    assert len(client.models.calls) == 2
+    assert answer == {'TCS.NS': "பதில் 2"}
+
+
+def test_other_model_does_not_share_cache(scratch_db):
+    client = FakeClient()
+    AIAdvisor(client).generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    AIAdvisor(client, model="gemini-other").generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    assert [model for model, _ in client.models.calls] == ["gemini-2.0-flash", "gemini-other"]
+
+
+def test_duplicate_keys_in_one_batch_sent_once(scratch_db):
+    client = FakeClient()
+    answers = AIAdvisor(client).generate_many({
+        'a': (('TCS.NS', ['Q2 results']), "prompt"),
+        'b': (('TCS.NS', ['Q2 results']), "prompt"),
+    })
+    assert len(client.models.calls) == 1
+    assert answers['a'] == answers['b']
+
+
+def test_expired_entry_is_refreshed(scratch_db):
+    client = FakeClient()
+    AIAdvisor(client).generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    AIAdvisor(client, ttl=timedelta(0)).generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    assert len(client.models.calls) == 2
+
+
+def test_expired_rows_are_purged_on_write(scratch_db):
+    client = FakeClient()
+    advisor = AIAdvisor(client)
+    advisor.generate_many({'TCS.NS': (('TCS.NS', ['Q2 results']), "prompt")})
+    with advisor.conn:
+        advisor.conn.execute("UPDATE ai_cache SET Created_At = ?", ((ist_now() - timedelta(days=3)).isoformat(),))
+    advisor.generate_many({'INFY.NS': (('INFY.NS', ['Buyback']), "prompt")})
+    keys = [k for k, in advisor.conn.execute("SELECT Key FROM ai_cache")]
+    assert keys == [cache_key(advisor.model, 'INFY.NS', ['Buyback'])]
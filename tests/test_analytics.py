@@ -0,0 +1,94 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+import analytics
+import db
+
+
+def add_history(conn, rows):
+    # rows: (Date, Holder, Ticker, Qty, Avg_Price, Live_Price)
+    with conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO history (Date, Holder, Ticker, Qty, Avg_Price, Live_Price, PL)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(*r, (r[5] - r[4]) * r[3]) for r in rows])
+
+
+@pytest.fixture
+def conn(scratch_db, monkeypatch):
+    monkeypatch.setattr(analytics, '_memo', {})
+    db.init_db()
+    return db.connect()
+
+
+def test_renamed_ticker_is_not_carried_forward(conn):
+    # அதே fund முதலில் M_MIDCAP, பின் புதிய alias - பழைய பெயர் முன்னோக்கி நிரப்பப்படக் கூடாது
+    add_history(conn, [
+        ('2026-02-05', 'A', 'GOLD', 10, 10.0, 10.0),
+        ('2026-02-05', 'A', 'M_MIDCAP', 5, 100.0, 100.0),
+        ('2026-02-06', 'A', 'GOLD', 10, 10.0, 10.0),
+        ('2026-02-06', 'A', 'Midcap SIP', 5, 100.0, 100.0),
+        ('2026-02-09', 'A', 'GOLD', 10, 10.0, 11.0),
+        ('2026-02-09', 'A', 'Midcap SIP', 5, 100.0, 100.0),
+    ])
+    curve = analytics.equity_curve(analytics.load_history('A', conn))
+    assert curve['Cost'].tolist() == [600.0, 600.0, 600.0]
+    assert curve['Value'].iloc[-1] == 610.0
+    # alias மாற்ற நாள் லாபமோ நட்டமோ அல்ல; GOLD-ன் 10% மட்டும்
+    assert curve['Index'].round(6).tolist() == [1.0, 1.0, round(610 / 600, 6)]
+
+
+def test_price_gap_inside_a_run_is_filled(conn):
+    add_history(conn, [
+        ('2026-02-05', 'A', 'GOLD', 10, 10.0, 10.0),
+        ('2026-02-05', 'A', 'SILVER', 1, 50.0, 50.0),
+        ('2026-02-06', 'A', 'SILVER', 1, 50.0, 50.0),
+        ('2026-02-09', 'A', 'GOLD', 10, 10.0, 10.0),
+        ('2026-02-09', 'A', 'SILVER', 1, 50.0, 50.0),
+    ])
+    panel = analytics.load_history('A', conn)
+    assert panel['Value'].loc['2026-02-06', 'GOLD'] == 100.0
+
+
+def test_top_up_is_a_flow_not_a_gain():
+    dates = pd.to_datetime(['2026-03-02', '2026-03-03', '2026-03-04'])
+    # 10 @ 10, மார்ச் 3 அன்று விலை 12-ல் மேலும் 10 வாங்கல்
+    value = pd.DataFrame({'GOLD': [100.0, 240.0, 240.0]}, index=dates)
+    cost = pd.DataFrame({'GOLD': [100.0, 220.0, 220.0]}, index=dates)
+    panel = pd.concat({'Value': value, 'Cost': cost, 'PL': value - cost}, axis=1)
+    lots = pd.DataFrame({'Ticker': ['GOLD', 'GOLD'], 'Qty': [10, 10], 'Avg_Price': [10.0, 12.0],
+                         'Buy_Date': ['2026-01-10', '2026-03-03']})
+    curve = analytics.equity_curve(panel, lots)
+    # 100 -> 120 (20% லாபம்) பிறகு 120 புதிய பணம்
+    assert curve['Index'].round(6).tolist() == [1.0, 1.2, 1.2]
+
+
+def test_sell_proceeds_are_not_a_loss():
+    dates = pd.to_datetime(['2026-03-02', '2026-03-03'])
+    value = pd.DataFrame({'GOLD': [200.0, 100.0]}, index=dates)
+    panel = pd.concat({'Value': value, 'Cost': value, 'PL': value * 0}, axis=1)
+    lots = pd.DataFrame({'Ticker': ['GOLD', 'GOLD'], 'Qty': [20, -10], 'Avg_Price': [10.0, 10.0],
+                         'Buy_Date': ['2026-01-10', '2026-03-03']})
+    assert analytics.equity_curve(panel, lots)['Index'].tolist() == [1.0, 1.0]
+
+
+def test_summary_sees_same_day_rerun(conn):
+    add_history(conn, [('2026-02-05', 'A', 'GOLD', 10, 10.0, 10.0), ('2026-02-06', 'A', 'GOLD', 10, 10.0, 10.0)])
+    assert analytics.holder_summary('A', conn=conn)['return_pct'] == 0
+    # daemon: அதே நாள் மீண்டும் - புதிய விலை
+    add_history(conn, [('2026-02-06', 'A', 'GOLD', 10, 10.0, 11.0)])
+    assert analytics.holder_summary('A', conn=conn)['return_pct'] == pytest.approx(10.0)
+
+
+def test_xirr_one_year():
+    assert analytics.xirr([-100, 110], ['2021-01-01', '2022-01-01']) == pytest.approx(0.10, abs=1e-6)
+
+
+def test_xirr_out_of_bounds_is_none_without_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        # ஒரு நாளில் 10000 மடங்கு - எல்லைக்கு வெளியே
+        assert analytics.xirr([-100, 1e6], ['2026-01-01', '2026-01-02']) is None
+        assert analytics.xirr([100, 50], ['2026-01-01', '2026-06-01']) is None
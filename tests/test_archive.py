@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+import db
+from archive import Archive
+
+pytest.importorskip('pyarrow')
+
+NOW = datetime(2026, 10, 16, 9, 10)
+
+
+@pytest.fixture
+def archive(scratch_db):
+    db.init_db()
+    conn = db.connect()
+    from price_store import PriceStore
+    PriceStore()
+    # ஒவ்வொரு மாதமும் இரண்டு டிக்கர்கள் - 2025 முழுவதும் hot window-க்கு வெளியே
+    rows = [(t, f"2025-{m:02d}-{d:02d}", 1.0, 1.0, 1.0, float(m), float(m), 100, 1)
+            for t in ['A.NS', 'B.NS'] for m in range(1, 13) for d in (3, 17)]
+    history = [(f"2025-{m:02d}-03", h, 'A.NS', 1, 1.0, float(m), 0.0) for h in ['Asha', 'Ravi Kumar'] for m in range(1, 13)]
+    with conn:
+        conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO history (Date, Holder, Ticker, Qty, Avg_Price, Live_Price, PL) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", history)
+    store = Archive(conn=conn)
+    assert store.compact(NOW) == {'history': 24, 'snapshots': 0, 'prices': 48}
+    return store
+
+
+def test_read_filters_partitions_and_projects_columns(archive):
+    frame = archive.read('prices', columns=['Ticker', 'Date', 'Close'],
+                         filters=[('Ticker', 'in', ['B.NS']), ('month', '>=', '2025-11'), ('Date', '>=', '2025-11-10')])
+    assert list(frame.columns) == ['Ticker', 'Date', 'Close']
+    assert frame.sort_values('Date')['Date'].tolist() == ['2025-11-17', '2025-12-03', '2025-12-17']
+    ravi = archive.read('history', columns=['Date', 'Live_Price'], filters=[('holder', '=', 'Ravi Kumar')])
+    assert len(ravi) == 12
+    assert archive.read('prices', filters=[('Ticker', 'in', ['Z.NS'])]).empty
+    assert archive.read('snapshots') is None
+
+
+def test_first_dates_aggregates_per_batch(archive):
+    assert archive.first_dates(['A.NS', 'B.NS', 'Z.NS']) == {'A.NS': '2025-01-03', 'B.NS': '2025-01-03'}
@@ -0,0 +1,33 @@
+import os
+
+import pandas as pd
+
+import db
+import metrics
+from charts import ChartRenderer
+
+
+def frame(pl):
+    return pd.DataFrame({'Ticker': ['A.NS', 'B.NS'], 'Qty': [1.0, 2.0], 'Live': [100.0, 50.0], 'PL': pl})
+
+
+def test_png_cache_lives_outside_the_db(scratch_db, monkeypatch):
+    counts = []
+    monkeypatch.setattr(metrics, 'incr', lambda name, key, n=1: counts.append(key))
+    db.init_db()
+    first = ChartRenderer().render(frame([10.0, -5.0]))
+    second = ChartRenderer().render(frame([10.2, -5.1]))  # காட்டப்படும் துல்லியத்தில் அதே தரவு
+    assert first == second
+    assert counts == ['misses', 'misses', 'hits', 'hits']
+    assert len(os.listdir(scratch_db / 'chart_cache')) == 2
+    tables = {r[0] for r in db.connect().execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'chart_cache' not in tables
+
+
+def test_old_chart_table_is_dropped(scratch_db):
+    conn = db.connect()
+    conn.execute("CREATE TABLE chart_cache (Key TEXT PRIMARY KEY, Png BLOB, Created_At TEXT)")
+    conn.execute("PRAGMA user_version = 1")
+    db.init_db()
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'chart_cache' not in tables
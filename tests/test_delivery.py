@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import delivery
+from delivery import DeliveryService, _RateLimiter
+
+
+@pytest.fixture
+def service(scratch_db, green_stub, monkeypatch):
+    monkeypatch.setattr(delivery, 'RATE_LIMITS', {'whatsapp': 0.0, 'email': 0.0})
+    return lambda: DeliveryService('1101', 'token', 'bot@example.com', 'pw', backoff=0)
+
+
+def test_same_key_is_delivered_once(service, green_stub):
+    with service() as outbox:
+        outbox.whatsapp('2026-10-16 09:30|WA|A', '9001@c.us', "அறிக்கை")
+        outbox.whatsapp('2026-10-16 09:30|WA|A', '9001@c.us', "அறிக்கை")
+        first = outbox.flush()
+    # மறு-run: புதிய service, அதே DB
+    with service() as outbox:
+        outbox.whatsapp('2026-10-16 09:30|WA|A', '9001@c.us', "அறிக்கை")
+        second = outbox.flush()
+    assert [r['status'] for r in first] == ['sent', 'duplicate']
+    assert [r['status'] for r in second] == ['duplicate']
+    assert green_stub.chats() == ['9001@c.us']
+
+
+def test_transient_5xx_is_retried(service, green_stub):
+    green_stub.failures['9001@c.us'] = 2
+    with service() as outbox:
+        outbox.whatsapp('k', '9001@c.us', "அறிக்கை")
+        [result] = outbox.flush()
+    assert result['status'] == 'sent'
+    assert result['attempts'] == 3
+    assert green_stub.chats() == ['9001@c.us'] * 3
+
+
+def test_persistent_5xx_is_recorded_and_retried_next_run(service, green_stub):
+    green_stub.failures['9001@c.us'] = delivery.RETRIES
+    with service() as outbox:
+        outbox.whatsapp('k', '9001@c.us', "அறிக்கை")
+        [failed] = outbox.flush()
+        assert failed['status'] == 'failed' and '500' in failed['error']
+        assert not outbox.sent('k')
+    with service() as outbox:
+        outbox.whatsapp('k', '9001@c.us', "அறிக்கை")
+        [result] = outbox.flush()
+    assert result['status'] == 'sent'
+
+
+def test_old_deliveries_are_purged(service, green_stub):
+    with service() as outbox:
+        with outbox.conn:
+            outbox.conn.execute("INSERT INTO deliveries (Key, Status, Sent_At) VALUES ('old', 'sent', '2020-01-01T09:10:00')")
+        outbox.whatsapp('new', '9001@c.us', "அறிக்கை")
+        outbox.flush()
+        assert [k for k, in outbox.conn.execute("SELECT Key FROM deliveries")] == ['new']
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_spaces_sends(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(delivery.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(delivery.time, 'sleep', clock.sleep)
+    limiter = _RateLimiter(0.5)
+    starts = []
+    for _ in range(3):
+        limiter.wait()
+        starts.append(clock.now)
+    assert starts == [100.0, 100.5, 101.0]
+    # இடைவெளியை விட அதிக நேரம் கழித்து வந்தால் காத்திருப்பு இல்லை
+    clock.now += 2.0
+    limiter.wait()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_holiday_path_does_not_import_pandas():
+    code = ("import sys, stock_bot; stock_bot.load_registry(); stock_bot.check_holiday_from_csv(); "
+            "import delivery; print('pandas' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=root)
+    assert out.stdout.strip().splitlines()[-1] == 'False'
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from holdings import compute_holdings
+from tax import estimate_taxes, open_lots
+
+
+def lots_frame(rows):
+    return pd.DataFrame(rows, columns=['Holder', 'Ticker', 'Qty', 'Avg_Price', 'Buy_Date'])
+
+
+def random_lots(seed, n_lots=400):
+    # வாங்கல்கள் மட்டும் - ஒரே (holder, ticker)-க்கு பல lots, வெவ்வேறு தேதிகள்
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i}.NS" for i in range(8)]
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 1500, n_lots), unit='D')
+    lots = lots_frame({
+        'Holder': rng.choice(['H0', 'H1', 'H2'], n_lots),
+        'Ticker': rng.choice(tickers, n_lots),
+        'Qty': rng.integers(1, 50, n_lots).astype(float),
+        'Avg_Price': rng.uniform(10, 500, n_lots).round(2),
+        'Buy_Date': dates.strftime('%Y-%m-%d'),
+    })
+    prices = pd.Series(rng.uniform(10, 500, len(tickers)).round(2), index=tickers)
+    return lots, prices
+
+
+def legacy_holdings(lots, prices):
+    # பழைய __main__ பாதை அப்படியே: holder வாரியாக groupby, பின் iterrows
+    rows = []
+    for holder in lots['Holder'].unique():
+        u_data = lots[lots['Holder'] == holder].copy()
+        u_data['Total_Cost'] = u_data['Qty'] * u_data['Avg_Price']
+        grouped = u_data.groupby('Ticker').agg({'Qty': 'sum', 'Total_Cost': 'sum', 'Buy_Date': 'min'}).reset_index()
+        grouped['Avg_Price'] = grouped['Total_Cost'] / grouped['Qty']
+        for _, row in grouped.iterrows():
+            ltp = round(prices.get(row['Ticker'], 0), 2)
+            pl = round((ltp - row['Avg_Price']) * row['Qty'], 2)
+            pl_pct = (pl / (row['Avg_Price'] * row['Qty'])) * 100
+            rows.append({'Holder': holder, 'Ticker': row['Ticker'], 'Qty': row['Qty'], 'Avg': row['Avg_Price'],
+                         'Live': ltp, 'PL': pl, 'Buy_Date': row['Buy_Date'], 'Profit_Flag': pl_pct >= 20})
+    return pd.DataFrame(rows).set_index(['Holder', 'Ticker']).sort_index()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorized_matches_legacy_groupby(seed):
+    # விற்பனை இல்லாத தரவில் FIFO-வும் பழைய groupby-யும் ஒன்றே
+    lots, prices = random_lots(seed)
+    expected = legacy_holdings(lots, prices)
+    got = compute_holdings(lots, prices)
+    assert got.index.tolist() == expected.index.tolist()
+    for col in ['Qty', 'Avg', 'Live', 'PL']:
+        assert got[col].to_numpy() == pytest.approx(expected[col].to_numpy()), col
+    assert got['Buy_Date'].tolist() == expected['Buy_Date'].tolist()
+    assert got['Profit_Flag'].tolist() == expected['Profit_Flag'].tolist()
+
+
+def test_allocation_is_per_holder():
+    lots = lots_frame([
+        ('A', 'X.NS', 10, 100.0, '2025-01-01'),
+        ('A', 'Y.NS', 30, 100.0, '2025-01-01'),
+        ('B', 'X.NS', 5, 100.0, '2025-01-01'),
+    ])
+    pos = compute_holdings(lots, pd.Series({'X.NS': 100.0, 'Y.NS': 100.0}))
+    assert pos['Alloc_Pct'].tolist() == [25.0, 75.0, 100.0]
+
+
+def test_missing_price_is_nan_not_zero():
+    lots = lots_frame([('A', 'X.NS', 10, 100.0, '2025-01-01')])
+    pos = compute_holdings(lots, pd.Series({'X.NS': 0.0}))
+    assert np.isnan(pos['Live'].iloc[0]) and np.isnan(pos['PL'].iloc[0])
+
+
+def test_sell_consumes_oldest_lot_first():
+    lots = lots_frame([
+        ('A', 'X.NS', 10, 100.0, '2025-01-01'),
+        ('A', 'X.NS', 10, 200.0, '2025-02-01'),
+        ('A', 'X.NS', -15, 300.0, '2025-03-01'),
+    ])
+    pos = compute_holdings(lots, pd.Series({'X.NS': 250.0})).loc[('A', 'X.NS')]
+    # முதல் lot முழுதும், இரண்டாவதில் 5 விற்பனை - மீதம் 5 @ 200
+    assert pos['Qty'] == 5
+    assert pos['Avg'] == 200.0
+    assert pos['Buy_Date'] == '2025-02-01'
+    assert pos['PL'] == 250.0
+
+
+def test_fully_sold_ticker_is_dropped():
+    lots = lots_frame([
+        ('A', 'X.NS', 10, 100.0, '2025-01-01'),
+        ('A', 'X.NS', -10, 120.0, '2025-03-01'),
+        ('A', 'Y.NS', 1, 50.0, '2025-01-01'),
+    ])
+    pos = compute_holdings(lots, pd.Series({'X.NS': 130.0, 'Y.NS': 60.0}))
+    assert pos.index.tolist() == [('A', 'Y.NS')]
+    assert pos['Alloc_Pct'].tolist() == [100.0]
+
+
+def test_holdings_agree_with_tax_lots():
+    lots = lots_frame([
+        ('A', 'X.NS', 4, 10.0, '2024-01-01'),
+        ('A', 'X.NS', 6, 12.0, '2024-06-01'),
+        ('A', 'X.NS', -5, 15.0, '2025-01-01'),
+        ('B', 'X.NS', 3, 11.0, '2024-02-01'),
+    ])
+    pos = compute_holdings(lots, pd.Series({'X.NS': 14.0}))
+    open_ = open_lots(lots)
+    cost = (open_['Open_Qty'] * open_['Avg_Price']).groupby([open_['Holder'], open_['Ticker']]).sum()
+    assert pos['Qty'].tolist() == [5, 3]
+    assert pos['Total_Cost'].to_numpy() == pytest.approx(cost.to_numpy())
+
+
+def random_lots_with_sells(seed, n_lots=400):
+    # ஒவ்வொரு lot-க்கும் தனித் தேதி; கையில் உள்ள அளவுக்கு மிகாமல் சுமார் 30% விற்பனைகள்
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i}.NS" for i in range(8)]
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(np.sort(rng.choice(1500, n_lots, replace=False)), unit='D')
+    held, rows = {}, []
+    for date in dates:
+        key = (f"H{rng.integers(3)}", tickers[rng.integers(len(tickers))])
+        qty = float(rng.integers(1, 50))
+        if held.get(key, 0) > 0 and rng.random() < 0.3:
+            qty = -float(rng.integers(1, held[key] + 1))
+        held[key] = held.get(key, 0) + qty
+        rows.append((*key, qty, round(rng.uniform(10, 500), 2), date.strftime('%Y-%m-%d')))
+    prices = pd.Series(rng.uniform(10, 500, len(tickers)).round(2), index=tickers)
+    return lots_frame(rows), prices
+
+
+def fifo_holdings(lots, prices):
+    # வரி-lot அர்த்தம்: விற்பனை பழைய lot-லிருந்து முதலில் கழியும் (FIFO) - மீதமுள்ள lots-ன் அடக்கம், தேதி.
+    # பழைய groupby விற்பனையை signed Qty * Avg_Price ஆகக் கூட்டியது - விற்பனை உள்ள தரவில் இரண்டும் வேறுபடும்
+    rows = []
+    for holder in lots['Holder'].unique():
+        books = {}
+        for _, row in lots[lots['Holder'] == holder].sort_values('Buy_Date').iterrows():
+            book = books.setdefault(row['Ticker'], [])
+            if row['Qty'] > 0:
+                book.append([row['Qty'], row['Avg_Price'], row['Buy_Date']])
+                continue
+            sell = -row['Qty']
+            while sell > 0 and book:
+                take = min(sell, book[0][0])
+                book[0][0] -= take
+                sell -= take
+                if book[0][0] == 0:
+                    book.pop(0)
+        for ticker, book in books.items():
+            if not book:
+                continue
+            qty = sum(q for q, _, _ in book)
+            cost = sum(q * p for q, p, _ in book)
+            ltp = round(prices.get(ticker, 0), 2)
+            pl = round((ltp - cost / qty) * qty, 2)
+            rows.append({'Holder': holder, 'Ticker': ticker, 'Qty': qty, 'Avg': cost / qty, 'Live': ltp, 'PL': pl,
+                         'Buy_Date': min(d for _, _, d in book), 'Profit_Flag': pl / cost * 100 >= 20})
+    return pd.DataFrame(rows).set_index(['Holder', 'Ticker']).sort_index()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sells_follow_fifo(seed):
+    lots, prices = random_lots_with_sells(seed)
+    assert (lots['Qty'] < 0).any()
+    expected = fifo_holdings(lots, prices)
+    got = compute_holdings(lots, prices)
+    assert got.index.tolist() == expected.index.tolist()
+    for col in ['Qty', 'Avg', 'Live', 'PL']:
+        assert got[col].to_numpy() == pytest.approx(expected[col].to_numpy()), col
+    assert got['Buy_Date'].tolist() == expected['Buy_Date'].tolist()
+    assert got['Profit_Flag'].tolist() == expected['Profit_Flag'].tolist()
+
+
+def test_malformed_date_lot_stays_in_position():
+    lots = lots_frame([
+        ('A', 'X.NS', 10, 100.0, '2025-01-01'),
+        ('A', 'X.NS', 5, 100.0, '01/13/2025x'),
+        ('A', 'Y.NS', 2, 50.0, '2024-01-01'),
+    ])
+    prices = pd.Series({'X.NS': 120.0, 'Y.NS': 60.0})
+    pos = compute_holdings(lots, prices)
+    # தவறான தேதி lot-ம் அளவு, அடக்கம், P&L-ல் சேரும்
+    assert pos.loc[('A', 'X.NS'), 'Qty'] == 15
+    assert pos.loc[('A', 'X.NS'), 'PL'] == 300.0
+    assert pos.loc[('A', 'X.NS'), 'Buy_Date'] == '2025-01-01'
+    taxes, _ = estimate_taxes(lots, prices, '2026-10-16')
+    # அந்த position-ன் வரி மட்டும் ERROR; மற்றவை வழக்கம் போல
+    assert taxes.loc[('A', 'X.NS'), 'Tax_Type'] == 'ERROR'
+    assert np.isnan(taxes.loc[('A', 'X.NS'), 'Tax_Amt'])
+    assert taxes.loc[('A', 'Y.NS'), 'Tax_Type'] == 'LTCG'
+
+
+def test_sell_skips_malformed_date_lot_until_dated_lots_are_gone():
+    lots = lots_frame([
+        ('A', 'X.NS', 5, 80.0, 'bad'),
+        ('A', 'X.NS', 10, 100.0, '2025-01-01'),
+        ('A', 'X.NS', -12, 120.0, '2025-06-01'),
+    ])
+    open_ = open_lots(lots)
+    # தேதி தெரிந்த lot முதலில் (10), மீதி 2 தேதி தெரியாத lot-லிருந்து
+    assert open_['Open_Qty'].tolist() == [3]
+    assert open_['Buy_Date'].isna().all()
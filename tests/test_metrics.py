@@ -0,0 +1,15 @@
+import db
+import metrics
+
+
+def test_summary_is_saved_and_old_runs_are_purged(scratch_db):
+    metrics.reset()
+    metrics.incr('ai.cache', 'hits', 2)
+    metrics.save({'run_at': '2026-01-01 09:30:00', 'mode': 'report', 'wall_s': 1.0, 'stages': {}})
+    metrics.save({'run_at': '2026-03-31 09:30:00', 'mode': 'report', 'wall_s': 1.0, 'stages': {}})
+    run = metrics.summary('report')
+    metrics.save({**run, 'run_at': '2026-04-02 09:30:00'})
+    rows = db.connect().execute("SELECT Run_At, Summary FROM metrics ORDER BY Run_At").fetchall()
+    # 90 நாளுக்கு மேற்பட்ட ஜனவரி run நீக்கப்பட்டது
+    assert [r[0] for r in rows] == ['2026-03-31 09:30:00', '2026-04-02 09:30:00']
+    assert '"hits": 2' in rows[-1][1]
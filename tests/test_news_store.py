@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+
+import news_store
+from news_store import NewsStore
+from timeutil import ist_now
+
+FEED = {
+    'TCS.NS': [('n1', "Q2 results", '2026-10-14'), ('n2', "Order win", '2026-10-15'), ('n3', "Buyback", '2026-10-16')],
+}
+
+
+@pytest.fixture
+def store(scratch_db, monkeypatch):
+    monkeypatch.setattr(NewsStore, '_download', lambda self, ticker: FEED.get(ticker))
+    return NewsStore()
+
+
+def test_fetch_alone_does_not_mark_seen(store):
+    first = store.fetch_latest(['TCS.NS'])
+    # அறிக்கை அனுப்பப்படவில்லை - அடுத்த run-லும் அதே சமீபத்திய 2, இன்னும் புதியவை
+    assert store.fetch_latest(['TCS.NS']) == first == {'TCS.NS': [('n3', "Buyback", True), ('n2', "Order win", True)]}
+
+
+def test_delivered_headlines_are_not_new(store):
+    store.fetch_latest(['TCS.NS'])
+    store.mark_delivered([('TCS.NS', 'n3')])
+    assert store.fetch_latest(['TCS.NS'])['TCS.NS'] == [('n3', "Buyback", False), ('n2', "Order win", True)]
+
+
+def test_fetch_error_is_none(store):
+    assert store.fetch_latest(['ERR.NS']) == {'ERR.NS': None}
+
+
+def test_old_rows_are_purged(store):
+    store.fetch_latest(['TCS.NS'])
+    with store.conn:
+        store.conn.execute("UPDATE news SET Fetched_At = ?, Delivered_At = Fetched_At",
+                           ((ist_now() - timedelta(days=news_store.RETENTION_DAYS + 1)).isoformat(),))
+    store.fetch_latest(['INFY.NS'])
+    assert store.conn.execute("SELECT COUNT(*) FROM news").fetchone()[0] == 0
@@ -0,0 +1,149 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+
+import pytest
+
+import delivery
+import stock_bot
+from report_state import FULL
+
+# 09:30 IST - WhatsApp, குரல், PDF/Email மூன்றும் உள்ள slot
+IST = datetime(2026, 10, 16, 9, 30)
+HOLDERS = [{'name': f"H{i}", 'phone': f"9100{i}", 'email': f"h{i}@example.com"} for i in range(3)]
+
+
+@pytest.fixture
+def outbox(scratch_db, green_stub, fake_smtp, monkeypatch):
+    # rate limit / backoff இல்லாமல் - ஒரே நேரத்தில் எத்தனை கோரிக்கைகள் என்பதை stub அளக்கும்
+    monkeypatch.setattr(delivery, 'RATE_LIMITS', {'whatsapp': 0.0, 'email': 0.0})
+    monkeypatch.setattr(stock_bot, 'delivery_service',
+                        lambda: delivery.DeliveryService('1101', 'token', 'bot@example.com', 'pw', backoff=0))
+    return green_stub
+
+
+def reports():
+    return [{'holder': h, 'mode': FULL, 'fingerprint': {'day': '2026-10-16'}} for h in HOLDERS]
+
+
+def whatsapp(report, ctx, outbox, key):
+    p = report['holder']
+    outbox.whatsapp(key, f"{p['phone']}@c.us", f"அறிக்கை {p['name']}")
+
+
+def voice(report, ctx, outbox, key):
+    p = report['holder']
+    clip = f"{p['name']}.mp3"
+    with open(clip, 'wb') as f:
+        f.write(b"ID3")
+    outbox.whatsapp_file(key, f"{p['phone']}@c.us", clip, clip)
+
+
+def pdf(report, ctx, outbox, key):
+    msg = MIMEText("pdf")
+    msg['To'] = report['holder']['email']
+    outbox.email(key, msg)
+
+
+def test_holders_render_concurrently(outbox, monkeypatch):
+    # ஒவ்வொரு holder-ன் WhatsApp render-ம் மற்ற இரண்டும் தொடங்கும் வரை காத்திருக்கும் - வரிசையாக ஓடினால் timeout
+    barrier = threading.Barrier(len(HOLDERS), timeout=5)
+
+    def together(report, ctx, outbox, key):
+        barrier.wait()
+        whatsapp(report, ctx, outbox, key)
+
+    monkeypatch.setattr(stock_bot, 'deliver_whatsapp', together)
+    monkeypatch.setattr(stock_bot, 'deliver_voice', voice)
+    monkeypatch.setattr(stock_bot, 'deliver_pdf', pdf)
+    stock_bot.deliver_stage(reports(), {}, IST)
+    assert not barrier.broken
+    assert len(outbox.requests) == 2 * len(HOLDERS)
+
+
+def test_recipients_are_sent_concurrently(outbox, fake_smtp, monkeypatch):
+    outbox.delay = 0.3
+
+    def slow_whatsapp(report, ctx, outbox, key):
+        # குரல் render முதலில் முடிந்தாலும் அறிக்கை முதலில் போக வேண்டும்
+        time.sleep(0.2)
+        whatsapp(report, ctx, outbox, key)
+
+    monkeypatch.setattr(stock_bot, 'deliver_whatsapp', slow_whatsapp)
+    monkeypatch.setattr(stock_bot, 'deliver_voice', voice)
+    monkeypatch.setattr(stock_bot, 'deliver_pdf', pdf)
+    stock_bot.deliver_stage(reports(), {}, IST)
+    # வெவ்வேறு பெறுநர்கள் ஒரே நேரத்தில்; ஒரே பெறுநருக்கு அறிக்கை → குரல் வரிசைப்படி
+    assert outbox.max_in_flight >= 2
+    for h in HOLDERS:
+        chat = f"{h['phone']}@c.us"
+        assert [m for m, c, _ in outbox.requests if c == chat] == ['sendMessage', 'sendFileByUpload']
+    assert sorted(m['To'] for s in fake_smtp.instances for m in s.sent) == [h['email'] for h in HOLDERS]
+
+
+def test_failed_channel_does_not_block_others(outbox, fake_smtp, monkeypatch):
+    def broken_voice(report, ctx, outbox, key):
+        if report['holder']['name'] == 'H0':
+            raise RuntimeError("gTTS down")
+        voice(report, ctx, outbox, key)
+
+    monkeypatch.setattr(stock_bot, 'deliver_whatsapp', whatsapp)
+    monkeypatch.setattr(stock_bot, 'deliver_voice', broken_voice)
+    monkeypatch.setattr(stock_bot, 'deliver_pdf', pdf)
+    # H1-ன் SMTP எப்போதும் மறுக்கும்; H2-ன் WhatsApp எப்போதும் 500
+    fake_smtp.fail_to = {'h1@example.com'}
+    outbox.failures['91002@c.us'] = -1
+    stock_bot.deliver_stage(reports(), {}, IST)
+
+    sent_mail = sorted(m['To'] for s in fake_smtp.instances for m in s.sent)
+    assert sent_mail == ['h0@example.com', 'h2@example.com']
+    chats = outbox.chats()
+    assert chats.count('91000@c.us') == 1          # குரல் தோல்வி - அறிக்கை மட்டும்
+    assert chats.count('91001@c.us') == 2          # email தோல்வி WhatsApp-ஐப் பாதிக்காது
+    assert chats.count('91002@c.us') == 2 * delivery.RETRIES
+    # WhatsApp சென்ற holders-க்கு மட்டும் fingerprint சேமிப்பு
+    from report_state import ReportState
+    assert sorted(ReportState().load()) == ['H0', 'H1']
+
+
+def test_midday_slot_skips_pdf(outbox, fake_smtp, monkeypatch):
+    monkeypatch.setattr(stock_bot, 'deliver_whatsapp', whatsapp)
+    monkeypatch.setattr(stock_bot, 'deliver_voice', voice)
+    monkeypatch.setattr(stock_bot, 'deliver_pdf', pdf)
+    stock_bot.deliver_stage(reports(), {}, datetime(2026, 10, 16, 12, 30))
+    assert fake_smtp.instances == []
+    assert len(outbox.requests) == 2 * len(HOLDERS)
+
+
+def test_headlines_are_seen_only_after_delivery(outbox, monkeypatch):
+    from news_store import NewsStore
+    store = NewsStore()
+    with store.conn:
+        store.conn.executemany("INSERT INTO news (Ticker, News_Id, Title) VALUES (?, ?, ?)",
+                               [('X.NS', 'x1', "x"), ('Y.NS', 'y1', "y")])
+    monkeypatch.setattr(stock_bot, 'deliver_whatsapp', whatsapp)
+    monkeypatch.setattr(stock_bot, 'deliver_voice', voice)
+    monkeypatch.setattr(stock_bot, 'deliver_pdf', pdf)
+    # H0, H2 இருவருக்கும் X; H2-ன் WhatsApp தோல்வி - X அடுத்த run-லும் புதியதே
+    outbox.failures['91002@c.us'] = -1
+    rs = reports()
+    rs[0]['headlines'] = [('X.NS', 'x1')]
+    rs[1]['headlines'] = [('Y.NS', 'y1')]
+    rs[2]['headlines'] = [('X.NS', 'x1')]
+    stock_bot.deliver_stage(rs, {}, IST)
+    seen = store.conn.execute("SELECT Ticker FROM news WHERE Delivered_At IS NOT NULL").fetchall()
+    assert seen == [('Y.NS',)]
+
+
+def test_late_cron_run_keeps_its_own_slot(monkeypatch):
+    # 09:10 cron 55 நிமிடம் தாமதம் - 10:00 slot-ன் key-ஐ எடுத்தால் அந்த அறிக்கை அடக்கப்படும்
+    late = datetime(2026, 10, 16, 10, 5)
+    monkeypatch.setenv('TRIGGER_SCHEDULE', '40 3 * * 1-5')
+    assert stock_bot.delivery_key(late, "WA", "H0") == "2026-10-16 09:10|WA|H0"
+    monkeypatch.delenv('TRIGGER_SCHEDULE')
+    # கைமுறை run: tolerance-க்குள் அருகிலுள்ள slot, இல்லையெனில் run நேரமே
+    assert stock_bot.delivery_key(datetime(2026, 10, 16, 9, 58), "WA", "H0") == "2026-10-16 10:00|WA|H0"
+    assert stock_bot.delivery_key(late, "WA", "H0") == "2026-10-16 10:00|WA|H0"
+    assert stock_bot.delivery_key(IST, "WA", "H0") == "2026-10-16 09:30|WA|H0"
+    assert stock_bot.delivery_key(late + timedelta(hours=8), "WA", "H0") == "2026-10-16 18:05|WA|H0"
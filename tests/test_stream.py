@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+
+import delivery
+import stock_bot
+from price_store import PriceStore
+from timeutil import ist_now
+
+FILES = {
+    'portfolio.csv': "Holder,Ticker,Qty,Avg_Price,Buy_Date\n"
+                     "Asha,EQ.NS,10,100,2025-01-02\n"
+                     "Asha,GOLD1.NS,10,100,2025-01-02\n"
+                     "Ravi,GOLD1.NS,5,100,2025-01-02\n",
+    'holders.csv': "Name,Phone,Prefix,Email,Commodity_Target_Pct\n"
+                   "Asha,9001,A,asha@example.com,50\n"
+                   "Ravi,9002,R,ravi@example.com,50\n",
+    'instruments.csv': "Ticker,Alias,Asset_Class,Target_Weight\n"
+                       "EQ.NS,,equity,\n"
+                       "GOLD1.NS,,commodity,\n",
+    'holidays.csv': "Date,Message\n",
+    # தங்கம் 60% சரிந்து மீள்கிறது; நிஃப்டி 5% சரிந்து மீள்கிறது; மாறாத விலை alert தராது
+    'replay.csv': "Ts,Ticker,Price\n"
+                  "1,GOLD1.NS,40\n"
+                  "2,^NSEI,95\n"
+                  "3,GOLD1.NS,100\n"
+                  "4,^NSEI,100\n"
+                  "5,EQ.NS,100\n",
+}
+
+
+@pytest.fixture
+def stream_dir(scratch_db, green_stub, monkeypatch):
+    for name, text in FILES.items():
+        (scratch_db / name).write_text(text, encoding='utf-8')
+    # தொடக்க விலைகள் உள்ளூர் price store-ல் - replay mode network-ஐத் தொடாது
+    store = PriceStore()
+    today = ist_now()
+    rows = [(t, (today - timedelta(days=d)).strftime('%Y-%m-%d'), 100.0)
+            for t in ['EQ.NS', 'GOLD1.NS', '^NSEI'] for d in range(5)]
+    with store.conn:
+        store.conn.executemany("INSERT INTO prices (Ticker, Date, Close, Settled) VALUES (?, ?, ?, 1)", rows)
+    monkeypatch.setattr(delivery, 'RATE_LIMITS', {'whatsapp': 0.0, 'email': 0.0})
+    monkeypatch.setattr(stock_bot, 'delivery_service',
+                        lambda: delivery.DeliveryService('1101', 'token', 'bot@example.com', 'pw', backoff=0))
+    return green_stub
+
+
+def test_replay_sends_only_threshold_crossings(stream_dir):
+    stock_bot.run_stream('replay.csv')
+    asha = stream_dir.messages('9001@c.us')
+    ravi = stream_dir.messages('9002@c.us')
+    # Asha: 50/50 → பங்குகள் அதிகம் → நிஃப்டி சரிவு → மீண்டும் சமநிலை → நிஃப்டி மீட்சி
+    assert len(asha) == 4
+    assert "சமநிலை எச்சரிக்கை" in asha[0] and "பங்குகள் அதிகமாக" in asha[0]
+    assert "ஹெட்ஜிங் எச்சரிக்கை" in asha[1] and "-5.0%" in asha[1]
+    assert "சமநிலையில் உள்ளன" in asha[2]
+    assert "ஹெட்ஜிங் தேவையில்லை" in asha[3]
+    # Ravi தங்கம் மட்டும் - எப்போதும் தங்கம் அதிகம், நிஃப்டி alerts மட்டும்
+    assert len(ravi) == 2
+    assert "ஹெட்ஜிங் எச்சரிக்கை" in ravi[0] and "ஹெட்ஜிங் தேவையில்லை" in ravi[1]
+    assert all(m.startswith("வணக்கம் ") for m in asha + ravi)
@@ -0,0 +1,9 @@
+from datetime import datetime, timedelta, timezone
+
+# NSE முடிவு நேரம் (IST) - இதற்குப் பிறகு இன்றைய bar நிலையானது (settled)
+MARKET_CLOSE = (15, 45)
+
+
+# pandas இல்லாத module - விடுமுறை நாள் பாதை (registry + delivery) இதை மட்டும் import செய்யும்
+def ist_now():
+    return datetime.now(timezone.utc) + timedelta(hours=5, minutes=30)
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# phrase clips: <sha256>.mp3 - workflow-ல் actions/cache வழியே runs இடையே பாதுகாக்கப்படும்
+CACHE_DIR = 'voice_cache'
+# இத்தனை நாள் பயன்படாத clips (பழைய தொகைகள் போன்றவை) நீக்கப்படும்
+CACHE_TTL_DAYS = 7
+SYNTH_WORKERS = 4
+LANG = 'ta'
+
+# உருவாக்கத்தில் உள்ள clips (path -> Future) - ஒரே நேரத்தில் இயங்கும் holders பொதுவான சொற்றொடர்களை ஒருமுறை மட்டும் உருவாக்கும்
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def clip_key(text, lang=LANG):
+    return hashlib.sha256(f"{lang}|{text}".encode('utf-8')).hexdigest()
+
+
+# --- குரல் அறிக்கை: நிலையான சொற்றொடர்கள் cache-ல், புதிய பகுதிகள் மட்டும் gTTS ---
+class VoiceEngine:
+    def __init__(self, cache_dir=None, lang=LANG):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.lang = lang
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cutoff = time.time() - CACHE_TTL_DAYS * 86400
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+
+    def _path(self, text):
+        return os.path.join(self.cache_dir, f"{clip_key(text, self.lang)}.mp3")
+
+    def _synthesize(self, text, path):
+        from gtts import gTTS
+        # தற்காலிக கோப்பில் எழுதி rename - ஒரே clip-ஐ இரண்டு holders ஒரே நேரத்தில் உருவாக்கினாலும் பாதி கோப்பு இல்லை
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with metrics.stage('gtts.save'):
+                gTTS(text=text, lang=self.lang).save(tmp)
+            os.replace(tmp, path)
+            metrics.incr('gtts.save', 'bytes', os.path.getsize(path))
+        finally:
+            with _pending_lock:
+                _pending.pop(path, None)
+
+    def render(self, segments, out_path):
+        # MP3 frames தொடர்ச்சியாக இணைக்கலாம் (gTTS நீண்ட உரையை இப்படியே இணைக்கிறது)
+        segments = [s.strip() for s in segments if s and s.strip()]
+        paths = [self._path(s) for s in segments]
+        missing = {p: s for s, p in zip(segments, paths) if not os.path.exists(p)}
+        metrics.incr('voice.cache', 'hits', len(set(paths)) - len(missing))
+        metrics.incr('voice.cache', 'misses', len(missing))
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(SYNTH_WORKERS, len(missing))) as pool:
+                futures = []
+                for path, text in missing.items():
+                    with _pending_lock:
+                        future = _pending.get(path)
+                        if future is None and not os.path.exists(path):
+                            future = _pending[path] = pool.submit(self._synthesize, text, path)
+                    if future is not None:
+                        futures.append(future)
+                for future in futures:
+                    future.result()
+        with open(out_path, 'wb') as out:
+            for path in paths:
+                with open(path, 'rb') as f:
+                    out.write(f.read())
+                # பயன்பாட்டு நேரம் - TTL நீக்கம் அடிக்கடி வரும் clips-ஐத் தொடாது
+                os.utime(path)
+        return out_path